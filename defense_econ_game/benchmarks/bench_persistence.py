@@ -0,0 +1,64 @@
+"""Measures save and load throughput of binary snapshots for a large world.
+
+Run from the defense_econ_game directory:
+
+    python -m benchmarks.bench_persistence --nations 500
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.game import Game
+from src.commands import Command
+from src import persistence
+
+def build_world(nations, turns):
+    game = Game(test_mode=True, num_ai_nations=nations - 1)
+    game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+    for _ in range(turns):
+        game.process_command(Command("end_turn"))
+    return game
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nations", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=5, help="Turns simulated before saving.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    game = build_world(args.nations, args.turns)
+    with tempfile.TemporaryDirectory() as directory:
+        full_path = os.path.join(directory, "full.sav")
+        delta_path = os.path.join(directory, "delta.sav")
+        json_path = os.path.join(directory, "debug.json")
+
+        save_time, base = timed(lambda: persistence.save_game(game.game_state, full_path), args.repeat)
+        read_time, _ = timed(lambda: persistence.load_snapshot(full_path), args.repeat)
+        load_time, _ = timed(lambda: persistence.load_game(full_path, Game(test_mode=True)), args.repeat)
+        game.process_command(Command("end_turn"))
+        delta_time, _ = timed(lambda: persistence.save_checkpoint(game.game_state, delta_path, base), args.repeat)
+        delta_load_time, _ = timed(lambda: persistence.load_game(delta_path, Game(test_mode=True), base=base), args.repeat)
+        json_time, _ = timed(lambda: persistence.export_json(game.game_state, json_path), args.repeat)
+
+        full_size = os.path.getsize(full_path)
+        rows = [
+            ("save full snapshot", save_time, full_size),
+            ("map snapshot", read_time, full_size),
+            ("load full snapshot", load_time, full_size),
+            ("save delta checkpoint", delta_time, os.path.getsize(delta_path)),
+            ("load delta checkpoint", delta_load_time, os.path.getsize(delta_path)),
+            ("export JSON", json_time, os.path.getsize(json_path)),
+        ]
+    print(f"{args.nations} nations, {args.turns} turns")
+    for name, seconds, size in rows:
+        print(f"  {name:<24} {seconds * 1000:8.2f} ms  {size / 1024:8.1f} KiB  {size / seconds / 2**20:8.1f} MiB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Synthetic game data at a multiple of the shipped data set's size."""
+import json
+import os
+
+from src.game import DATA_FILES
+
+BASE_INDUSTRIES_PER_TIER = {1: 4, 2: 4, 3: 4}
+BASE_TECHNOLOGIES = 3
+BASE_PROJECTS = 2
+BASE_EVENTS = 1
+
+def generate_industries(scale):
+    industries = []
+    for tier, count in BASE_INDUSTRIES_PER_TIER.items():
+        for i in range(count * scale):
+            industries.append({
+                "name": f"Tier {tier} Industry {i}",
+                "tier": tier,
+                "profitability": round(0.8 + 0.1 * tier + (i % 7) * 0.05, 2),
+                "level_bonuses": [
+                    {"level": 1, "research_bonus": {"technology_name": f"Technology {i % (BASE_TECHNOLOGIES * scale)}", "bonus_per_level": 0.01}}
+                ],
+            })
+    return industries
+
+def generate_technologies(scale):
+    count = BASE_TECHNOLOGIES * scale
+    unlockable = [(tier, i) for tier in (2, 3) for i in range(BASE_INDUSTRIES_PER_TIER[tier] * scale)]
+    technologies = []
+    for i in range(count):
+        unlocks = [f"Tier {tier} Industry {index}" for tier, index in unlockable[i::count]]
+        technology = {
+            "name": f"Technology {i}",
+            "rp_cost": 100 + 50 * (i % 10),
+            "unlocks_industries": unlocks,
+            "effects": {"gdp_growth_modifier": 0.0001 * (1 + i % 5)},
+        }
+        if i % 3 == 2:
+            technology["private_ic_cost_reduction"] = 0.001
+        technologies.append(technology)
+    return technologies
+
+def generate_projects(scale):
+    projects = [
+        {"id": "build_ic_1", "name": "Construct Industrial Complex", "cp_cost": 100, "upkeep_cost": 100, "effects": {"add_ic": 10}, "requires_target": True},
+        {"id": "build_infrastructure_1", "name": "Develop Infrastructure", "cp_cost": 500, "upkeep_cost": 50, "effects": {"add_infrastructure": 1}, "requires_target": False},
+    ]
+    for i in range(BASE_PROJECTS * scale - len(projects)):
+        if i % 2:
+            projects.append({"id": f"build_ic_{i + 2}", "name": f"Industrial Complex {i}", "cp_cost": 100 + i % 400, "upkeep_cost": 50 + i % 100, "effects": {"add_ic": 5 + i % 10}, "requires_target": True})
+        else:
+            projects.append({"id": f"build_infrastructure_{i + 2}", "name": f"Infrastructure {i}", "cp_cost": 300 + i % 700, "upkeep_cost": 25 + i % 50, "effects": {"add_infrastructure": 1}, "requires_target": False})
+    return projects
+
+def generate_events(scale):
+    meters = ("crisis_awareness", "social_dissonance", "turn")
+    return [
+        {
+            "name": f"Event {i}",
+            "description": f"Synthetic event {i}.",
+            "trigger_meter": meters[i % len(meters)],
+            "trigger_threshold": 50 + 10 * i,
+            "effects": {"treasury": -10 * (1 + i % 5), "public_opinion": -1},
+            # Every fourth event recurs at random instead of firing once.
+            **({"base_chance": 0.01} if i % 4 == 3 else {}),
+        }
+        for i in range(BASE_EVENTS * scale)
+    ]
+
+def generate_data(scale):
+    """
+    Generates all four data sets at the given multiple of the shipped data.
+
+    Returns:
+        dict: Data in the form returned by src.game.load_game_data.
+    """
+    return {
+        "technologies": generate_technologies(scale),
+        "events": generate_events(scale),
+        "industries": generate_industries(scale),
+        "projects": generate_projects(scale),
+    }
+
+def write_data(directory, scale):
+    """Writes generated technologies.json, events.json, industries.json and projects.json to a directory."""
+    os.makedirs(directory, exist_ok=True)
+    data = generate_data(scale)
+    for name in DATA_FILES:
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump(data[name], f)
+    return data
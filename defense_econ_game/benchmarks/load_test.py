@@ -0,0 +1,79 @@
+"""Drives many concurrent sessions against a game server and reports request latencies.
+
+Run from the defense_econ_game directory. With no --port, an in-process server is started:
+
+    python -m benchmarks.load_test --sessions 50 --turns 20 --ai-nations 10
+    python -m benchmarks.load_test --port 8765 --sessions 200
+
+Every session sets research and a construction project, then alternates a
+state request with an end_turn; the report gives latency percentiles per
+request type, so a slow end of turn holding up other sessions' light requests
+shows up as a long state tail.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from src.server import GameClient, GameServer
+
+async def play_session(client, settings, turns, latencies):
+    async def request(command_type, payload=None):
+        start = time.perf_counter()
+        await client.request(command_type, payload, session)
+        latencies.setdefault(command_type, []).append(time.perf_counter() - start)
+
+    session = await client.new_session(**settings)
+    await request("research", "Industrialization")
+    await request("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"})
+    for _ in range(turns):
+        await request("state")
+        await request("end_turn")
+    await request("close_session")
+
+def summarize(samples):
+    samples = sorted(samples)
+    def percentile(fraction):
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+    return {"count": len(samples), "median_ms": statistics.median(samples) * 1000, "p95_ms": percentile(0.95) * 1000, "max_ms": samples[-1] * 1000}
+
+async def run_load(host, port, sessions, turns, settings, connections):
+    clients = [await GameClient.connect(host, port) for _ in range(connections)]
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(play_session(clients[index % connections], settings, turns, latencies) for index in range(sessions)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return {
+        "sessions": sessions,
+        "turns": turns,
+        "seconds": elapsed,
+        "turns_per_second": sessions * turns / elapsed,
+        "requests": {command_type: summarize(samples) for command_type, samples in latencies.items()},
+    }
+
+async def _main(args):
+    settings = {"num_ai_nations": args.ai_nations, "ai": args.ai_nations > 0}
+    connections = args.connections or args.sessions
+    if args.port is not None:
+        return await run_load(args.host, args.port, args.sessions, args.turns, settings, connections)
+    async with GameServer(max_workers=args.workers, use_processes=args.processes) as server:
+        return await run_load(*server.address, args.sessions, args.turns, settings, connections)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Server to load. Defaults to an in-process server.")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--ai-nations", type=int, default=10, help="AI nations per session, driven by the AI controller.")
+    parser.add_argument("--connections", type=int, help="Connections the sessions share. Defaults to one per session.")
+    parser.add_argument("--workers", type=int, help="Worker pool size of the in-process server.")
+    parser.add_argument("--processes", action="store_true", help="Run the in-process server's turns in worker processes.")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Times game startup, turn processing and rendering on synthetic worlds and checks them against a baseline.
+
+Run from the defense_econ_game directory:
+
+    python -m benchmarks.run_benchmarks --scales 10 100 1000
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json
+
+Results are JSON: {"config": {...}, "environment": {...}, "results": {name: {"median": s, "min": s, "repeat": n}}}.
+A benchmark regresses when its median exceeds the baseline median times its threshold.
+"""
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import write_data
+from src.game import Game
+from src.game_data import clear_cache, get_game_data
+from src.commands import Command
+from src.controller.ai_controller import AIController
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 1.25
+
+def timed(function, repeat):
+    """Calls function repeat times and returns the seconds each call took."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def build_game(data, nations=1, use_ledger=False, queue_depth=0, ai=False):
+    game = Game(test_mode=True, use_ledger=use_ledger, num_ai_nations=nations - 1, data=data, ai_controller=AIController() if ai else None)
+    project_ids = list(game.game_state.available_projects.keys())
+    target = next(iter(game.game_state.player_nation.industries)).name
+    for i in range(queue_depth):
+        project_id = project_ids[i % len(project_ids)]
+        requires_target = game.game_state.available_projects.get(project_id).get("requires_target", False)
+        game.process_command(Command("construction", {"type": "start_project", "project_id": project_id, "target": target if requires_target else None}))
+    return game
+
+def render(game, cached=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.view.display_game_state(game.game_state, game.get_view_model() if cached else None)
+
+def run_scenario(name, data_directory, data, repeat, turns, nations=1, use_ledger=False, queue_depth=0, ai=False):
+    """
+    Runs the standard benchmarks for one world.
+
+    Args:
+        name (str): The scenario name, used as the prefix of each benchmark name.
+        data_directory (str): Where the scenario's JSON data files are written.
+        data (GameData): The scenario's compiled game data.
+        repeat (int): Samples taken of each short benchmark.
+        turns (int): Turns in the long run benchmark; 0 skips it.
+        nations (int, optional): The number of nations, including the player. Defaults to 1.
+        use_ledger (bool, optional): Whether nations use an IndustryLedger. Defaults to False.
+        queue_depth (int, optional): Projects the player starts before timing. Defaults to 0.
+        ai (bool, optional): Whether an AIController acts for the AI nations. Defaults to False.
+
+    Returns:
+        dict: Lists of samples keyed by benchmark name.
+    """
+    samples = {}
+    cache_directory = os.path.join(data_directory, "cache")
+
+    def cold_startup(cache):
+        clear_cache()
+        Game(test_mode=True, use_ledger=use_ledger, num_ai_nations=nations - 1, data=get_game_data(data_directory, cache_dir=cache))
+
+    samples[f"{name}/startup_uncached"] = timed(lambda: cold_startup(""), repeat)
+    get_game_data(data_directory, cache_dir=cache_directory)
+    samples[f"{name}/startup_disk_cache"] = timed(lambda: cold_startup(cache_directory), repeat)
+    clear_cache()
+    get_game_data(data_directory, cache_dir=cache_directory)
+    samples[f"{name}/startup"] = timed(lambda: Game(test_mode=True, use_ledger=use_ledger, num_ai_nations=nations - 1, data_dir=data_directory), repeat)
+
+    game = build_game(data, nations, use_ledger, queue_depth, ai)
+    samples[f"{name}/end_turn"] = timed(lambda: game.controller._process_end_turn(game.game_state), repeat)
+    samples[f"{name}/render"] = timed(lambda: render(game), repeat)
+    samples[f"{name}/render_cached"] = timed(lambda: render(game, cached=True), repeat)
+
+    if turns:
+        def long_run():
+            long_game = build_game(data, nations, use_ledger, queue_depth, ai)
+            for _ in range(turns):
+                long_game.controller._process_end_turn(long_game.game_state)
+        samples[f"{name}/run_{turns}_turns"] = timed(long_run, 1)
+    return samples
+
+def run_all(args):
+    scenarios = []
+    for scale in args.scales:
+        scenarios.append((f"scale_{scale}x", scale, {}))
+        if args.ledger:
+            scenarios.append((f"scale_{scale}x_ledger", scale, {"use_ledger": True}))
+    if args.nations:
+        scenarios.append((f"nations_{args.nations}", 1, {"nations": args.nations}))
+        scenarios.append((f"nations_{args.nations}_ledger", 1, {"nations": args.nations, "use_ledger": True}))
+    if args.queue_depth:
+        scenarios.append((f"queue_{args.queue_depth}", 10, {"queue_depth": args.queue_depth}))
+    if args.ai_nations:
+        scenarios.append((f"ai_{args.ai_nations}", 1, {"nations": args.ai_nations + 1, "ai": True}))
+        scenarios.append((f"ai_{args.ai_nations}_ledger", 1, {"nations": args.ai_nations + 1, "ai": True, "use_ledger": True}))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        for name, scale, options in scenarios:
+            if args.only and not any(fnmatch.fnmatch(name, pattern) for pattern in args.only):
+                continue
+            directory = os.path.join(root, f"scale_{scale}")
+            if not os.path.isdir(directory):
+                write_data(directory, scale)
+            data = get_game_data(directory, cache_dir="")
+            turns = args.turns if scale <= args.max_long_run_scale else 0
+            print(f"{name} ...", file=sys.stderr)
+            for benchmark, benchmark_samples in run_scenario(name, directory, data, args.repeat, turns, **options).items():
+                results[benchmark] = {"median": statistics.median(benchmark_samples), "min": min(benchmark_samples), "repeat": len(benchmark_samples)}
+    return results
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares results to a baseline.
+
+    Args:
+        results (dict): Benchmark results keyed by name.
+        baseline (dict): A saved results document; an entry's own "threshold" overrides the default.
+        threshold (float, optional): Allowed slowdown factor. Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list: (name, baseline median, current median, ratio) for every regressed benchmark.
+    """
+    regressions = []
+    for name, expected in baseline["results"].items():
+        if name not in results:
+            continue
+        ratio = results[name]["median"] / expected["median"]
+        if ratio > expected.get("threshold", threshold):
+            regressions.append((name, expected["median"], results[name]["median"], ratio))
+    return regressions
+
+def missing_from(results, baseline):
+    """Returns the names of benchmarks in the results that the baseline has no entry for, so nothing checks them."""
+    return [name for name in results if name not in baseline["results"]]
+
+def environment():
+    return {"python": platform.python_version(), "machine": platform.machine(), "platform": platform.platform(), "processor": platform.processor()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="*", default=[10, 100, 1000], help="Multiples of the shipped data set to generate.")
+    parser.add_argument("--nations", type=int, default=1000, help="Nations in the many-nation scenario; 0 skips it.")
+    parser.add_argument("--ai-nations", type=int, default=500, help="AI-controlled nations in the AI scenario; 0 skips it.")
+    parser.add_argument("--queue-depth", type=int, default=1000, help="Projects queued in the deep-queue scenario; 0 skips it.")
+    parser.add_argument("--turns", type=int, default=1000, help="Turns in each long run.")
+    parser.add_argument("--max-long-run-scale", type=int, default=100, help="Largest scale that gets a long run.")
+    parser.add_argument("--ledger", action="store_true", help="Also run every scale with IndustryLedger nations.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Only run scenarios matching these glob patterns.")
+    parser.add_argument("--output", help="Write the results document to this file.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="The baseline to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown factor before a benchmark counts as regressed.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file instead of comparing.")
+    args = parser.parse_args()
+
+    results = run_all(args)
+    document = {"config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "save_baseline")}, "environment": environment(), "results": results}
+    for name, result in results.items():
+        print(f"{name:<40} {result['median'] * 1000:10.3f} ms  (min {result['min'] * 1000:.3f} ms, n={result['repeat']})")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if args.save_baseline:
+        for result in results.values():
+            result["threshold"] = args.threshold
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for name, expected, actual, ratio in regressions:
+        print(f"REGRESSION {name}: {expected * 1000:.3f} ms -> {actual * 1000:.3f} ms ({ratio:.2f}x)")
+    missing = missing_from(results, baseline)
+    for name in missing:
+        print(f"MISSING FROM BASELINE {name}: {results[name]['median'] * 1000:.3f} ms; run with --save-baseline to record it")
+    if not regressions and not missing:
+        print("No regressions.")
+    return 1 if regressions or missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import argparse
+from src.batch_runner import METRICS, policy_grid, run_batch
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run headless games over a grid of scripted policies.")
+    parser.add_argument("--seeds", type=int, default=10, help="Number of seeds per policy.")
+    parser.add_argument("--turns", type=int, default=50, help="Turns per game.")
+    parser.add_argument("--tax-rates", type=float, nargs="+", default=[0.15])
+    parser.add_argument("--social-spending", type=float, nargs="+", default=[0])
+    parser.add_argument("--ic-focus", nargs="+", default=["Balanced"])
+    parser.add_argument("--research-order", nargs="*", default=[], help="Technology names researched in order.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    policies = policy_grid(args.tax_rates, args.social_spending, args.ic_focus, (tuple(args.research_order),))
+    result = run_batch(policies, range(args.seeds), args.turns, max_workers=args.workers, chunk_size=args.chunk_size)
+    for policy_index, policy in enumerate(result.policies):
+        print(policy)
+        for metric in METRICS:
+            values = [result.get(policy_index, metric, p)[-1] for p in result.percentiles]
+            print(f"  {metric} at turn {args.turns}: " + ", ".join(f"p{p}={v:.1f}" for p, v in zip(result.percentiles, values)))
@@ -1,14 +1,24 @@
+import os
+import random
+
 from src.game import Game
+from src.game_log import configure_logging
 from src.commands import Command
+from src.controller.planner import Planner
+from src.controller.projection import PolicyProjector, adjacent_options
 
 def get_player_action_from_input():
-    prompt = "Actions: (E)nd turn, (R)esearch, (P)olicy, (S)et Tax, (B)udget, (C)onstruction, (Q)uit\n> "
+    prompt = "Actions: (E)nd turn, (R)esearch, (P)olicy, (S)et Tax, (B)udget, (C)onstruction, Su(g)gest, Compare (O)ptions, (Q)uit\n> "
     user_input = input(prompt).lower()
 
     if user_input == 'e':
         return Command("end_turn")
     elif user_input == 'q':
         return Command("quit")
+    elif user_input == 'g':
+        return Command("suggest")
+    elif user_input == 'o':
+        return Command("compare_options")
     elif user_input == 'r':
         # For now, hardcode a research command for testing
         return Command("research", "Advanced Construction")
@@ -28,10 +38,21 @@ def get_player_action_from_input():
     return None
 
 if __name__ == "__main__":
-    game = Game()
+    # DEFENSE_ECON_LOG=path also writes the DEBUG breakdowns of every nation to a JSON lines file.
+    configure_logging(console_level="INFO", file=os.environ.get("DEFENSE_ECON_LOG"))
+    # Every game draws its random events from its own seed; DEFENSE_ECON_SEED replays a game.
+    game = Game(seed=int(os.environ.get("DEFENSE_ECON_SEED") or random.randrange(2 ** 32)))
+    planner = Planner(data=game.data)
     while True:
-        game.view.display_game_state(game.game_state)
+        game.view.display_game_state(game.game_state, game.get_view_model())
         action = get_player_action_from_input()
+        if action and action.type == "suggest":
+            game.view.display_plan(planner.plan(game.game_state))
+            continue
+        if action and action.type == "compare_options":
+            player = game.game_state.player_nation
+            game.view.display_options(PolicyProjector(player, game.game_state.turn).project(adjacent_options(player), turns=5))
+            continue
         if action:
             game.process_command(action)
         if action and action.type == "quit":
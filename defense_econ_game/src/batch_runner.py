@@ -0,0 +1,168 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.game import Game
+from src.game_data import GameData, compile_game_data, get_game_data
+from src.commands import Command
+from src.metrics_recorder import MetricsRecorder
+
+METRICS = ("treasury", "civilian_gdp", "industrial_capacity", "public_opinion")
+
+# Game data shared by every game run in a worker process, set once by _init_worker.
+_WORKER_DATA = None
+
+class ScriptedPolicy:
+    """
+    A fixed set of player decisions applied to a headless game.
+
+    Attributes:
+        tax_rate (float): The national tax rate.
+        social_spending (float): The social spending budget per turn.
+        ic_focus_policy (str): The IC focus policy.
+        research_order (tuple): Technology names researched in order whenever no research is active.
+    """
+    def __init__(self, tax_rate=0.15, social_spending=0, ic_focus_policy="Balanced", research_order=()):
+        """
+        Initializes the ScriptedPolicy.
+
+        Args:
+            tax_rate (float, optional): The national tax rate. Defaults to 0.15.
+            social_spending (float, optional): The social spending budget per turn. Defaults to 0.
+            ic_focus_policy (str, optional): The IC focus policy. Defaults to "Balanced".
+            research_order (tuple, optional): Technology names to research in order. Defaults to ().
+        """
+        self.tax_rate = tax_rate
+        self.social_spending = social_spending
+        self.ic_focus_policy = ic_focus_policy
+        self.research_order = tuple(research_order)
+
+    def __repr__(self):
+        return (f"ScriptedPolicy(tax_rate={self.tax_rate!r}, social_spending={self.social_spending!r}, "
+                f"ic_focus_policy={self.ic_focus_policy!r}, research_order={self.research_order!r})")
+
+    def apply_initial(self, game):
+        """Issues the commands that set up the policy at the start of the game."""
+        game.process_command(Command("set_tax", self.tax_rate))
+        game.process_command(Command("budget", {"category": "social_spending", "amount": self.social_spending}))
+        game.process_command(Command("construction", {"type": "set_ic_focus", "policy": self.ic_focus_policy}))
+
+    def apply_turn(self, game):
+        """Issues the commands for one turn: starts the next research in order when the slot is free."""
+        nation = game.game_state.player_nation
+        if nation.current_research is not None:
+            return
+        for tech_name in self.research_order:
+            if not nation.has_researched(tech_name):
+                game.process_command(Command("research", tech_name))
+                return
+
+def policy_grid(tax_rates=(0.15,), social_spending=(0,), ic_focus_policies=("Balanced",), research_orders=((),)):
+    """
+    Builds the cartesian product of the given policy settings.
+
+    Returns:
+        list[ScriptedPolicy]: One policy per combination.
+    """
+    return [
+        ScriptedPolicy(tax_rate, spending, focus, order)
+        for tax_rate, spending, focus, order in itertools.product(tax_rates, social_spending, ic_focus_policies, research_orders)
+    ]
+
+def run_game(policy, seed, turns, data):
+    """
+    Plays one headless game and records the player's metrics after every turn.
+
+    Args:
+        policy (ScriptedPolicy): The decisions to apply.
+        seed (int): The seed the game's random events are drawn with.
+        turns (int): The number of turns to simulate.
+        data (GameData or dict): Compiled or parsed game data.
+
+    Returns:
+        numpy.ndarray: Array of shape (turns, len(METRICS)).
+    """
+    game = Game(test_mode=True, data=data, seed=seed)
+    recorder = MetricsRecorder(capacity=turns, nation_fields=METRICS, industry_fields=())
+    recorder.attach(game)
+    policy.apply_initial(game)
+    for _ in range(turns):
+        policy.apply_turn(game)
+        game.process_command(Command("end_turn"))
+    return np.column_stack([recorder.nation(metric)[:, 0] for metric in METRICS])
+
+def _init_worker(data):
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+def _run_chunk(chunk, turns):
+    """Runs a chunk of (policy_index, policy, seed) games in a worker and returns only their metrics."""
+    return [(policy_index, run_game(policy, seed, turns, _WORKER_DATA)) for policy_index, policy, seed in chunk]
+
+class BatchResult:
+    """
+    Aggregated per-turn statistics of a batch run.
+
+    Attributes:
+        policies (list[ScriptedPolicy]): The policies that were run, in order.
+        percentiles (tuple): The percentiles that were computed.
+        stats (numpy.ndarray): Array of shape (policies, percentiles, turns, metrics).
+    """
+    def __init__(self, policies, percentiles, stats):
+        self.policies = policies
+        self.percentiles = percentiles
+        self.stats = stats
+
+    def get(self, policy_index, metric, percentile=50):
+        """
+        Returns the per-turn values of one metric percentile for one policy.
+
+        Args:
+            policy_index (int): Index into policies.
+            metric (str): One of METRICS.
+            percentile (float, optional): One of the computed percentiles. Defaults to 50.
+        """
+        return self.stats[policy_index, self.percentiles.index(percentile), :, METRICS.index(metric)]
+
+def run_batch(policies, seeds, turns, percentiles=(5, 50, 95), max_workers=None, chunk_size=None, data=None):
+    """
+    Runs every policy for every seed across a process pool.
+
+    Game data is compiled once and handed to each worker when it starts, and
+    workers only send back the per-turn metric arrays of their games.
+
+    Args:
+        policies (list[ScriptedPolicy]): The policies to evaluate.
+        seeds (iterable[int]): The seeds to run each policy with.
+        turns (int): The number of turns per game.
+        percentiles (tuple, optional): Percentiles to aggregate over seeds. Defaults to (5, 50, 95).
+        max_workers (int, optional): Worker process count. Defaults to the CPU count.
+        chunk_size (int, optional): Games per task. Defaults to an even split over four tasks per worker.
+        data (GameData or dict, optional): Compiled or parsed game data. Defaults to get_game_data().
+
+    Returns:
+        BatchResult: Percentiles of each metric per policy and turn.
+    """
+    if data is None:
+        data = get_game_data()
+    elif not isinstance(data, GameData):
+        data = compile_game_data(data)
+    seeds = list(seeds)
+    max_workers = max_workers or os.cpu_count() or 1
+    jobs = [(policy_index, policy, seed) for policy_index, policy in enumerate(policies) for seed in seeds]
+    if chunk_size is None:
+        chunk_size = max(1, len(jobs) // (max_workers * 4))
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    runs = np.empty((len(policies), len(seeds), turns, len(METRICS)))
+    filled = [0] * len(policies)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(data,)) as executor:
+        for results in executor.map(_run_chunk, chunks, itertools.repeat(turns)):
+            for policy_index, history in results:
+                runs[policy_index, filled[policy_index]] = history
+                filled[policy_index] += 1
+
+    stats = np.percentile(runs, percentiles, axis=1).transpose(1, 0, 2, 3)
+    return BatchResult(list(policies), tuple(percentiles), stats)
@@ -6,6 +6,8 @@ class Command:
         type (str): The type of the command.
         payload (any, optional): The payload of the command. Defaults to None.
     """
+    __slots__ = ("type", "payload")
+
     def __init__(self, type, payload=None):
         """
         Initializes the Command.
@@ -1,2 +1,175 @@
+import numpy as np
+from src.commands import Command
+from src.controller.projection import PolicyProjector, adjacent_options
+
 class AIController:
-    pass
\ No newline at end of file
+    """
+    Simple if-then rules for AI nations, evaluated for all of them at once.
+
+    Every turn, each AI nation:
+
+    * starts the first technology of research_order it has not researched when
+      it is not researching anything;
+    * queues construction_project on its most profitable industry when a
+      construction slot is free and the treasury covers a reserve plus several
+      turns of upkeep for everything it has already committed to;
+    * nudges its tax rate and social spending to keep target public opinion
+      inside opinion_band, and raises taxes and cuts spending while in deficit.
+      With budget_horizon, it instead projects every one-step change of tax
+      rate, social spending and IC focus over that many turns and takes the
+      one with the highest treasury whose public opinion stays above the
+      band's low end (or, if none does, the one with the highest opinion).
+
+    The nations' metrics are gathered into arrays once, the rules run as array
+    operations over all nations, and the decisions come back as standard
+    Commands, so a turn costs a handful of numpy operations rather than a rule
+    evaluation per nation.
+
+    Attributes:
+        research_order (list[str]): Technologies in the order AI nations research them.
+            Defaults to catalog order.
+        construction_project (str): The project AI nations build.
+        treasury_reserve (float): Treasury kept back before building.
+        upkeep_reserve_turns (int): Turns of upkeep the treasury must cover before building.
+        opinion_band (tuple): (low, high) target public opinion the AI tries to stay within.
+        tax_step (float): Tax rate change per turn.
+        tax_bounds (tuple): (minimum, maximum) tax rate.
+        social_step (float): Social spending change per turn.
+        max_social_spending (float): Social spending cap.
+        budget_horizon (int): Turns budget options are projected over; 0 uses the rules.
+    """
+    def __init__(self, research_order=None, construction_project="build_ic_1", treasury_reserve=500.0, upkeep_reserve_turns=5,
+                 opinion_band=(40.0, 60.0), tax_step=0.01, tax_bounds=(0.05, 0.40), social_step=50, max_social_spending=1000,
+                 budget_horizon=0):
+        self.research_order = research_order
+        self.construction_project = construction_project
+        self.treasury_reserve = treasury_reserve
+        self.upkeep_reserve_turns = upkeep_reserve_turns
+        self.opinion_band = opinion_band
+        self.tax_step = tax_step
+        self.tax_bounds = tax_bounds
+        self.social_step = social_step
+        self.max_social_spending = max_social_spending
+        self.budget_horizon = budget_horizon
+
+    def decide(self, game_state, nations):
+        """
+        Evaluates the rules for a batch of AI nations.
+
+        Args:
+            game_state (GameState): The current state of the game.
+            nations (list[Nation]): The AI nations to decide for.
+
+        Returns:
+            list: (nation, Command) pairs, grouped by rule.
+        """
+        if not nations:
+            return []
+        decisions = []
+        decisions.extend(self._decide_research(game_state, nations))
+        decisions.extend(self._decide_construction(game_state, nations))
+        if self.budget_horizon:
+            decisions.extend(self._decide_budget_projected(game_state, nations))
+        else:
+            decisions.extend(self._decide_budget(nations))
+        return decisions
+
+    def _decide_research(self, game_state, nations):
+        order = self.research_order if self.research_order is not None else list(game_state.available_technologies.keys())
+        if not order:
+            return []
+        count = len(nations)
+        idle = np.flatnonzero(np.fromiter((nation.current_research is None and len(nation.technologies) < len(order) for nation in nations), dtype=bool, count=count))
+        if not idle.size:
+            return []
+        # researched[i, t]: idle nation i has already researched order[t].
+        researched = np.array([[nations[nation_index].has_researched(name) for name in order] for nation_index in idle.tolist()], dtype=bool)
+        available = ~researched
+        has_next = available.any(axis=1)
+        next_tech = available.argmax(axis=1)
+        return [
+            (nations[nation_index], Command("research", order[tech]))
+            for nation_index, tech in zip(idle[has_next].tolist(), next_tech[has_next].tolist())
+        ]
+
+    def _decide_construction(self, game_state, nations):
+        definition = game_state.available_projects.get(self.construction_project)
+        if definition is None:
+            return []
+        count = len(nations)
+        treasury = np.fromiter((nation.treasury for nation in nations), dtype=np.float64, count=count)
+        pending = np.fromiter((len(nation.construction) for nation in nations), dtype=np.int64, count=count)
+        slots = np.fromiter((nation.construction_slots for nation in nations), dtype=np.int64, count=count)
+        committed_upkeep = np.fromiter((nation.construction.committed_upkeep() for nation in nations), dtype=np.float64, count=count)
+        affordable = treasury >= self.treasury_reserve + (committed_upkeep + definition['upkeep_cost']) * self.upkeep_reserve_turns
+        builders = np.flatnonzero((pending < slots) & affordable)
+        if not builders.size:
+            return []
+
+        builders = [index for index in builders.tolist() if len(nations[index].industries)]
+        if not builders:
+            return []
+        # Most profitable industry of every builder: one segmented argmax over all their industries.
+        profitabilities = [self._profitability(nations[index]) for index in builders]
+        lengths = np.fromiter((len(values) for values in profitabilities), dtype=np.int64, count=len(builders))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        flat = np.concatenate(profitabilities)
+        segment_max = np.maximum.reduceat(flat, offsets)
+        segment = np.repeat(np.arange(len(builders)), lengths)
+        is_max = flat == segment_max[segment]
+        _, first = np.unique(segment[is_max], return_index=True)
+        best = np.flatnonzero(is_max)[first] - offsets
+
+        decisions = []
+        for index, industry_position in zip(builders, best.tolist()):
+            nation = nations[index]
+            target = nation.industries[industry_position].name if definition.get('requires_target', False) else None
+            decisions.append((nation, Command("construction", {"type": "start_project", "project_id": self.construction_project, "target": target})))
+        return decisions
+
+    def _profitability(self, nation):
+        if nation.ledger is not None:
+            return nation.ledger.profitability()
+        return np.fromiter((industry.profitability for industry in nation.industries), dtype=np.float64, count=len(nation.industries))
+
+    def _decide_budget(self, nations):
+        count = len(nations)
+        treasury = np.fromiter((nation.treasury for nation in nations), dtype=np.float64, count=count)
+        opinion = np.fromiter((nation.target_public_opinion for nation in nations), dtype=np.float64, count=count)
+        tax = np.fromiter((nation.tax_rate for nation in nations), dtype=np.float64, count=count)
+        social = np.fromiter((nation.budget["social_spending"] for nation in nations), dtype=np.float64, count=count)
+        low, high = self.opinion_band
+        min_tax, max_tax = self.tax_bounds
+
+        deficit = treasury < 0
+        unhappy = (opinion < low) & ~deficit
+        content = (opinion > high) | deficit
+        can_spend = social < self.max_social_spending
+        # Unhappy nations spend more on social programs if they can, otherwise cut taxes.
+        raise_social = unhappy & can_spend & (treasury >= self.treasury_reserve)
+        cut_tax = unhappy & ~raise_social & (tax > min_tax)
+        # Content nations raise taxes; nations in deficit also cut social spending.
+        raise_tax = content & (tax < max_tax)
+        cut_social = deficit & (social > 0)
+
+        new_tax = np.where(cut_tax, np.maximum(tax - self.tax_step, min_tax), tax)
+        new_tax = np.where(raise_tax, np.minimum(tax + self.tax_step, max_tax), new_tax)
+        new_tax = np.round(new_tax, 6)
+        new_social = np.where(raise_social, np.minimum(social + self.social_step, self.max_social_spending), social)
+        new_social = np.where(cut_social, np.maximum(social - self.social_step, 0), new_social)
+
+        decisions = []
+        for index in np.flatnonzero(cut_tax | raise_tax).tolist():
+            decisions.append((nations[index], Command("set_tax", float(new_tax[index]))))
+        for index in np.flatnonzero(raise_social | cut_social).tolist():
+            decisions.append((nations[index], Command("budget", {"category": "social_spending", "amount": float(new_social[index])})))
+        return decisions
+
+    def _decide_budget_projected(self, game_state, nations):
+        decisions = []
+        for nation in nations:
+            options = adjacent_options(nation, self.tax_step, self.social_step, self.tax_bounds, self.max_social_spending)
+            projection = PolicyProjector(nation, game_state.turn).project(options, self.budget_horizon)
+            best = projection.best("treasury", min_public_opinion=self.opinion_band[0]) or projection.best("public_opinion")
+            decisions.extend((nation, command) for command in best.commands(nation))
+        return decisions
@@ -0,0 +1,237 @@
+import numpy as np
+
+from src.random_stream import stream_key, uniforms
+
+ATTACKER, DEFENDER, UNDECIDED = 0, 1, -1
+
+# Overload tiers by how far stress ran over capacity, as a fraction of capacity.
+MINOR_OVERLOAD = 0.25
+MAJOR_OVERLOAD = 0.5
+# Self-damage of a minor, major and critical overload, as a fraction of the unit's full hit points.
+OVERLOAD_SELF_DAMAGE = np.array([0.05, 0.15, 0.30])
+# A minor overload halves the unit's damage in its next round.
+WEAPON_DEBUFF = 0.5
+# Armor never stops more than this share of a hit.
+MIN_DAMAGE_SHARE = 0.1
+# Damage rolls vary by up to this much either way.
+DAMAGE_SPREAD = 0.2
+
+_TARGET_KEY = stream_key("combat.target")
+_DAMAGE_KEY = stream_key("combat.damage")
+# Room for units per engagement in a unit's random key.
+_POSITION_BITS = 20
+
+class Engagement:
+    """
+    One fight between two forces, such as an expedition or a crisis attack.
+
+    Attributes:
+        attackers (tuple[Unit]): The attacking units.
+        defenders (tuple[Unit]): The defending units.
+        key (int): The engagement's random key. The same units with the same key
+            fight the same battle under the same seed, whatever else is in the batch.
+            None uses the engagement's index in the batch.
+    """
+    __slots__ = ("attackers", "defenders", "key")
+
+    def __init__(self, attackers, defenders, key=None):
+        self.attackers = tuple(attackers)
+        self.defenders = tuple(defenders)
+        self.key = key
+
+    def __repr__(self):
+        return f"Engagement({len(self.attackers)} attackers, {len(self.defenders)} defenders, key={self.key})"
+
+class CombatResult:
+    """
+    The outcome of a batch of engagements. Units are numbered through the batch,
+    each engagement's attackers then its defenders.
+
+    Attributes:
+        winner (numpy.ndarray): ATTACKER, DEFENDER or UNDECIDED (both sides destroyed,
+            or still fighting after max_rounds) per engagement.
+        rounds (numpy.ndarray): The rounds each engagement lasted.
+        survivors (numpy.ndarray): (engagements, 2) surviving attackers and defenders.
+        hp (numpy.ndarray): Every unit's hit points at the end; 0 or less is destroyed.
+        overloads (numpy.ndarray): How many times every unit overloaded.
+        offsets (numpy.ndarray): Where each engagement's units start, with the total at the end.
+        sides (numpy.ndarray): Every unit's side, ATTACKER or DEFENDER.
+    """
+    __slots__ = ("winner", "rounds", "survivors", "hp", "overloads", "offsets", "sides")
+
+    def __init__(self, winner, rounds, survivors, hp, overloads, offsets, sides):
+        self.winner = winner
+        self.rounds = rounds
+        self.survivors = survivors
+        self.hp = hp
+        self.overloads = overloads
+        self.offsets = offsets
+        self.sides = sides
+        for array in (winner, rounds, survivors, hp, overloads, offsets, sides):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.winner)
+
+    def win_rate(self, side=ATTACKER):
+        """Returns the share of engagements a side won."""
+        return float(np.mean(self.winner == side)) if len(self) else 0.0
+
+    def units(self, engagement):
+        """
+        Returns the end-of-combat hit points of one engagement's units.
+
+        Args:
+            engagement (int): The engagement's index in the batch.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The attackers' and the defenders' hit points.
+        """
+        start, end = self.offsets[engagement], self.offsets[engagement + 1]
+        hp, sides = self.hp[start:end], self.sides[start:end]
+        return hp[sides == ATTACKER], hp[sides == DEFENDER]
+
+class CombatResolver:
+    """
+    Resolves tactical combat between units for many independent engagements at once.
+
+    The units of every engagement in a batch live in flat arrays (hit points,
+    armor, damage, stress and stress capacity) sorted by group, a group being
+    one side of one engagement. Each round is a handful of array operations
+    over the whole batch:
+
+    1. Targeting: every unit that can act picks a random living enemy.
+    2. Runes: every acting unit gains its runes' stress.
+    3. Damage: every hit is rolled, reduced by the target's armor and summed
+       per target, so both sides strike simultaneously.
+    4. Overload: a unit whose stress exceeds its capacity overloads, vents its
+       stress and, by how far over it went, takes a minor (weapon debuff next
+       round), major (stunned next round) or critical (runes burnt out for the
+       rest of the fight) overload, each with growing self-damage.
+
+    An engagement ends when a side is destroyed or after max_rounds. Random
+    draws come from random_stream, keyed by seed, round, engagement key and
+    unit position, so results do not depend on batch composition or order.
+    """
+
+    def resolve(self, engagements, seed=0, max_rounds=50):
+        """
+        Resolves a batch of engagements.
+
+        Args:
+            engagements (list[Engagement]): The engagements to fight.
+            seed (int): The random seed.
+            max_rounds (int): The most rounds an engagement lasts.
+
+        Returns:
+            CombatResult: The outcome of every engagement.
+        """
+        engagements = list(engagements)
+        designs, index = {}, []
+        for engagement in engagements:
+            for unit in engagement.attackers + engagement.defenders:
+                index.append(designs.setdefault(id(unit), (len(designs), unit))[0])
+        sizes = np.array([(len(e.attackers), len(e.defenders)) for e in engagements], dtype=np.int64).reshape(-1, 2)
+        keys = [index_ if e.key is None else e.key for index_, e in enumerate(engagements)]
+        return self._fight(_design_table(designs.values()), np.array(index, dtype=np.int64), sizes, keys, seed, max_rounds)
+
+    def simulate(self, engagement, trials, seed=0, max_rounds=50):
+        """
+        Fights one engagement many times, as a Monte Carlo estimate of its outcome.
+
+        Trial i uses key i, so it is the same battle as resolving the engagement
+        with key=i on its own.
+
+        Args:
+            engagement (Engagement): The engagement to fight.
+            trials (int): The number of trials.
+            seed (int): The random seed.
+            max_rounds (int): The most rounds a trial lasts.
+
+        Returns:
+            CombatResult: One engagement per trial.
+        """
+        units = engagement.attackers + engagement.defenders
+        designs = {}
+        index = [designs.setdefault(id(unit), (len(designs), unit))[0] for unit in units]
+        sizes = np.tile([len(engagement.attackers), len(engagement.defenders)], (trials, 1))
+        return self._fight(_design_table(designs.values()), np.tile(np.array(index, dtype=np.int64), trials), sizes, range(trials), seed, max_rounds)
+
+    def _fight(self, table, design, sizes, keys, seed, max_rounds):
+        """Runs the rounds over unit arrays built from a design table and each unit's design index."""
+        engagements = len(sizes)
+        groups = 2 * engagements
+        counts = sizes.reshape(-1)
+        group = np.repeat(np.arange(groups), counts)
+        engagement_of = group >> 1
+        offsets = np.zeros(engagements + 1, dtype=np.int64)
+        np.cumsum(sizes.sum(axis=1), out=offsets[1:])
+        position = np.arange(len(group)) - offsets[engagement_of]
+        engagement_keys = np.array([key & ((1 << 64) - 1) for key in keys], dtype=np.uint64).reshape(-1)
+        unit_keys = (engagement_keys[engagement_of] << np.uint64(_POSITION_BITS)) ^ position.astype(np.uint64)
+
+        max_hp = table["hp"][design]
+        hp = max_hp.copy()
+        armor = table["armor"][design]
+        damage = table["damage"][design]
+        capacity = table["stress_capacity"][design]
+        bonus = table["damage_bonus"][design]
+        stress_per_round = table["stress_per_round"][design]
+        stress = np.zeros(len(group))
+        overloads = np.zeros(len(group), dtype=np.int64)
+        debuffed = np.zeros(len(group), dtype=bool)
+        stunned = np.zeros(len(group), dtype=bool)
+        rounds = np.zeros(engagements, dtype=np.int64)
+        event_keys = np.array([_TARGET_KEY, _DAMAGE_KEY], dtype=np.uint64)
+
+        for round_ in range(max_rounds):
+            alive = hp > 0
+            alive_counts = np.bincount(group[alive], minlength=groups)
+            fighting = (alive_counts[0::2] > 0) & (alive_counts[1::2] > 0)
+            if not fighting.any():
+                break
+            rounds += fighting
+            acting = np.flatnonzero(alive & ~stunned & fighting[engagement_of])
+            draws = uniforms(seed, round_, unit_keys[acting], event_keys)
+
+            # Living units are in group order, so each group's living units are one run of alive_index.
+            alive_index = np.flatnonzero(alive)
+            starts = np.cumsum(alive_counts) - alive_counts
+            enemy = group[acting] ^ 1
+            pick = np.minimum((draws[:, 0] * alive_counts[enemy]).astype(np.int64), alive_counts[enemy] - 1)
+            target = alive_index[starts[enemy] + pick]
+
+            stress[acting] += stress_per_round[acting]
+            raw = damage[acting] * (1.0 + bonus[acting]) * np.where(debuffed[acting], WEAPON_DEBUFF, 1.0)
+            raw *= 1.0 - DAMAGE_SPREAD + 2.0 * DAMAGE_SPREAD * draws[:, 1]
+            dealt = np.maximum(raw - armor[target], MIN_DAMAGE_SHARE * raw)
+            incoming = np.bincount(target, weights=dealt, minlength=len(group))
+
+            debuffed[:] = False
+            stunned[:] = False
+            over = stress[acting] - capacity[acting]
+            overloaded = acting[over > 0]
+            if len(overloaded):
+                ratio = np.divide(over[over > 0], capacity[overloaded], out=np.full(len(overloaded), np.inf), where=capacity[overloaded] > 0)
+                tier = (ratio > MINOR_OVERLOAD).astype(np.int64) + (ratio > MAJOR_OVERLOAD)
+                incoming[overloaded] += OVERLOAD_SELF_DAMAGE[tier] * max_hp[overloaded]
+                debuffed[overloaded[tier == 0]] = True
+                stunned[overloaded[tier == 1]] = True
+                burnt = overloaded[tier == 2]
+                bonus[burnt] = 0.0
+                stress_per_round[burnt] = 0.0
+                stress[overloaded] = 0.0
+                overloads[overloaded] += 1
+            hp -= incoming
+
+        alive_counts = np.bincount(group[hp > 0], minlength=groups).reshape(-1, 2)
+        winner = np.full(engagements, UNDECIDED, dtype=np.int64)
+        winner[(alive_counts[:, 0] > 0) & (alive_counts[:, 1] == 0)] = ATTACKER
+        winner[(alive_counts[:, 0] == 0) & (alive_counts[:, 1] > 0)] = DEFENDER
+        return CombatResult(winner, rounds, alive_counts, hp, overloads, offsets, group & 1)
+
+def _design_table(designs):
+    """Returns the combat stats of (index, unit) designs as {stat: array}, in index order."""
+    units = [unit for _, unit in designs]
+    return {stat: np.array([getattr(unit, stat) for unit in units], dtype=np.float64)
+            for stat in ("hp", "armor", "damage", "stress_capacity", "damage_bonus", "stress_per_round")}
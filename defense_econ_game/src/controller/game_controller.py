@@ -1,13 +1,40 @@
+import logging
+import numpy as np
+from src.models import economy_rules
+from src.models.arms_market import ArmsMarket
+from src.game_log import current_turn, get_logger
 from src.models.project_instance import ProjectInstance
 from src.commands import Command
 from src.models.industry import Industry
+from src.models.nation import Nation
+from src.models.technology import ResearchProgress
+from src.controller.turn_engine import TurnEngine
+
+command_log = get_logger("commands")
+research_log = get_logger("research")
+construction_log = get_logger("construction")
+economy_log = get_logger("economy")
+events_log = get_logger("events")
+market_log = get_logger("market")
+
+# Phases a fast-forwarded turn skips: it is only taken when the AI has nothing to do and no event fires.
+SMOOTH_SKIPPED_PHASES = ("ai", "events")
+# The Industry fields the economy phase reads.
+INDUSTRY_COLUMNS = ("government_ic", "private_ic", "base_profitability", "tax_rate", "subsidy_per_ic", "level")
 
 class GameController:
     """
     Handles the game logic and player commands.
 
+    Messages go to the loggers of src/game_log.py: player-facing messages at
+    INFO, other nations' at DEBUG, calculation breakdowns at DEBUG and
+    rejected commands at WARNING. Nothing is formatted unless a handler
+    configured with configure_logging wants it.
+
     Attributes:
-        test_mode (bool): Whether the game is in test mode.
+        test_mode (bool): Whether the game runs without a player, as in tests, batch runs and planning.
+        ai_controller (AIController): Decides for the AI nations at the start of every
+            end of turn, or None if AI nations take no actions.
     """
     def __init__(self, test_mode=False):
         """
@@ -17,33 +44,47 @@ class GameController:
             test_mode (bool, optional): Whether the game is in test mode. Defaults to False.
         """
         self.test_mode = test_mode
+        self.ai_controller = None
+        # (game_state, turn, decisions) taken by advance_until for the coming AI phase.
+        self._ai_decisions = None
+        self.turn_engine = TurnEngine(self)
+
+    def _level(self, game_state, nation):
+        """Messages about the player's nation are INFO; about other nations, DEBUG."""
+        return logging.INFO if nation is game_state.player_nation else logging.DEBUG
 
-    def _print(self, *args, **kwargs):
+    def set_ai_controller(self, ai_controller):
         """
-        Prints messages if not in test mode.
+        Lets an AIController act for the AI nations, or stops it with None.
 
-        Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+        The AI acts in an "ai" phase that runs first in every end of turn,
+        matching the AI Action Phase of the turn sequence.
         """
-        if not self.test_mode:
-            print(*args, **kwargs)
+        if self.ai_controller is None and ai_controller is not None:
+            self.turn_engine.register_phase("ai", self._run_ai, before="research")
+        elif self.ai_controller is not None and ai_controller is None:
+            self.turn_engine.unregister_phase("ai")
+        self.ai_controller = ai_controller
 
-    def execute_command(self, game_state, command):
+    def execute_command(self, game_state, command, nation=None):
         """
         Executes a command.
 
         Args:
             game_state (GameState): The current state of the game.
             command (Command): The command to execute.
+            nation (Nation, optional): The nation issuing the command. Defaults to the player nation.
         """
-        nation = game_state.player_nation
+        game_state.mark_changed()
+        current_turn.set(game_state.turn)
+        if nation is None:
+            nation = game_state.player_nation
         if command.type == "end_turn":
             self._process_end_turn(game_state)
         elif command.type == "research":
             self.set_research(nation, command.payload, game_state)
         elif command.type == "policy":
-            self.set_policy(nation, command.payload)
+            self.set_policy(nation, command.payload, game_state)
         elif command.type == "set_tax":
             self.set_tax_rate(nation, command.payload)
         elif command.type == "budget":
@@ -51,183 +92,356 @@ class GameController:
         elif command.type == "construction":
             payload = command.payload
             if payload['type'] == "start_project":
-                self.start_project(nation, payload['project_id'], payload.get('target'))
+                self.start_project(nation, payload['project_id'], payload.get('target'), game_state)
             elif payload['type'] == "cancel_project":
-                self.cancel_project(nation, payload['queue_index'])
+                if payload.get('handle') is not None:
+                    self.cancel_project(nation, handle=payload['handle'])
+                else:
+                    self.cancel_project(nation, payload['queue_index'])
             elif payload['type'] == "set_ic_focus":
                 self.set_ic_focus(nation, payload['policy'])
+        elif command.type == "market":
+            payload = command.payload
+            if payload.get('type') == "cancel":
+                self.cancel_order(game_state, nation, payload.get('order_id'))
+            else:
+                self.post_order(game_state, nation, payload.get('type'), payload.get('item'), payload.get('quantity'), payload.get('price'),
+                                payload.get('duration'))
 
     def _process_end_turn(self, game_state):
-        """Processes all end-of-turn game logic in a specific order."""
-        self._update_research(game_state)
-        self._update_construction(game_state)
-        self._update_civilian_economies(game_state)
-        self._update_economy(game_state)
-        self._check_for_events(game_state)
-        game_state.turn += 1
+        """Processes all end-of-turn game logic for every nation in a specific order."""
+        self.turn_engine.process_end_turn(game_state)
+
+    def advance_until(self, game_state, turn=None, condition=None):
+        """
+        Fast-forwards the game until a turn is reached or a condition holds.
+
+        Turns in which nothing discrete happens (no AI nation acts, no research
+        or project completes, no project leaves the queue, no event threshold
+        is crossed, no random event fires and no nation with construction is
+        in deficit) only compound GDP, move public opinion and accrue RP, CP
+        and treasury. Those turns run the same phase functions, but skip the
+        AI and events phases and the phase timing and hooks. Any other turn,
+        and every turn while metrics are enabled, runs the full end-of-turn
+        pipeline. The results are identical to calling _process_end_turn once
+        per turn.
+
+        Args:
+            game_state (GameState): The current state of the game.
+            turn (int, optional): Stop once game_state.turn reaches this turn.
+            condition (callable, optional): Stop after the first turn for which
+                condition(game_state) is true.
 
-    def _update_research(self, game_state):
-        """Handles the research progress and completion."""
-        nation = game_state.player_nation
-        if nation.current_research:
+        Returns:
+            int: The number of turns advanced.
+        """
+        if turn is None and condition is None:
+            raise ValueError("advance_until needs a turn or a condition to stop at")
+        game_state.mark_changed()
+        start_turn = game_state.turn
+        try:
+            while turn is None or game_state.turn < turn:
+                nations = game_state.nations
+                if self.turn_engine.metrics.enabled or self._has_discrete_change(game_state, nations):
+                    self._process_end_turn(game_state)
+                else:
+                    self._advance_smooth(game_state, nations)
+                self._ai_decisions = None
+                if condition is not None and condition(game_state):
+                    break
+        finally:
+            self._ai_decisions = None
+        return game_state.turn - start_turn
+
+    def _has_discrete_change(self, game_state, nations):
+        """Returns whether the coming end of turn does anything beyond smooth accrual."""
+        if self.ai_controller is not None:
+            # Kept for the AI phase of this turn, so the AI decides once per turn.
+            decisions = self.ai_controller.decide(game_state, self._ai_nations(game_state, nations))
+            self._ai_decisions = (game_state, game_state.turn, decisions)
+            if decisions:
+                return True
+        events = game_state.available_events
+        for meter in ("crisis_awareness", "social_dissonance", "turn"):
+            threshold = events.next_threshold(meter)
+            if threshold is not None and getattr(game_state, meter) >= threshold:
+                return True
+        # Draws depend only on the seed, turn and meters, so they can be taken ahead of the turn.
+        if events.draw(game_state, nations):
+            return True
+        if game_state.market.needs_matching(game_state.turn):
+            return True
+        for nation in nations:
             tech = nation.current_research
-            effective_rp = nation.get_effective_research_points()
-            tech.rp_progress += effective_rp
-            if tech.rp_progress >= tech.rp_cost:
-                tech.is_researched = True
-                nation.technologies.append(tech)
-                nation.current_research = None
-                self._print(f"Technology researched: {tech.name}")
-                for industry_name in tech.unlocks_industries:
-                    for industry in game_state.all_industries:
-                        if industry.name == industry_name:
-                            new_industry = Industry(industry.name, industry.tier, industry.profitability, government_ic=0.0, private_ic=0.0, level_bonuses=industry.level_bonuses)
-                            nation.industries.append(new_industry)
-                            self._print(f"New industry unlocked: {new_industry.name}")
-
-    def _update_construction(self, game_state):
-        """Handles construction queue, project progress, and completion."""
-        nation = game_state.player_nation
-        while len(nation.active_projects) < nation.construction_slots and nation.project_queue:
-            nation.active_projects.append(nation.project_queue.pop(0))
-
-        if nation.treasury < 0:
-            self._print(f"{nation.name}'s treasury is in deficit. Construction is paused.")
-            return
+            if tech and tech.rp_progress + nation.get_effective_research_points() >= tech.rp_cost:
+                return True
+            if len(nation.construction):
+                if nation.treasury < 0:
+                    return True
+                if nation.construction.queue_length and len(nation.active_projects) < nation.construction_slots:
+                    return True
+                cp = nation.calculate_construction_points()
+                for project in nation.active_projects:
+                    if project.definition and project.current_cp + cp >= project.definition['cp_cost']:
+                        return True
+        return False
+
+    def _advance_smooth(self, game_state, nations):
+        """Runs one end of turn known to contain no discrete changes: every phase but the AI and events phases, untimed."""
+        engine = self.turn_engine
+        current_turn.set(game_state.turn)
+        engine.run_turn_hooks("before", game_state)
+        for name, phase in engine.phases:
+            if name not in SMOOTH_SKIPPED_PHASES:
+                phase(game_state, nations)
+        engine.run_turn_hooks("after", game_state)
+        game_state.turn += 1
 
-        total_cp_generated = nation.calculate_construction_points()
-        cp_per_project = total_cp_generated
+    def _ai_nations(self, game_state, nations):
+        player = game_state.player_nation
+        return [nation for nation in nations if nation is not player]
 
-        for project in reversed(nation.active_projects):
-            project_def = next((p for p in game_state.available_projects if p['id'] == project.project_id), None)
-            if not project_def:
+    def _run_ai(self, game_state, nations):
+        """Executes the AI controller's decisions for every AI nation."""
+        cached, self._ai_decisions = self._ai_decisions, None
+        if cached is not None and cached[0] is game_state and cached[1] == game_state.turn:
+            decisions = cached[2]
+        else:
+            decisions = self.ai_controller.decide(game_state, self._ai_nations(game_state, nations))
+        for nation, command in decisions:
+            self.execute_command(game_state, command, nation)
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("ai_commands", len(decisions))
+
+    def _update_research(self, game_state, nations):
+        """Handles the research progress and completion of every researching nation in one batch."""
+        researching = [nation for nation in nations if nation.current_research]
+        count = len(researching)
+        research_points = np.fromiter((nation.research_points for nation in researching), dtype=np.float64, count=count)
+        bonus = np.fromiter((nation.modifiers.get("research_bonus", nation.current_research.name) for nation in researching),
+                            dtype=np.float64, count=count)
+        rp_progress = np.fromiter((nation.current_research.rp_progress for nation in researching), dtype=np.float64, count=count)
+        rp_cost = np.fromiter((nation.current_research.rp_cost for nation in researching), dtype=np.float64, count=count)
+
+        effective_rp = economy_rules.effective_research_points(research_points, bonus)
+        rp_progress += effective_rp
+        done = (rp_progress >= rp_cost).tolist()
+
+        completed = 0
+        debug = research_log.isEnabledFor(logging.DEBUG)
+        for nation, progress_value, rp, finished in zip(researching, rp_progress.tolist(), effective_rp.tolist(), done):
+            progress = nation.current_research
+            progress.rp_progress = progress_value
+            if debug:
+                research_log.debug("%s: %s %.1f/%s RP (+%.1f)", nation.name, progress.name, progress.rp_progress, progress.rp_cost, rp,
+                                   extra={"nation": nation.name, "technology": progress.name, "rp_progress": progress.rp_progress, "effective_rp": rp})
+            if finished:
+                progress.is_researched = True
+                completed += 1
+                tech = progress.definition
+                nation.add_technology(tech)
+                nation.current_research = None
+                level = self._level(game_state, nation)
+                research_log.log(level, "Technology researched: %s", tech.name, extra={"nation": nation.name, "technology": tech.name})
+                for industry in tech.unlocked_industries:
+                    # Unlocked industries start from the definition's after-tax profitability and no IC.
+                    profitability = industry.profitability * (1 - Industry.DEFAULT_TAX_RATE)
+                    new_industry = nation.add_industry(Industry.of(industry, profitability, government_ic=0.0, private_ic=0.0))
+                    research_log.log(level, "New industry unlocked: %s", new_industry.name, extra={"nation": nation.name, "industry": new_industry.name})
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("nations_researching", count)
+            metrics.count("technologies_completed", completed)
+
+    def _update_construction(self, game_state, nations):
+        """Handles construction queues, project progress and completion, with every building nation's CP computed in one batch."""
+        building = [nation for nation in nations if len(nation.construction)]
+        if not building:
+            return
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("projects_processed", sum(len(nation.construction) for nation in building))
+        count = len(building)
+        industrial_capacity = np.fromiter((nation.industrial_capacity for nation in building), dtype=np.float64, count=count)
+        focus = np.fromiter((nation.ic_focus_policy == economy_rules.INFRASTRUCTURE_FOCUS for nation in building), dtype=bool, count=count)
+        construction_points = economy_rules.construction_points(industrial_capacity, focus)
+
+        debug = construction_log.isEnabledFor(logging.DEBUG)
+        for nation, cp in zip(building, construction_points.tolist()):
+            construction = nation.construction
+            construction.promote(nation.construction_slots)
+            if nation.treasury < 0:
+                construction_log.log(self._level(game_state, nation), "%s's treasury is in deficit. Construction is paused.", nation.name,
+                                     extra={"nation": nation.name, "treasury": nation.treasury})
                 continue
-
-            project.current_cp += cp_per_project
-            if project.current_cp >= project_def['cp_cost']:
-                self._print(f"Construction of {project_def['name']} completed for {nation.name}.")
+            if debug:
+                construction_log.debug("%s: %.1f CP to each of %d active projects", nation.name, cp, len(construction.active),
+                                       extra={"nation": nation.name, "cp": cp, "active_projects": len(construction.active)})
+            completed = construction.advance(cp)
+            for project in completed:
+                project_def = project.definition
+                construction_log.log(self._level(game_state, nation), "Construction of %s completed for %s.", project_def['name'], nation.name,
+                                     extra={"nation": nation.name, "project": project_def['id'], "handle": project.handle})
                 for effect, value in project_def['effects'].items():
                     if effect == "add_ic" and project.target:
-                        target_industry = next((i for i in nation.industries if i.name == project.target), None)
+                        target_industry = nation.get_industry(project.target)
                         if target_industry:
                             target_industry.government_ic += value
                     elif effect == "add_infrastructure":
                         nation.infrastructure_level += value
-                nation.active_projects.remove(project)
+            if completed and metrics.enabled:
+                metrics.count("projects_completed", len(completed))
+
+    def _update_civilian_economies(self, game_state, nations):
+        """Handles GDP growth and public opinion changes for all nations in one batch."""
+        count = len(nations)
+        growth_rates = np.fromiter((nation.get_gdp_growth_rate() for nation in nations), dtype=np.float64, count=count)
+        civilian_gdp = np.fromiter((nation.civilian_gdp for nation in nations), dtype=np.float64, count=count)
+        public_opinion = np.fromiter((nation.public_opinion for nation in nations), dtype=np.float64, count=count)
+        target_public_opinion = np.fromiter((nation.target_public_opinion for nation in nations), dtype=np.float64, count=count)
 
-    def _update_civilian_economies(self, game_state):
-        """Handles GDP growth and public opinion changes."""
-        nation = game_state.player_nation
-        
         # Update GDP
-        final_growth_rate = nation.get_gdp_growth_rate()
-        nation.civilian_gdp *= (1 + final_growth_rate)
+        civilian_gdp *= (1 + growth_rates)
 
         # Update Public Opinion
-        opinion_difference = nation.target_public_opinion - nation.public_opinion
-        nation.public_opinion += opinion_difference * 0.20
-        nation.public_opinion = max(0, min(100, nation.public_opinion))
-
-    def _update_economy(self, game_state):
-        """Handles all treasury changes and private sector reinvestment."""
-        nation = game_state.player_nation
-        
-        # Calculate income
-        industrial_profit = 0
-        private_reinvestment_pool = 0
-        for industry in nation.industries:
-            government_profit = industry.government_ic * industry.base_profitability
-            private_profit = industry.private_ic * industry.profitability
-            industrial_profit += government_profit * 0.8
-            industrial_profit += private_profit * industry.tax_rate
-            private_reinvestment_pool += private_profit * (1 - industry.tax_rate)
-
-        tax_revenue = nation.civilian_gdp * nation.tax_rate
+        public_opinion = economy_rules.next_public_opinion(public_opinion, target_public_opinion)
+
+        for nation, gdp, opinion in zip(nations, civilian_gdp.tolist(), public_opinion.tolist()):
+            nation.civilian_gdp = gdp
+            nation.public_opinion = opinion
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("nations_updated", count)
+
+    def _update_economy(self, game_state, nations):
+        """Handles all treasury changes in one batch, then private sector reinvestment."""
+        count = len(nations)
+        owner, industries = Nation.industry_columns(nations, INDUSTRY_COLUMNS)
+        profitability = economy_rules.industry_profitability(industries["base_profitability"], industries["tax_rate"], industries["subsidy_per_ic"])
+        profit, pool = economy_rules.industry_income(industries["government_ic"], industries["private_ic"], industries["base_profitability"],
+                                                     industries["tax_rate"], profitability)
+        industrial_profit = np.bincount(owner, weights=profit, minlength=count)
+        reinvestment_pool = np.bincount(owner, weights=pool, minlength=count)
+        civilian_gdp = np.fromiter((nation.civilian_gdp for nation in nations), dtype=np.float64, count=count)
+        tax_rate = np.fromiter((nation.tax_rate for nation in nations), dtype=np.float64, count=count)
+        social_spending = np.fromiter((nation.budget["social_spending"] for nation in nations), dtype=np.float64, count=count)
+        upkeep = np.fromiter((nation.calculate_upkeep_costs() for nation in nations), dtype=np.float64, count=count)
+        treasury = np.fromiter((nation.treasury for nation in nations), dtype=np.float64, count=count)
+
+        tax_revenue = civilian_gdp * tax_rate
         total_income = industrial_profit + tax_revenue
-
-        # Calculate expenses
-        social_spending = nation.budget["social_spending"]
-        upkeep_costs = sum(
-            p_def['upkeep_cost']
-            for proj in nation.active_projects
-            if (p_def := next((p for p in game_state.available_projects if p['id'] == proj.project_id), None))
-        )
-        total_expenses = social_spending + upkeep_costs
-
-        # Update treasury
-        nation.treasury += total_income - total_expenses
-
-        # Private Reinvestment
-        if private_reinvestment_pool > 0:
-            profitable_industries = [ind for ind in nation.industries if ind.profitability > 0]
-            if profitable_industries:
-                total_profitability = sum(ind.profitability for ind in profitable_industries)
-                
-                total_private_ic_cost_reduction = sum(
-                    tech.private_ic_cost_reduction for tech in nation.technologies if tech.is_researched
+        total_expenses = social_spending + upkeep
+        treasury += total_income - total_expenses
+        for nation, value in zip(nations, treasury.tolist()):
+            nation.treasury = value
+
+        if economy_log.isEnabledFor(logging.DEBUG):
+            for i, nation in enumerate(nations):
+                economy_log.debug(
+                    "%s: income %.1f (industry %.1f, tax %.1f), expenses %.1f (social %.1f, upkeep %.1f), treasury %.1f",
+                    nation.name, total_income[i], industrial_profit[i], tax_revenue[i], total_expenses[i], social_spending[i], upkeep[i],
+                    nation.treasury,
+                    extra={"nation": nation.name, "industrial_profit": float(industrial_profit[i]), "tax_revenue": float(tax_revenue[i]),
+                           "social_spending": float(social_spending[i]), "upkeep": float(upkeep[i]), "treasury": nation.treasury,
+                           "reinvestment_pool": float(reinvestment_pool[i])},
                 )
-                effective_ic_cost_per_unit = 10.0 * (1 - total_private_ic_cost_reduction)
-
-                for industry in profitable_industries:
-                    share = industry.profitability / total_profitability
-                    investment_amount = private_reinvestment_pool * share
-                    industry_ic_cost_multiplier = (1 - industry.get_ic_reinvestment_cost_reduction())
-                    final_ic_cost_per_unit = effective_ic_cost_per_unit * industry_ic_cost_multiplier
-                    if final_ic_cost_per_unit > 0:
-                        ic_to_add = investment_amount / final_ic_cost_per_unit
-                        industry.private_ic += ic_to_add
-
-    def _check_for_events(self, game_state):
-        """Checks for and triggers events."""
-        for event in game_state.available_events[:]:
-            if game_state.crisis_awareness >= event.trigger_threshold:
-                self._print(f"EVENT: {event.name}")
-                self._print(event.description)
-                for effect, value in event.effects.items():
-                    current_value = getattr(game_state.player_nation, effect)
-                    setattr(game_state.player_nation, effect, current_value + value)
-                game_state.available_events.remove(event)
+
+        # Private Reinvestment: each nation's pool buys private IC in proportion to profitability.
+        reinvesting = reinvestment_pool > 0
+        if reinvesting.any():
+            cost_reduction = np.fromiter((nation.modifiers.get("private_ic_cost_reduction") for nation in nations), dtype=np.float64, count=count)
+            ic_cost = economy_rules.ic_cost_per_unit(cost_reduction)[owner] * economy_rules.level_cost_multiplier(industries["level"])
+            investment = reinvestment_pool[owner] * economy_rules.reinvestment_shares(profitability, owner)
+            valid = reinvesting[owner] & (investment > 0) & (ic_cost > 0)
+            private_ic = industries["private_ic"]
+            private_ic[valid] += investment[valid] / ic_cost[valid]
+            Nation.set_industry_column(nations, "private_ic", private_ic, owner, np.flatnonzero(reinvesting).tolist())
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("industries_processed", len(owner))
+
+    def _update_market(self, game_state, nations):
+        """Matches the arms market's pending orders and settles the trades between treasuries."""
+        market = game_state.market
+        if not market.needs_matching(game_state.turn):
+            market.trades = []
+            return
+        trades = market.match(game_state.turn, {nation.name: nation.treasury for nation in nations})
+        ArmsMarket.settle(trades, nations)
+        if trades and market_log.isEnabledFor(logging.DEBUG):
+            for trade in trades:
+                market_log.debug("%s bought %d %s from %s at %.1f", trade.buyer, trade.quantity, trade.item, trade.seller, trade.price,
+                                 extra={"buyer": trade.buyer, "seller": trade.seller, "item": trade.item, "quantity": trade.quantity, "price": trade.price})
+        metrics = self.turn_engine.metrics
+        if metrics.enabled:
+            metrics.count("trades", len(trades))
+            metrics.count("open_orders", len(market))
+
+    def _check_for_events(self, game_state, nations):
+        """Checks for and triggers events. Threshold events apply to every nation, random events to the nations that drew them."""
+        metrics = self.turn_engine.metrics
+        events = game_state.available_events
+        if metrics.enabled:
+            metrics.count("events_checked", len(events))
+            metrics.count("random_draws", len(events.stochastic) * len(nations))
+        fired = events.pop_triggered(game_state)
+        for event in fired:
+            events_log.info("EVENT: %s\n%s", event.name, event.description, extra={"event": event.name})
+            for nation in nations:
+                event.apply(nation)
+        drawn = events.draw(game_state, nations)
+        for nation, event in drawn:
+            events_log.log(self._level(game_state, nation), "EVENT: %s\n%s", event.name, event.description, extra={"event": event.name, "nation": nation.name})
+            event.apply(nation)
+        if metrics.enabled:
+            metrics.count("events_fired", len(fired) + len(drawn))
 
     def set_research(self, nation, tech_name, game_state):
         """Sets the current research for a nation."""
-        if not self.test_mode:
-            self._print(f"Available technologies: {[tech.name for tech in game_state.available_technologies]}")
-        for tech in game_state.available_technologies:
-            if tech.name == tech_name and not tech.is_researched:
-                nation.current_research = tech
-                self._print(f"Researching {tech.name}...")
-                return
-        self._print("Invalid technology or already researched.")
-
-    def set_policy(self, nation, policy_data):
+        if command_log.isEnabledFor(logging.DEBUG):
+            command_log.debug("Available technologies: %s", [tech.name for tech in game_state.available_technologies])
+        tech = game_state.available_technologies.get(tech_name)
+        if tech is not None and not nation.has_researched(tech_name):
+            progress = nation.research_progress.get(tech_name)
+            if progress is None:
+                progress = nation.research_progress[tech_name] = ResearchProgress(tech)
+            nation.current_research = progress
+            command_log.log(self._level(game_state, nation), "Researching %s...", tech.name, extra={"nation": nation.name, "technology": tech.name})
+            return
+        command_log.warning("Invalid technology or already researched.", extra={"nation": nation.name, "technology": tech_name})
+
+    def set_policy(self, nation, policy_data, game_state):
         """Sets a policy for a nation."""
         industry_name = policy_data["industry"]
         policy_type = policy_data["type"]
         amount = policy_data["amount"]
 
-        industry = next((i for i in nation.industries if i.name == industry_name), None)
+        industry = nation.get_industry(industry_name)
         if not industry:
-            self._print("Industry not found.")
+            command_log.warning("Industry not found.", extra={"nation": nation.name, "industry": industry_name})
             return
 
         if policy_type == "tax break":
-            if 0 <= amount <= 0.20:
+            if 0 <= amount <= economy_rules.MAX_INDUSTRY_TAX_RATE:
                 industry.tax_rate = amount
-                self._print(f"Tax rate for {industry.name} set to {amount*100:.0f}%.")
+                command_log.log(self._level(game_state, nation), "Tax rate for %s set to %.0f%%.", industry.name, amount * 100,
+                                extra={"nation": nation.name, "industry": industry.name})
             else:
-                self._print("Invalid tax rate. Must be between 0 and 0.20.")
+                command_log.warning("Invalid tax rate. Must be between 0 and 0.20.", extra={"nation": nation.name, "industry": industry.name})
         elif policy_type == "subsidy":
             if amount >= 0 and nation.treasury >= amount:
                 nation.treasury -= amount
                 if industry.private_ic > 0:
                     industry.subsidy_per_ic = amount / industry.private_ic
-                    self._print(f"Subsidy of {amount} applied to {industry.name}. Subsidy per IC: {industry.subsidy_per_ic:.2f}.")
+                    command_log.log(self._level(game_state, nation), "Subsidy of %s applied to %s. Subsidy per IC: %.2f.", amount, industry.name,
+                                    industry.subsidy_per_ic, extra={"nation": nation.name, "industry": industry.name})
                 else:
-                    self._print("Industry has no private IC to apply subsidy to.")
+                    command_log.warning("Industry has no private IC to apply subsidy to.", extra={"nation": nation.name, "industry": industry.name})
             else:
-                self._print("Invalid subsidy amount or not enough treasury.")
+                command_log.warning("Invalid subsidy amount or not enough treasury.", extra={"nation": nation.name, "industry": industry.name})
         else:
-            self._print("Invalid policy type.")
+            command_log.warning("Invalid policy type.", extra={"nation": nation.name})
 
     def set_tax_rate(self, nation, rate):
         """Sets the tax rate for a nation."""
@@ -240,21 +454,70 @@ class GameController:
             nation.budget[category] = amount
             nation._calculate_target_public_opinion()
         else:
-            self._print(f"Invalid budget category: {category}")
+            command_log.warning("Invalid budget category: %s", category, extra={"nation": nation.name})
 
-    def start_project(self, nation, project_id, target=None):
-        """Starts a construction project for a nation."""
-        if len(nation.active_projects) < nation.construction_slots:
-            nation.active_projects.append(ProjectInstance(project_id, target))
-        else:
-            nation.project_queue.append(ProjectInstance(project_id, target))
-
-    def cancel_project(self, nation, queue_index):
-        """Cancels a construction project for a nation."""
-        if 0 <= queue_index < len(nation.active_projects):
-            nation.active_projects.pop(queue_index)
-        elif 0 <= queue_index - len(nation.active_projects) < len(nation.project_queue):
-            nation.project_queue.pop(queue_index - len(nation.active_projects))
+    def start_project(self, nation, project_id, target, game_state):
+        """
+        Starts a construction project for a nation, queueing it when every slot is taken.
+
+        Args:
+            nation (Nation): The nation.
+            project_id (str): The id of a project in game_state.available_projects.
+            target (str): The industry the project builds in, or None.
+            game_state (GameState): The current state of the game, whose catalog defines the project.
+
+        Returns:
+            int: The project's handle, for cancelling it later, or None if the project is unknown.
+        """
+        definition = game_state.available_projects.get(project_id)
+        if definition is None:
+            command_log.warning("Unknown project: %s", project_id, extra={"nation": nation.name, "project": project_id})
+            return None
+        return nation.construction.add(ProjectInstance(project_id, target, definition), nation.construction_slots)
+
+    def cancel_project(self, nation, queue_index=None, handle=None):
+        """
+        Cancels a construction project for a nation.
+
+        Args:
+            nation (Nation): The nation.
+            queue_index (int, optional): The project's position, counting active projects first and then the queue.
+            handle (int, optional): The project's handle, as returned by start_project; takes precedence over queue_index.
+        """
+        if handle is not None:
+            nation.construction.cancel(handle)
+        elif queue_index is not None:
+            nation.construction.cancel_at(queue_index)
+
+    def post_order(self, game_state, nation, side, item, quantity, price, duration=None):
+        """
+        Posts an arms market order for a nation; it is matched at the end of the turn.
+
+        Args:
+            game_state (GameState): The current state of the game.
+            nation (Nation): The ordering nation.
+            side (str): "buy" or "sell".
+            item (str): The item, e.g. "component:Helios-I Power Core" or "lease:Helios-I Power Core".
+            quantity (int): Units, or turns of a lease.
+            price (float): Limit price per unit.
+            duration (int, optional): Turns the order stands. Defaults to until filled or cancelled.
+
+        Returns:
+            int: The order id, or None if the order was invalid.
+        """
+        try:
+            order_id = game_state.market.post(nation.name, side, item, quantity, price, game_state.turn, duration)
+        except ValueError as error:
+            command_log.warning("Invalid market order: %s", error, extra={"nation": nation.name, "item": item})
+            return None
+        command_log.log(self._level(game_state, nation), "Order %d: %s %s %s at %s.", order_id, side, quantity, item, price,
+                        extra={"nation": nation.name, "order_id": order_id, "item": item})
+        return order_id
+
+    def cancel_order(self, game_state, nation, order_id):
+        """Cancels one of a nation's arms market orders."""
+        if not game_state.market.cancel(order_id, nation.name):
+            command_log.warning("No open order %s to cancel.", order_id, extra={"nation": nation.name, "order_id": order_id})
 
     def set_ic_focus(self, nation, policy):
         """Sets the industrial capacity focus for a nation."""
@@ -0,0 +1,296 @@
+import itertools
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from src.game import Game
+from src.commands import Command
+from src.controller.game_controller import GameController
+from src.game_data import GameData, compile_game_data, get_game_data
+from src import persistence
+
+OBJECTIVES = {
+    "treasury": lambda nation: nation.treasury,
+    "civilian_gdp": lambda nation: nation.civilian_gdp,
+    "industrial_capacity": lambda nation: nation.industrial_capacity,
+    "public_opinion": lambda nation: nation.public_opinion,
+}
+
+END_TURN = Command("end_turn")
+
+# Template game of a worker process, set once by _init_worker.
+_WORKER_GAME = None
+
+def projected_treasury(nation, turns):
+    """Estimates the treasury after a number of turns from next turn's projected change."""
+    return nation.treasury + turns * nation.calculate_projected_treasury_change()
+
+def _init_worker(data, opponent_ai):
+    global _WORKER_GAME
+    _WORKER_GAME = Game(test_mode=True, data=data, ai_controller=opponent_ai)
+
+def _simulate_turns(snapshots):
+    """Ends one turn for each snapshot in a worker and returns the resulting snapshots."""
+    results = []
+    for snapshot in snapshots:
+        game_state = persistence.restore(snapshot, _WORKER_GAME)
+        _WORKER_GAME.controller.execute_command(game_state, END_TURN)
+        results.append(persistence.capture(game_state))
+    return results
+
+class Plan:
+    """
+    The best command sequence a Planner found.
+
+    Attributes:
+        actions (list): One Command per turn, or None for turns without an action.
+        objective (str): The name of the maximized objective.
+        score (float): The objective after the last turn of the plan.
+        evaluated (int): Turns simulated while planning.
+        cache_hits (int): Turns taken from the transposition cache instead of simulated.
+    """
+    def __init__(self, actions, objective, score, evaluated=0, cache_hits=0):
+        self.actions = actions
+        self.objective = objective
+        self.score = score
+        self.evaluated = evaluated
+        self.cache_hits = cache_hits
+
+    @property
+    def first(self):
+        """The command to issue this turn, or None."""
+        return self.actions[0] if self.actions else None
+
+    def __repr__(self):
+        return f"Plan(actions={self.actions!r}, objective={self.objective!r}, score={self.score!r})"
+
+class Planner:
+    """
+    Beam search over command sequences, played out on forked game states.
+
+    Each turn of the horizon, every state in the beam is expanded with each
+    candidate action (one research, construction, tax or social spending
+    command, or no action). The children are ranked by a cheap heuristic,
+    by default the treasury projected from calculate_projected_treasury_change,
+    and only the best expand_width of them have their end of turn simulated.
+    The best beam_width results form the next beam.
+
+    Simulated turns are cached by the canonical hash of the state they start
+    from, so branches that reach the same state, and later plans that revisit
+    states from earlier ones, skip the simulation. With max_workers, the turns
+    of each level are simulated in worker processes that exchange states as
+    persistence snapshots; the plans are identical to in-process planning.
+
+    A Planner can also act for AI nations: pass it as the ai_controller of a
+    Game and each AI nation issues the first action of its own plan every turn.
+
+    Attributes:
+        objective (str or callable): A name from OBJECTIVES, or a callable(nation) returning the value to maximize.
+        horizon (int): Turns to look ahead.
+        beam_width (int): States kept after each turn.
+        expand_width (int): Children simulated per turn, chosen by the heuristic.
+        heuristic (callable): Called as heuristic(nation, turns_left) to rank unsimulated children.
+        controller (GameController): Simulates turns in this process.
+        cache_size (int): Simulated turns kept in the transposition cache.
+    """
+    def __init__(self, objective="treasury", horizon=5, beam_width=4, expand_width=16, heuristic=None, tax_step=0.02,
+                 tax_bounds=(0.05, 0.40), social_step=100, max_social_spending=1000, construction_targets=2,
+                 opponent_ai=None, max_workers=0, data=None, cache_size=10000):
+        """
+        Initializes the Planner.
+
+        Args:
+            objective (str or callable, optional): The value to maximize. Defaults to "treasury".
+            horizon (int, optional): Turns to look ahead. Defaults to 5.
+            beam_width (int, optional): States kept after each turn. Defaults to 4.
+            expand_width (int, optional): Children simulated per turn. Defaults to 16.
+            heuristic (callable, optional): Ranks unsimulated children as heuristic(nation, turns_left).
+                Defaults to projected_treasury for the treasury objective and the objective itself otherwise.
+            tax_step (float, optional): Tax rate change per candidate action. Defaults to 0.02.
+            tax_bounds (tuple, optional): (minimum, maximum) tax rate considered. Defaults to (0.05, 0.40).
+            social_step (float, optional): Social spending change per candidate action. Defaults to 100.
+            max_social_spending (float, optional): Social spending cap. Defaults to 1000.
+            construction_targets (int, optional): Most profitable industries considered as project targets. Defaults to 2.
+            opponent_ai (AIController, optional): Decides for the other AI nations in simulated turns.
+                Defaults to None (they take no actions).
+            max_workers (int, optional): Worker processes simulating turns; 0 simulates in this process. Defaults to 0.
+            data (GameData or dict, optional): The game data of the planned games, needed by worker processes.
+                Defaults to get_game_data().
+            cache_size (int, optional): Simulated turns kept in the transposition cache. Defaults to 10000.
+        """
+        self.objective = objective
+        self._value = OBJECTIVES[objective] if isinstance(objective, str) else objective
+        if heuristic is None:
+            heuristic = projected_treasury if objective == "treasury" else lambda nation, turns: self._value(nation)
+        self.horizon = horizon
+        self.beam_width = beam_width
+        self.expand_width = expand_width
+        self.heuristic = heuristic
+        self.tax_step = tax_step
+        self.tax_bounds = tax_bounds
+        self.social_step = social_step
+        self.max_social_spending = max_social_spending
+        self.construction_targets = construction_targets
+        self.opponent_ai = opponent_ai
+        self.max_workers = max_workers
+        self.data = data
+        self.cache_size = cache_size
+        self.controller = GameController(test_mode=True)
+        if opponent_ai is not None:
+            self.controller.set_ai_controller(opponent_ai)
+        self._cache = OrderedDict()
+        self._executor = None
+        self._template = None
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def candidate_actions(self, game_state, nation):
+        """
+        Lists the actions considered for a nation this turn.
+
+        Args:
+            game_state (GameState): The current state of the game.
+            nation (Nation): The planning nation.
+
+        Returns:
+            list: Commands, starting with None for taking no action.
+        """
+        actions = [None]
+        if nation.current_research is None:
+            actions.extend(Command("research", tech.name) for tech in game_state.available_technologies if not nation.has_researched(tech.name))
+        if len(nation.construction) < nation.construction_slots:
+            industries = sorted(nation.industries, key=lambda industry: industry.profitability, reverse=True)[:self.construction_targets]
+            for definition in game_state.available_projects:
+                targets = [industry.name for industry in industries] if definition.get('requires_target', False) else [None]
+                actions.extend(Command("construction", {"type": "start_project", "project_id": definition['id'], "target": target}) for target in targets)
+        min_tax, max_tax = self.tax_bounds
+        for tax_rate in (nation.tax_rate - self.tax_step, nation.tax_rate + self.tax_step):
+            tax_rate = round(tax_rate, 6)
+            if min_tax <= tax_rate <= max_tax:
+                actions.append(Command("set_tax", tax_rate))
+        social = nation.budget["social_spending"]
+        for amount in (social - self.social_step, social + self.social_step):
+            if 0 <= amount <= self.max_social_spending:
+                actions.append(Command("budget", {"category": "social_spending", "amount": amount}))
+        return actions
+
+    def plan(self, game_state, nation=None):
+        """
+        Searches for the action sequence that maximizes the objective after horizon turns.
+
+        The game state is not changed.
+
+        Args:
+            game_state (GameState): The state to plan from.
+            nation (Nation, optional): The planning nation. Defaults to the player nation.
+
+        Returns:
+            Plan: The best plan found.
+        """
+        nation_index = 0 if nation is None else next(i for i, candidate in enumerate(game_state.read_nations()) if candidate is nation)
+        stats = {"evaluated": 0, "cache_hits": 0}
+        beam = [(game_state, [])]
+        for depth in range(self.horizon):
+            turns_left = self.horizon - depth
+            children = []
+            for state, actions in beam:
+                for command in self.candidate_actions(state, state.nation_at(nation_index)):
+                    child = state.fork()
+                    if command is not None:
+                        self.controller.execute_command(child, command, child.nation_at(nation_index))
+                    children.append((self.heuristic(child.nation_at(nation_index), turns_left), child, actions + [command]))
+            # Sorting is stable, so ties keep candidate order and plans are deterministic.
+            children.sort(key=lambda child: -child[0])
+            selected = {}
+            for _, child, actions in children:
+                key = persistence.state_hash(child)
+                if key not in selected:
+                    selected[key] = (child, actions)
+                    if len(selected) == self.expand_width:
+                        break
+            results = self._simulate(selected, stats)
+            ranked = sorted(
+                ((self.heuristic(state.nation_at(nation_index), turns_left - 1), state, actions) for state, actions in results),
+                key=lambda result: -result[0],
+            )
+            beam = [(state, actions) for _, state, actions in ranked[:self.beam_width]]
+        best_state, best_actions = max(beam, key=lambda result: self._value(result[0].nation_at(nation_index)))
+        name = self.objective if isinstance(self.objective, str) else getattr(self.objective, "__name__", "objective")
+        return Plan(best_actions, name, self._value(best_state.nation_at(nation_index)), stats["evaluated"], stats["cache_hits"])
+
+    def decide(self, game_state, nations):
+        """
+        Plans for each AI nation and issues the first action of its plan.
+
+        Args:
+            game_state (GameState): The current state of the game.
+            nations (list[Nation]): The AI nations to decide for.
+
+        Returns:
+            list: (nation, Command) pairs.
+        """
+        decisions = []
+        for nation in nations:
+            command = self.plan(game_state, nation).first
+            if command is not None:
+                decisions.append((nation, command))
+        return decisions
+
+    def _simulate(self, selected, stats):
+        """Ends the turn of each selected child, taking results from the transposition cache where possible."""
+        results = []
+        misses = []
+        for key, (child, actions) in selected.items():
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                stats["cache_hits"] += 1
+                results.append((cached, actions))
+            else:
+                results.append(None)
+                misses.append((len(results) - 1, key, child, actions))
+        stats["evaluated"] += len(misses)
+
+        if self.max_workers and misses:
+            executor, template = self._pool()
+            chunk_size = max(1, -(-len(misses) // self.max_workers))
+            chunks = [[persistence.capture(child) for _, _, child, _ in misses[i:i + chunk_size]] for i in range(0, len(misses), chunk_size)]
+            snapshots = itertools.chain.from_iterable(executor.map(_simulate_turns, chunks))
+            simulated = [persistence.restore(snapshot, template) for snapshot in snapshots]
+        else:
+            simulated = []
+            for _, _, child, _ in misses:
+                self.controller.execute_command(child, END_TURN)
+                simulated.append(child)
+
+        for (position, key, _, actions), state in zip(misses, simulated):
+            self._cache[key] = state
+            results[position] = (state, actions)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return results
+
+    def _pool(self):
+        if self._executor is None:
+            data = self.data
+            if data is None:
+                data = get_game_data()
+            elif not isinstance(data, GameData):
+                data = compile_game_data(data)
+            self.data = data
+            self._template = Game(test_mode=True, data=data)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers or os.cpu_count(), initializer=_init_worker, initargs=(data, self.opponent_ai))
+        return self._executor, self._template
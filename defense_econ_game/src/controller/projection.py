@@ -0,0 +1,352 @@
+import itertools
+
+import numpy as np
+
+from src.commands import Command
+from src.models import economy_rules
+from src.models.economy_rules import INFRASTRUCTURE_FOCUS
+
+class PolicyOption:
+    """
+    One candidate setting of a nation's policy levers. Levers left as None keep their current value.
+
+    Attributes:
+        tax_rate (float): The national tax rate.
+        social_spending (float): Social spending per turn.
+        ic_focus_policy (str): The IC focus policy, e.g. "Balanced" or "Infrastructure_Focus".
+        industry_tax_rates (dict): {industry name: tax rate} tax breaks, between 0 and 0.20.
+        subsidies (dict): {industry name: amount} one-off subsidies paid from the treasury.
+    """
+    __slots__ = ("tax_rate", "social_spending", "ic_focus_policy", "industry_tax_rates", "subsidies")
+
+    def __init__(self, tax_rate=None, social_spending=None, ic_focus_policy=None, industry_tax_rates=None, subsidies=None):
+        self.tax_rate = tax_rate
+        self.social_spending = social_spending
+        self.ic_focus_policy = ic_focus_policy
+        self.industry_tax_rates = industry_tax_rates or {}
+        self.subsidies = subsidies or {}
+
+    def commands(self, nation):
+        """
+        Returns the Commands that enact this option for a nation, leaving out levers already at their value.
+
+        Args:
+            nation (Nation): The nation the option is for.
+
+        Returns:
+            list[Command]: The commands, in the order the projection applies them.
+        """
+        commands = []
+        if self.tax_rate is not None and self.tax_rate != nation.tax_rate:
+            commands.append(Command("set_tax", self.tax_rate))
+        if self.social_spending is not None and self.social_spending != nation.budget["social_spending"]:
+            commands.append(Command("budget", {"category": "social_spending", "amount": self.social_spending}))
+        if self.ic_focus_policy is not None and self.ic_focus_policy != nation.ic_focus_policy:
+            commands.append(Command("construction", {"type": "set_ic_focus", "policy": self.ic_focus_policy}))
+        # Industry levers go in industry order, the order the projection pays subsidies in.
+        for industry in nation.industries:
+            rate = self.industry_tax_rates.get(industry.name)
+            if rate is not None and rate != industry.tax_rate:
+                commands.append(Command("policy", {"industry": industry.name, "type": "tax break", "amount": rate}))
+        for industry in nation.industries:
+            amount = self.subsidies.get(industry.name)
+            if amount is not None:
+                commands.append(Command("policy", {"industry": industry.name, "type": "subsidy", "amount": amount}))
+        return commands
+
+    def describe(self):
+        """Returns a short description, such as "tax 16%, social 200"."""
+        parts = []
+        if self.tax_rate is not None:
+            parts.append(f"tax {self.tax_rate*100:.0f}%")
+        if self.social_spending is not None:
+            parts.append(f"social {self.social_spending:g}")
+        if self.ic_focus_policy is not None:
+            parts.append(self.ic_focus_policy.replace("_", " "))
+        parts.extend(f"{name} tax {rate*100:.0f}%" for name, rate in self.industry_tax_rates.items())
+        parts.extend(f"{name} subsidy {amount:g}" for name, amount in self.subsidies.items())
+        return ", ".join(parts) or "current policy"
+
+    def __repr__(self):
+        return f"PolicyOption({self.describe()})"
+
+def policy_grid(tax_rates=(None,), social_spending=(None,), ic_focus_policies=(None,)):
+    """
+    Returns one PolicyOption for every combination of the given lever values.
+
+    Args:
+        tax_rates (iterable, optional): Tax rates to try; None keeps the current rate.
+        social_spending (iterable, optional): Social spending levels to try.
+        ic_focus_policies (iterable, optional): IC focus policies to try.
+
+    Returns:
+        list[PolicyOption]: The options, in row-major order of the arguments.
+    """
+    return [PolicyOption(tax, social, focus) for tax, social, focus in itertools.product(tax_rates, social_spending, ic_focus_policies)]
+
+def adjacent_options(nation, tax_step=0.01, social_step=50, tax_bounds=(0.0, 1.0), max_social_spending=None):
+    """
+    Returns the options one step away from a nation's current tax rate and social spending, with either IC focus.
+
+    Args:
+        nation (Nation): The nation.
+        tax_step (float, optional): The tax rate step. Defaults to 0.01.
+        social_step (float, optional): The social spending step. Defaults to 50.
+        tax_bounds (tuple, optional): (minimum, maximum) tax rate. Defaults to (0.0, 1.0).
+        max_social_spending (float, optional): Social spending cap. Defaults to no cap.
+
+    Returns:
+        list[PolicyOption]: Up to 18 distinct options, the current policy first.
+    """
+    tax = nation.tax_rate
+    social = nation.budget["social_spending"]
+    low, high = tax_bounds
+    tax_rates = dict.fromkeys(round(min(max(rate, low), high), 6) for rate in (tax, tax - tax_step, tax + tax_step))
+    top = max_social_spending if max_social_spending is not None else float("inf")
+    social_levels = dict.fromkeys(min(max(level, 0), top) for level in (social, social - social_step, social + social_step))
+    other_focus = "Balanced" if nation.ic_focus_policy == INFRASTRUCTURE_FOCUS else INFRASTRUCTURE_FOCUS
+    return policy_grid(tax_rates, social_levels, (nation.ic_focus_policy, other_focus))
+
+class Projection:
+    """
+    The projected metrics of a batch of policy options.
+
+    Every metric is a read-only (options, turns) array: column k holds the
+    value after k + 1 ends of turn.
+
+    Attributes:
+        options (list[PolicyOption]): The projected options, in row order.
+        turn (int): The game turn the projection starts from.
+        treasury (numpy.ndarray): Treasury.
+        civilian_gdp (numpy.ndarray): Civilian GDP.
+        public_opinion (numpy.ndarray): Public opinion.
+        industrial_capacity (numpy.ndarray): Total IC.
+    """
+    METRICS = ("treasury", "civilian_gdp", "public_opinion", "industrial_capacity")
+
+    def __init__(self, options, turn, treasury, civilian_gdp, public_opinion, industrial_capacity):
+        self.options = options
+        self.turn = turn
+        self.treasury = treasury
+        self.civilian_gdp = civilian_gdp
+        self.public_opinion = public_opinion
+        self.industrial_capacity = industrial_capacity
+        for metric in self.METRICS:
+            getattr(self, metric).flags.writeable = False
+
+    def __len__(self):
+        return len(self.options)
+
+    @property
+    def turns(self):
+        return self.treasury.shape[1]
+
+    def at(self, metric, turns_ahead=None):
+        """
+        Returns one metric of every option after a number of turns.
+
+        Args:
+            metric (str): One of METRICS.
+            turns_ahead (int, optional): Ends of turn, from 1. Defaults to the whole projection.
+
+        Returns:
+            numpy.ndarray: One value per option.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        return getattr(self, metric)[:, (turns_ahead or self.turns) - 1]
+
+    def next_turn(self, metric):
+        return self.at(metric, 1)
+
+    def ranked(self, metric="treasury", turns_ahead=None, min_public_opinion=None):
+        """
+        Returns option indices, best first, optionally keeping only options whose public opinion stays high enough.
+
+        Args:
+            metric (str, optional): The metric to maximize. Defaults to "treasury".
+            turns_ahead (int, optional): The turn the metric is read at. Defaults to the whole projection.
+            min_public_opinion (float, optional): Leave out options whose public opinion falls
+                below this on any projected turn.
+
+        Returns:
+            numpy.ndarray: Indices into options.
+        """
+        values = self.at(metric, turns_ahead)
+        candidates = np.arange(len(self.options))
+        if min_public_opinion is not None:
+            candidates = candidates[(self.public_opinion >= min_public_opinion).all(axis=1)]
+        # Stable on ties, so earlier options win.
+        return candidates[np.argsort(-values[candidates], kind="stable")]
+
+    def best(self, metric="treasury", turns_ahead=None, min_public_opinion=None):
+        """Returns the best PolicyOption by ranked(), or None if none qualifies."""
+        order = self.ranked(metric, turns_ahead, min_public_opinion)
+        return self.options[order[0]] if order.size else None
+
+class PolicyProjector:
+    """
+    Projects a nation's economy under many policy options at once.
+
+    The nation's economic state is copied into arrays when the projector is
+    created, and project() then advances every option together, one array
+    operation per step of each end-of-turn phase, so thousands of options
+    cost about as much as a few forked turns. The live nation is never
+    modified.
+
+    Each projected turn repeats the construction, civilian economy and
+    economy phases with the same arithmetic as GameController: projects
+    are promoted, paused in deficit and completed (adding IC or
+    infrastructure), GDP compounds, public opinion moves towards its target
+    and private profits are reinvested. Research completions, events and
+    other nations are not projected, and modifiers stay as they are now, so
+    turns in which none of those happen are projected exactly.
+
+    Attributes:
+        nation (Nation): The projected nation.
+        turn (int): The turn the projection starts from.
+        industry_names (list[str]): The nation's industries, in column order.
+    """
+    def __init__(self, nation, turn=0):
+        self.nation = nation
+        self.turn = turn
+        industries = list(nation.industries)
+        self.industry_names = [industry.name for industry in industries]
+        self._industry_column = {name: i for i, name in enumerate(self.industry_names)}
+
+        def column(attribute, dtype=np.float64):
+            return np.fromiter((getattr(industry, attribute) for industry in industries), dtype=dtype, count=len(industries))
+
+        self._government_ic = column("government_ic")
+        self._private_ic = column("private_ic")
+        self._base_profitability = column("base_profitability")
+        self._industry_tax_rate = column("tax_rate")
+        self._subsidy_per_ic = column("subsidy_per_ic")
+        self._cost_multiplier = economy_rules.level_cost_multiplier(column("level", np.int64))
+
+        # Active projects first, then the queue: the order projects take free slots in.
+        projects = list(nation.construction)
+        self._slots = nation.construction_slots
+        self._project_active = np.arange(len(projects)) < len(nation.active_projects)
+        self._has_definition = np.array([bool(project.definition) for project in projects], dtype=bool)
+        self._project_cp = np.array([project.current_cp for project in projects], dtype=np.float64)
+        self._cp_cost = np.array([project.definition['cp_cost'] if project.definition else np.inf for project in projects], dtype=np.float64)
+        self._upkeep = np.array([project.definition['upkeep_cost'] if project.definition else 0 for project in projects], dtype=np.float64)
+        self._added_ic = np.zeros((len(projects), len(industries)))
+        self._added_infrastructure = np.zeros(len(projects), dtype=np.int64)
+        for row, project in enumerate(projects):
+            if not project.definition:
+                continue
+            for effect, value in project.definition['effects'].items():
+                if effect == "add_ic" and project.target in self._industry_column:
+                    self._added_ic[row, self._industry_column[project.target]] += value
+                elif effect == "add_infrastructure":
+                    self._added_infrastructure[row] += value
+
+    def project(self, options, turns=1):
+        """
+        Projects every option over a number of turns.
+
+        Args:
+            options (list[PolicyOption]): The options to compare.
+            turns (int, optional): Ends of turn to project. Defaults to 1.
+
+        Returns:
+            Projection: The metrics of every option after each turn.
+        """
+        if turns < 1:
+            raise ValueError("turns must be at least 1")
+        nation = self.nation
+        count = len(options)
+        levers = self._levers(options)
+        tax_rate, social_spending, focus, industry_tax_rate, subsidy_amount = levers
+
+        treasury = np.full(count, float(nation.treasury))
+        civilian_gdp = np.full(count, float(nation.civilian_gdp))
+        public_opinion = np.full(count, float(nation.public_opinion))
+        infrastructure = np.full(count, nation.infrastructure_level, dtype=np.int64)
+        government_ic = np.tile(self._government_ic, (count, 1))
+        private_ic = np.tile(self._private_ic, (count, 1))
+        subsidy_per_ic = np.tile(self._subsidy_per_ic, (count, 1))
+        # Subsidies are paid at once, in industry order, each only if the treasury still covers it.
+        for i in range(len(self.industry_names)):
+            amount = subsidy_amount[:, i]
+            paid = (amount >= 0) & (treasury >= amount)
+            treasury -= np.where(paid, amount, 0.0)
+            applies = paid & (private_ic[:, i] > 0)
+            subsidy_per_ic[:, i] = np.where(applies, amount / np.where(applies, private_ic[:, i], 1.0), subsidy_per_ic[:, i])
+
+        target_public_opinion = economy_rules.target_public_opinion(social_spending, tax_rate)
+        profitability = economy_rules.industry_profitability(self._base_profitability, industry_tax_rate, subsidy_per_ic)
+        shares = economy_rules.reinvestment_shares(profitability)
+        ic_cost = economy_rules.ic_cost_per_unit(nation.modifiers.get("private_ic_cost_reduction")) * self._cost_multiplier
+        gdp_growth_modifier = nation.modifiers.get("gdp_growth_modifier")
+
+        projects = len(self._project_cp)
+        active = np.tile(self._project_active, (count, 1))
+        finished = np.zeros((count, projects), dtype=bool)
+        project_cp = np.tile(self._project_cp, (count, 1))
+
+        history = {metric: np.empty((count, turns)) for metric in Projection.METRICS}
+        for turn in range(turns):
+            if projects:
+                # Construction: fill free slots in order, then every active project gets the turn's CP unless in deficit.
+                waiting = ~active & ~finished
+                free = self._slots - active.sum(axis=1)
+                active |= waiting & (np.cumsum(waiting, axis=1) <= free[:, None])
+                building = active & self._has_definition & (treasury >= 0)[:, None]
+                cp = economy_rules.construction_points((government_ic + private_ic).sum(axis=1), focus)
+                project_cp += np.where(building, cp[:, None], 0.0)
+                completed = building & (project_cp >= self._cp_cost)
+                if completed.any():
+                    government_ic += completed @ self._added_ic
+                    infrastructure += completed.astype(np.int64) @ self._added_infrastructure
+                    active &= ~completed
+                    finished |= completed
+                upkeep = np.where(active, self._upkeep, 0.0).sum(axis=1)
+            else:
+                upkeep = 0.0
+
+            # Civilian economy: growth is read before public opinion moves.
+            civilian_gdp *= 1 + economy_rules.gdp_growth_rate(infrastructure, public_opinion, gdp_growth_modifier)
+            public_opinion = economy_rules.next_public_opinion(public_opinion, target_public_opinion)
+
+            # Economy: income and expenses, then private profits are reinvested in proportion to profitability.
+            industrial_profit, reinvestment_pool = economy_rules.industry_income(government_ic, private_ic, self._base_profitability,
+                                                                                 industry_tax_rate, profitability)
+            industrial_profit, reinvestment_pool = industrial_profit.sum(axis=1), reinvestment_pool.sum(axis=1)
+            treasury += (industrial_profit + civilian_gdp * tax_rate) - (social_spending + upkeep)
+            investment = np.maximum(reinvestment_pool, 0.0)[:, None] * shares
+            private_ic += np.where((investment > 0) & (ic_cost > 0), investment / np.where(ic_cost > 0, ic_cost, 1.0), 0.0)
+
+            history["treasury"][:, turn] = treasury
+            history["civilian_gdp"][:, turn] = civilian_gdp
+            history["public_opinion"][:, turn] = public_opinion
+            history["industrial_capacity"][:, turn] = (government_ic + private_ic).sum(axis=1)
+        return Projection(list(options), self.turn, **history)
+
+    def _levers(self, options):
+        """Packs the options into arrays, filling unset levers with the nation's current values."""
+        nation = self.nation
+        count = len(options)
+        tax_rate = np.fromiter((nation.tax_rate if option.tax_rate is None else option.tax_rate for option in options), dtype=np.float64, count=count)
+        social_spending = np.fromiter(
+            (nation.budget["social_spending"] if option.social_spending is None else option.social_spending for option in options),
+            dtype=np.float64, count=count,
+        )
+        focus = np.fromiter(
+            ((nation.ic_focus_policy if option.ic_focus_policy is None else option.ic_focus_policy) == INFRASTRUCTURE_FOCUS for option in options),
+            dtype=bool, count=count,
+        )
+        industry_tax_rate = np.tile(self._industry_tax_rate, (count, 1))
+        # NaN marks industries an option does not subsidize.
+        subsidy_amount = np.full((count, len(self.industry_names)), np.nan)
+        for row, option in enumerate(options):
+            for name, rate in option.industry_tax_rates.items():
+                # Out-of-range tax breaks are rejected, as by GameController.set_policy.
+                if name in self._industry_column and 0 <= rate <= economy_rules.MAX_INDUSTRY_TAX_RATE:
+                    industry_tax_rate[row, self._industry_column[name]] = rate
+            for name, amount in option.subsidies.items():
+                if name in self._industry_column:
+                    subsidy_amount[row, self._industry_column[name]] = amount
+        return tax_rate, social_spending, focus, industry_tax_rate, subsidy_amount
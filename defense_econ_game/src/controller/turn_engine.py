@@ -0,0 +1,178 @@
+import time
+import tracemalloc
+from src.game_log import current_turn
+from src.controller.turn_metrics import TurnMetrics, TurnReport
+
+class TurnEngine:
+    """
+    Runs the end-of-turn phases for every nation in the world in one scheduled pass.
+
+    Each phase is called once per turn with the full list of nations, so the
+    per-phase dispatch cost is paid once rather than once per nation, and phases
+    such as the civilian economy can process all nations as a single batch.
+
+    Phases are registered by name and run in order. Hooks can run before or
+    after a phase (or the whole turn), and metrics can time, count and trace
+    allocations per phase and per nation.
+
+    Attributes:
+        controller (GameController): The controller that implements the phases.
+        phases (list): (name, callable) pairs run in order each turn.
+        phase_timings (dict): Wall-clock seconds spent in each phase during the last turn.
+        metrics (TurnMetrics): Detailed, optional measurements of each turn.
+    """
+    def __init__(self, controller):
+        """
+        Initializes the TurnEngine.
+
+        Args:
+            controller (GameController): The controller that implements the phases.
+        """
+        self.controller = controller
+        self.phases = []
+        self.phase_timings = {}
+        self.metrics = TurnMetrics()
+        self._hooks = {}
+        self._world_phases = set()
+        self.register_phase("research", controller._update_research)
+        self.register_phase("construction", controller._update_construction)
+        self.register_phase("civilian_economy", controller._update_civilian_economies)
+        self.register_phase("economy", controller._update_economy)
+        self.register_phase("market", controller._update_market, per_nation=False)
+        self.register_phase("events", controller._check_for_events, per_nation=False)
+
+    def register_phase(self, name, phase, before=None, after=None, per_nation=True):
+        """
+        Adds a phase to the pipeline.
+
+        Args:
+            name (str): A unique phase name.
+            phase (callable): Called as phase(game_state, nations).
+            before (str, optional): Insert before the phase with this name.
+            after (str, optional): Insert after the phase with this name.
+            per_nation (bool, optional): Whether the phase gives the same result when
+                run one nation at a time, so per-nation metrics can split it. Defaults to True.
+        """
+        if any(existing == name for existing, _ in self.phases):
+            raise ValueError(f"Phase already registered: {name}")
+        position = len(self.phases)
+        if before is not None:
+            position = self._phase_index(before)
+        elif after is not None:
+            position = self._phase_index(after) + 1
+        self.phases.insert(position, (name, phase))
+        if not per_nation:
+            self._world_phases.add(name)
+
+    def unregister_phase(self, name):
+        del self.phases[self._phase_index(name)]
+        self._world_phases.discard(name)
+
+    def _phase_index(self, name):
+        for i, (existing, _) in enumerate(self.phases):
+            if existing == name:
+                return i
+        raise ValueError(f"Unknown phase: {name}")
+
+    def add_hook(self, when, callback, phase=None):
+        """
+        Registers a callback around a phase or around the whole turn.
+
+        Args:
+            when (str): "before" or "after".
+            callback (callable): Called as callback(game_state, phase_name); phase_name is None for turn hooks.
+            phase (str, optional): The phase to hook. Defaults to the whole turn.
+        """
+        if when not in ("before", "after"):
+            raise ValueError(f"Invalid hook time: {when}")
+        self._hooks.setdefault((when, phase), []).append(callback)
+
+    def remove_hook(self, when, callback, phase=None):
+        self._hooks[(when, phase)].remove(callback)
+        if not self._hooks[(when, phase)]:
+            del self._hooks[(when, phase)]
+
+    def process_end_turn(self, game_state):
+        """
+        Runs every phase for all nations and advances the turn counter.
+
+        Args:
+            game_state (GameState): The current state of the game.
+        """
+        game_state.mark_changed()
+        current_turn.set(game_state.turn)
+        nations = game_state.nations
+        # Whole-turn hooks alone, such as a metrics recorder's, keep the plain phase loop.
+        if self.metrics.enabled or any(phase is not None for _, phase in self._hooks):
+            self._process_instrumented(game_state, nations)
+        else:
+            self._run_hooks("before", game_state, None)
+            for name, phase in self.phases:
+                start = time.perf_counter()
+                phase(game_state, nations)
+                self.phase_timings[name] = time.perf_counter() - start
+            self._run_hooks("after", game_state, None)
+        game_state.turn += 1
+
+    def run_turn_hooks(self, when, game_state):
+        """Runs the whole-turn hooks; used by turns that bypass the phases, such as fast-forwarded ones."""
+        self._run_hooks(when, game_state, None)
+
+    def _run_hooks(self, when, game_state, phase):
+        for callback in self._hooks.get((when, phase), ()):
+            callback(game_state, phase)
+
+    def _process_instrumented(self, game_state, nations):
+        metrics = self.metrics
+        if metrics.enabled:
+            metrics.current = TurnReport(game_state.turn)
+        self._run_hooks("before", game_state, None)
+        for name, phase in self.phases:
+            self._run_hooks("before", game_state, name)
+            metrics.current_phase = name
+            if metrics.enabled and metrics.per_nation and name not in self._world_phases:
+                seconds = self._run_per_nation(metrics, name, phase, game_state, nations)
+            elif metrics.enabled and metrics.track_allocations:
+                tracemalloc.reset_peak()
+                memory_before, _ = tracemalloc.get_traced_memory()
+                start = time.perf_counter()
+                phase(game_state, nations)
+                seconds = time.perf_counter() - start
+                memory_after, peak = tracemalloc.get_traced_memory()
+                metrics.current.allocations[name] = (memory_after - memory_before, peak - memory_before)
+            else:
+                start = time.perf_counter()
+                phase(game_state, nations)
+                seconds = time.perf_counter() - start
+            self.phase_timings[name] = seconds
+            if metrics.enabled:
+                metrics.current.timings[name] = seconds
+            self._run_hooks("after", game_state, name)
+        metrics.current_phase = None
+        self._run_hooks("after", game_state, None)
+        if metrics.enabled:
+            metrics.history.append(metrics.current)
+
+    def _run_per_nation(self, metrics, name, phase, game_state, nations):
+        """Runs a phase one nation at a time, recording each nation's time and allocations."""
+        nation_timings = metrics.current.nation_timings[name] = {}
+        nation_allocations = None
+        if metrics.track_allocations:
+            nation_allocations = metrics.current.nation_allocations[name] = {}
+            phase_memory_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        total = 0.0
+        for nation in nations:
+            if nation_allocations is not None:
+                memory_before, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            phase(game_state, [nation])
+            seconds = time.perf_counter() - start
+            nation_timings[nation.name] = seconds
+            total += seconds
+            if nation_allocations is not None:
+                nation_allocations[nation.name] = tracemalloc.get_traced_memory()[0] - memory_before
+        if metrics.track_allocations:
+            memory_after, peak = tracemalloc.get_traced_memory()
+            metrics.current.allocations[name] = (memory_after - phase_memory_before, peak - phase_memory_before)
+        return total
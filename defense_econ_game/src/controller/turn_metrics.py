@@ -0,0 +1,118 @@
+import tracemalloc
+from collections import deque
+
+class TurnReport:
+    """
+    Measurements for one end of turn.
+
+    Attributes:
+        turn (int): The turn that was processed.
+        timings (dict): Seconds spent in each phase.
+        counters (dict): Per-phase counters, e.g. {"construction": {"projects_processed": 3}}.
+        allocations (dict): Per-phase (net bytes, peak bytes) when allocation tracking is on.
+        nation_timings (dict): Per-phase {nation name: seconds} when per-nation tracking is on.
+        nation_allocations (dict): Per-phase {nation name: net bytes} when per-nation
+            and allocation tracking are both on.
+    """
+    def __init__(self, turn):
+        self.turn = turn
+        self.timings = {}
+        self.counters = {}
+        self.allocations = {}
+        self.nation_timings = {}
+        self.nation_allocations = {}
+
+    def format(self):
+        """Returns a human-readable summary of the turn."""
+        lines = [f"Turn {self.turn}: {sum(self.timings.values()) * 1000:.3f} ms"]
+        for phase, seconds in self.timings.items():
+            line = f"  {phase:<18} {seconds * 1000:9.3f} ms"
+            if phase in self.allocations:
+                net, peak = self.allocations[phase]
+                line += f"  {net / 1024:+9.1f} KiB net  {peak / 1024:9.1f} KiB peak"
+            counters = self.counters.get(phase)
+            if counters:
+                line += "  " + ", ".join(f"{name}={value}" for name, value in counters.items())
+            lines.append(line)
+            nation_timings = self.nation_timings.get(phase)
+            if nation_timings:
+                slowest = max(nation_timings, key=nation_timings.get)
+                lines.append(f"    slowest nation: {slowest} ({nation_timings[slowest] * 1000:.3f} ms)")
+        return "\n".join(lines)
+
+class TurnMetrics:
+    """
+    Collects timers, counters and optional allocation data for the turn pipeline.
+
+    Disabled by default; while disabled, TurnEngine skips all instrumentation
+    and phases skip their counting, so the cost is a single flag check.
+
+    Attributes:
+        enabled (bool): Whether turns are being measured.
+        track_allocations (bool): Whether tracemalloc measures each phase.
+        per_nation (bool): Whether phases are measured separately for each nation.
+        history (deque[TurnReport]): Reports of the most recent measured turns.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.track_allocations = False
+        self.per_nation = False
+        self.history = deque(maxlen=100)
+        self.current = None
+        self.current_phase = None
+        self._started_tracemalloc = False
+
+    def enable(self, track_allocations=False, per_nation=False, history=100):
+        """
+        Starts measuring turns.
+
+        Args:
+            track_allocations (bool, optional): Measure memory allocated by each phase with tracemalloc. Defaults to False.
+            per_nation (bool, optional): Run and measure each phase one nation at a time. Defaults to False.
+            history (int, optional): The number of turn reports to keep. Defaults to 100.
+        """
+        self.enabled = True
+        self.track_allocations = track_allocations
+        self.per_nation = per_nation
+        self.history = deque(self.history, maxlen=history)
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def count(self, name, amount=1):
+        """Adds to a counter of the phase currently running."""
+        counters = self.current.counters.setdefault(self.current_phase, {})
+        counters[name] = counters.get(name, 0) + amount
+
+    @property
+    def latest(self):
+        """The report of the most recently measured turn, or None."""
+        return self.history[-1] if self.history else None
+
+    def totals(self):
+        """
+        Sums timings and counters over every turn in the history.
+
+        Returns:
+            dict: {"turns": n, "timings": {phase: seconds}, "counters": {phase: {name: value}}}
+        """
+        timings = {}
+        counters = {}
+        for report in self.history:
+            for phase, seconds in report.timings.items():
+                timings[phase] = timings.get(phase, 0.0) + seconds
+            for phase, phase_counters in report.counters.items():
+                totals = counters.setdefault(phase, {})
+                for name, value in phase_counters.items():
+                    totals[name] = totals.get(name, 0) + value
+        return {"turns": len(self.history), "timings": timings, "counters": counters}
+
+    def report(self):
+        """Returns the formatted report of the latest measured turn."""
+        return self.latest.format() if self.latest else "No turns measured."
@@ -1,11 +1,14 @@
-import json
 from src.models.game_state import GameState
 from src.models.nation import Nation
-from src.models.technology import Technology
-from src.models.event import Event
 from src.models.industry import Industry
 from src.view.cli_view import CLIView
+from src.view.view_model import build_view_model
+from src.commands import Command
 from src.controller.game_controller import GameController
+from src.game_log import get_logger
+from src.game_data import DATA_DIR, DATA_FILES, GameData, compile_game_data, get_game_data, load_game_data
+
+game_log = get_logger("game")
 
 # Constants
 BASE_CP = 5
@@ -16,66 +19,105 @@ class Game:
     The main class for the economic simulation game.
 
     Attributes:
+        data (GameData): The compiled definitions, shared with every game built from the same data.
         game_state (GameState): The current state of the game.
         view (CLIView): The view for interacting with the user.
         controller (GameController): The controller for processing user commands.
+        journal (CommandJournal): Records every command when attached, otherwise None.
     """
-    def __init__(self, test_mode=False):
+    def __init__(self, test_mode=False, use_ledger=False, num_ai_nations=0, data=None, data_dir=None, ai_controller=None, seed=0):
         """
         Initializes the game.
 
         Args:
-            test_mode (bool, optional): Whether the game is in test mode. Defaults to False.
+            test_mode (bool, optional): Whether the game runs without a player, as in tests and batch runs.
+                Defaults to False. Output is controlled by src.game_log.configure_logging, not by this flag.
+            use_ledger (bool, optional): Whether nations store their industries in an
+                array-backed IndustryLedger (requires numpy). Defaults to False.
+            num_ai_nations (int, optional): The number of rival AI nations to create. Defaults to 0.
+            data (GameData or dict, optional): Compiled game data, or parsed game data as
+                returned by load_game_data, used instead of the data directory. Defaults to None.
+            data_dir (str, optional): The directory to load game data from. Defaults to DATA_DIR.
+            ai_controller (AIController, optional): Decides for the AI nations every turn.
+                Defaults to None (AI nations take no actions).
+            seed (int, optional): The seed random events are drawn with. Games with the same
+                seed and commands play out identically. Defaults to 0.
         """
-        print("Game initialized.")
+        if data is None:
+            data = get_game_data(data_dir)
+        elif not isinstance(data, GameData):
+            data = compile_game_data(data)
+        self.data = data
         self.game_state = GameState()
-        self.game_state.player_nation = Nation("Player")
+        self.game_state.seed = seed
+        self.game_state.player_nation = Nation("Player", use_ledger=use_ledger)
         self.view = CLIView()
-        self.controller = GameController()
-        self.load_technologies()
-        self.load_events()
-        self.load_industries()
-        self.load_projects()
+        self.controller = GameController(test_mode=test_mode)
+        if ai_controller is not None:
+            self.controller.set_ai_controller(ai_controller)
+        self._view_model = None
+        self.journal = None
+        self.load_definitions()
+        self.add_starting_industries(self.game_state.player_nation)
+        for i in range(num_ai_nations):
+            ai_nation = Nation(f"AI Nation {i + 1}", use_ledger=use_ledger)
+            self.add_starting_industries(ai_nation)
+            self.game_state.ai_nations.append(ai_nation)
+        game_log.info("Game initialized.", extra={"nations": num_ai_nations + 1, "test_mode": test_mode})
 
-    def load_technologies(self):
+    def load_definitions(self):
         """
-        Loads technologies from a JSON file.
+        Shares the compiled definitions with the game state and gives it its own pending events.
         """
-        with open("c:/Users/rilew/Desktop/Side Projects/game/econ_sim/defense_econ_game/data/technologies.json") as f:
-            technologies_data = json.load(f)
-            for tech_data in technologies_data:
-                self.game_state.available_technologies.append(Technology(tech_data['name'], tech_data['rp_cost'], tech_data.get('unlocks_industries'), tech_data.get('private_ic_cost_reduction', 0.0), tech_data.get('effects')))
+        self.game_state.available_technologies = self.data.technologies
+        self.game_state.all_industries = self.data.industries
+        self.game_state.available_projects = self.data.projects
+        self.game_state.available_events = self.data.events.copy()
 
-    def load_events(self):
+    def add_starting_industries(self, nation):
         """
-        Loads events from a JSON file.
+        Gives a nation its own holdings of every tier 1 industry.
+
+        Args:
+            nation (Nation): The nation to receive the industries.
         """
-        with open("c:/Users/rilew/Desktop/Side Projects/game/econ_sim/defense_econ_game/data/events.json") as f:
-            events_data = json.load(f)
-            for event_data in events_data:
-                self.game_state.available_events.append(Event(event_data['name'], event_data['description'], event_data['trigger_threshold'], event_data['effects']))
+        for template in self.game_state.all_industries:
+            if template.tier == 1:
+                nation.add_industry(Industry.of(template))
 
-    def load_industries(self):
+    def get_view_model(self):
         """
-        Loads industries from a JSON file.
+        Returns the view model of the current game state.
+
+        The view model is built on first use after each command or turn and
+        reused until the game state changes again.
+
+        Returns:
+            GameViewModel: The view model of the current game state.
         """
-        with open("c:/Users/rilew/Desktop/Side Projects/game/econ_sim/defense_econ_game/data/industries.json") as f:
-            industries_data = json.load(f)
-            for industry_data in industries_data:
-                initial_ic = industry_data.get('ic', 10)
-                government_ic = float(initial_ic // 2)
-                private_ic = float(initial_ic - government_ic)
-                industry = Industry(industry_data['name'], industry_data['tier'], industry_data.get('profitability', 1.0), government_ic=government_ic, private_ic=private_ic, level_bonuses=industry_data.get('level_bonuses'))
-                self.game_state.all_industries.append(industry)
-                if industry.tier == 1:
-                    self.game_state.player_nation.industries.append(industry)
-
-    def load_projects(self):
+        game_state = self.game_state
+        if self._view_model is None or self._view_model[0] is not game_state or self._view_model[1].version != game_state.version:
+            self._view_model = (game_state, build_view_model(game_state))
+        return self._view_model[1]
+
+    def advance_until(self, turn=None, condition=None):
         """
-        Loads projects from a JSON file.
+        Fast-forwards the game without player input.
+
+        Args:
+            turn (int, optional): Stop once this turn is reached.
+            condition (callable, optional): Stop after the first turn for which
+                condition(game_state) is true.
+
+        Returns:
+            int: The number of turns advanced.
         """
-        with open("c:/Users/rilew/Desktop/Side Projects/game/econ_sim/defense_econ_game/data/projects.json") as f:
-            self.game_state.available_projects = json.load(f)
+        start_turn = self.game_state.turn
+        turns = self.controller.advance_until(self.game_state, turn, condition)
+        if self.journal is not None and turns:
+            self.journal.record(start_turn, Command("advance_until", {"turn": self.game_state.turn}))
+            self.journal.checkpoint_if_due(self.game_state)
+        return turns
 
     def process_command(self, command):
         """
@@ -84,4 +126,8 @@ class Game:
         Args:
             command (str): The command to process.
         """
-        self.controller.execute_command(self.game_state, command)
\ No newline at end of file
+        if self.journal is not None:
+            self.journal.record(self.game_state.turn, command)
+        self.controller.execute_command(self.game_state, command)
+        if self.journal is not None:
+            self.journal.checkpoint_if_due(self.game_state)
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""Loading, validating and caching the game's definition data."""
+import gc
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from src.models.catalog import Catalog, Definition
+from src.models.event import Event
+from src.models.event_index import EventIndex
+from src.models.industry import IndustryType
+from src.models.technology import Technology
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The data directory can be moved with DEFENSE_ECON_DATA_DIR.
+DATA_DIR = os.environ.get("DEFENSE_ECON_DATA_DIR", os.path.join(PACKAGE_DIR, "data"))
+# Precompiled data is cached here unless DEFENSE_ECON_CACHE_DIR is set; see cache_directory().
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "defense_econ_game")
+DATA_FILES = ("technologies", "events", "industries", "projects")
+EVENT_METERS = ("crisis_awareness", "social_dissonance", "turn")
+# Bump when the compiled classes change shape, so stale disk caches are ignored.
+CACHE_FORMAT = 3
+
+REQUIRED_FIELDS = {
+    "technologies": ("name", "rp_cost"),
+    "events": ("name", "description", "trigger_threshold", "effects"),
+    "industries": ("name", "tier"),
+    "projects": ("id", "name", "cp_cost", "upkeep_cost", "effects"),
+}
+
+# Compiled data of each data directory, keyed by its absolute path.
+_cache = {}
+
+class GameDataError(ValueError):
+    """Raised when game data files are malformed or inconsistent."""
+
+class GameData:
+    """
+    Compiled, read-only definitions shared by every Game built from the same data.
+
+    Attributes:
+        technologies (Catalog): Technology definitions keyed by name.
+        industries (Catalog): IndustryType definitions keyed by name.
+        projects (Catalog): Project Definitions keyed by id.
+        events (EventIndex): Every event, pending; each game gets its own copy.
+        content_hash (str): The hash of the source files, or None if built from parsed data.
+    """
+    def __init__(self, technologies, industries, projects, events, content_hash=None):
+        self.technologies = technologies
+        self.industries = industries
+        self.projects = projects
+        self.events = events
+        self.content_hash = content_hash
+
+def load_game_data(data_dir=None):
+    """
+    Reads every game data JSON file.
+
+    Args:
+        data_dir (str, optional): The directory holding the JSON files. Defaults to DATA_DIR.
+
+    Returns:
+        dict: The parsed contents of each data file, keyed by data set name.
+    """
+    data_dir = data_dir or DATA_DIR
+    data = {}
+    for name in DATA_FILES:
+        with open(os.path.join(data_dir, f"{name}.json")) as f:
+            data[name] = json.load(f)
+    return data
+
+def validate_game_data(data):
+    """
+    Checks required fields, duplicate keys and cross references.
+
+    Args:
+        data (dict): Parsed game data as returned by load_game_data.
+
+    Raises:
+        GameDataError: If the data is malformed or refers to unknown definitions.
+    """
+    for name, fields in REQUIRED_FIELDS.items():
+        if not isinstance(data.get(name), list):
+            raise GameDataError(f"{name}: expected a list of records")
+        key = "id" if name == "projects" else "name"
+        seen = set()
+        for position, record in enumerate(data[name]):
+            missing = [field for field in fields if field not in record]
+            if missing:
+                raise GameDataError(f"{name}[{position}]: missing {', '.join(missing)}")
+            if record[key] in seen:
+                raise GameDataError(f"{name}: duplicate {key} {record[key]!r}")
+            seen.add(record[key])
+
+    technology_names = {tech["name"] for tech in data["technologies"]}
+    industry_names = {industry["name"] for industry in data["industries"]}
+    for tech in data["technologies"]:
+        for industry_name in tech.get("unlocks_industries") or ():
+            if industry_name not in industry_names:
+                raise GameDataError(f"technology {tech['name']!r} unlocks unknown industry {industry_name!r}")
+    for industry in data["industries"]:
+        for level_bonus in industry.get("level_bonuses") or ():
+            research_bonus = level_bonus.get("research_bonus")
+            if research_bonus and research_bonus["technology_name"] not in technology_names:
+                raise GameDataError(f"industry {industry['name']!r} boosts unknown technology {research_bonus['technology_name']!r}")
+    for event in data["events"]:
+        if event.get("trigger_meter", "crisis_awareness") not in EVENT_METERS:
+            raise GameDataError(f"event {event['name']!r} has unknown trigger_meter {event['trigger_meter']!r}")
+        base_chance = event.get("base_chance")
+        if base_chance is not None and not (isinstance(base_chance, (int, float)) and 0 <= base_chance <= 1):
+            raise GameDataError(f"event {event['name']!r} has base_chance {base_chance!r}, expected a number from 0 to 1")
+
+def compile_game_data(data, content_hash=None):
+    """
+    Validates parsed game data and builds its catalogs.
+
+    Args:
+        data (dict): Parsed game data as returned by load_game_data.
+        content_hash (str, optional): The hash of the source files.
+
+    Returns:
+        GameData: The compiled definitions.
+    """
+    validate_game_data(data)
+    industries = []
+    for industry_data in data["industries"]:
+        initial_ic = industry_data.get('ic', 10)
+        government_ic = float(initial_ic // 2)
+        private_ic = float(initial_ic - government_ic)
+        industries.append(IndustryType(industry_data['name'], industry_data['tier'], industry_data.get('profitability', 1.0), government_ic=government_ic, private_ic=private_ic, level_bonuses=industry_data.get('level_bonuses')))
+    industries = Catalog(industries, key=lambda industry: industry.name)
+
+    technologies = Catalog((
+        Technology(tech_data['name'], tech_data['rp_cost'], tech_data.get('unlocks_industries'), tech_data.get('private_ic_cost_reduction', 0.0), tech_data.get('effects'),
+                   unlocked_industries=(industries.get(name) for name in tech_data.get('unlocks_industries') or ()))
+        for tech_data in data["technologies"]
+    ), key=lambda tech: tech.name)
+
+    projects = Catalog((Definition(project_data) for project_data in data["projects"]), key=lambda project: project['id'])
+    events = EventIndex(
+        Event(event_data['name'], event_data['description'], event_data['trigger_threshold'], event_data['effects'],
+              event_data.get('trigger_meter', "crisis_awareness"), event_data.get('base_chance'))
+        for event_data in data["events"]
+    )
+    return GameData(technologies, industries, projects, events, content_hash)
+
+def _file_signature(paths):
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def _read_disk_cache(path):
+    # Unpickling creates many small objects at once; pausing the cyclic
+    # collector meanwhile avoids repeated collections over objects that all survive.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+        # A corrupt or outdated cache entry is rebuilt from the JSON files.
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def _write_disk_cache(path, game_data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as f:
+            pickle.dump(game_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+    except OSError:
+        # The cache is an optimization; a read-only or full disk only costs startup time.
+        pass
+
+def cache_directory():
+    """
+    Returns the directory precompiled data is cached in.
+
+    DEFENSE_ECON_CACHE_DIR is read on every call, so it can be set after
+    import, as the test suite does; an empty value disables the disk cache.
+    """
+    return os.environ.get("DEFENSE_ECON_CACHE_DIR", CACHE_DIR)
+
+def get_game_data(data_dir=None, cache_dir=None):
+    """
+    Returns the compiled game data of a directory, parsing it at most once per process.
+
+    Compiled data is kept in memory for the life of the process and reused
+    until a data file's size or modification time changes. On a miss, the
+    files are hashed and a precompiled copy is loaded from cache_dir if one
+    exists for that content, so only the first process to see a version of
+    the data pays for JSON parsing and validation.
+
+    Args:
+        data_dir (str, optional): The directory holding the JSON files. Defaults to DATA_DIR.
+        cache_dir (str, optional): Where precompiled data is stored; an empty string
+            disables the disk cache. Defaults to cache_directory().
+
+    Returns:
+        GameData: The compiled definitions. Treat them as read-only; they are shared.
+    """
+    data_dir = os.path.abspath(data_dir or DATA_DIR)
+    if cache_dir is None:
+        cache_dir = cache_directory()
+    paths = [os.path.join(data_dir, f"{name}.json") for name in DATA_FILES]
+    signature = _file_signature(paths)
+    cached = _cache.get(data_dir)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}".encode())
+    contents = []
+    for name, path in zip(DATA_FILES, paths):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(name.encode() + b"\0" + content + b"\0")
+        contents.append(content)
+    content_hash = digest.hexdigest()
+
+    if cached is not None and cached[1].content_hash == content_hash:
+        game_data = cached[1]
+    else:
+        cache_path = os.path.join(cache_dir, f"game_data-{content_hash}.pickle") if cache_dir else None
+        game_data = _read_disk_cache(cache_path) if cache_path else None
+        if not isinstance(game_data, GameData) or game_data.content_hash != content_hash:
+            data = {name: json.loads(content) for name, content in zip(DATA_FILES, contents)}
+            game_data = compile_game_data(data, content_hash)
+            if cache_path:
+                _write_disk_cache(cache_path, game_data)
+    _cache[data_dir] = (signature, game_data)
+    return game_data
+
+def clear_cache():
+    """Forgets every compiled data set held in memory by this process."""
+    _cache.clear()
@@ -0,0 +1,188 @@
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from collections import deque
+
+ROOT = "defense_econ_game"
+SUBSYSTEMS = ("game", "commands", "research", "construction", "economy", "market", "events", "ai", "server")
+
+# The turn being played or commanded in this thread or task; records are stamped with it.
+current_turn = contextvars.ContextVar("current_turn", default=None)
+
+# Attributes every LogRecord has; anything else on a record was passed in extra.
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "turn"}
+
+_root = logging.getLogger(ROOT)
+_root.addHandler(logging.NullHandler())
+_root.setLevel(logging.WARNING)
+
+def get_logger(subsystem):
+    """
+    Returns the logger of a subsystem, such as "research" or "economy".
+
+    Until configure_logging is called, only warnings are enabled and they go
+    nowhere, so info and debug calls cost one cached level check.
+    """
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+def structured_fields(record):
+    """Returns the fields passed in a record's extra."""
+    return {key: value for key, value in record.__dict__.items() if key not in _RECORD_ATTRIBUTES}
+
+class TurnFilter(logging.Filter):
+    """Stamps records with the current turn. Runs in the logging thread, before records are queued."""
+    def filter(self, record):
+        if not hasattr(record, "turn"):
+            record.turn = current_turn.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, including its turn and extra fields."""
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name[len(ROOT) + 1:] or record.name,
+            "turn": getattr(record, "turn", None),
+            "message": record.getMessage(),
+        }
+        entry.update(structured_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TurnRingHandler(logging.Handler):
+    """
+    Keeps the records of the last few turns in memory.
+
+    Records are grouped by their turn stamp; when a record for a new turn
+    arrives and the buffer already holds the maximum number of turns, the
+    oldest turn is dropped. Nothing is formatted until it is read.
+
+    Attributes:
+        turns (int): The number of turns kept.
+    """
+    def __init__(self, turns, level=logging.DEBUG):
+        super().__init__(level)
+        self.turns = turns
+        self._groups = deque(maxlen=turns)
+        self.addFilter(TurnFilter())
+
+    def emit(self, record):
+        turn = record.turn
+        if not self._groups or self._groups[-1][0] != turn:
+            self._groups.append((turn, []))
+        self._groups[-1][1].append(record)
+
+    def records(self, turn=None):
+        """Returns the kept records, or only those of one turn, oldest first."""
+        return [record for group_turn, group in self._groups if turn is None or group_turn == turn for record in group]
+
+    def kept_turns(self):
+        return [turn for turn, _ in self._groups]
+
+    def dump(self, turn=None):
+        """Returns the kept records formatted one per line."""
+        formatter = self.formatter or logging.Formatter("[turn %(turn)s] %(levelname)s %(name)s: %(message)s")
+        return "\n".join(formatter.format(record) for record in self.records(turn))
+
+    def clear(self):
+        self._groups.clear()
+
+class LogSession:
+    """
+    Handlers installed by configure_logging. close() removes them and stops the file writer thread.
+
+    Attributes:
+        ring (TurnRingHandler): The in-memory buffer, or None.
+    """
+    def __init__(self, handlers, listener, ring, levels, propagate):
+        self.handlers = handlers
+        self.listener = listener
+        self.ring = ring
+        self._levels = levels
+        self._propagate = propagate
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        for handler in self.handlers:
+            _root.removeHandler(handler)
+        self.handlers = []
+        for name, level in self._levels.items():
+            logging.getLogger(name).setLevel(level)
+        self._levels = {}
+        _root.propagate = self._propagate
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _level(level):
+    return logging.getLevelName(level.upper()) if isinstance(level, str) else level
+
+def configure_logging(console_level="INFO", file=None, file_level="DEBUG", levels=None, ring_turns=0, ring_level="DEBUG", stream=None):
+    """
+    Installs the game's log handlers.
+
+    The console gets plain messages. The file gets JSON lines with the turn
+    and structured fields, written by a background thread from a queue so
+    the game never waits on disk. The ring buffer keeps the records of the
+    last ring_turns turns in memory.
+
+    Args:
+        console_level (str or int, optional): Console threshold, or None for no console output. Defaults to "INFO".
+        file (str, optional): Path of the JSON lines log file. Defaults to None (no file).
+        file_level (str or int, optional): File threshold. Defaults to "DEBUG".
+        levels (dict, optional): Per-subsystem thresholds, e.g. {"economy": "DEBUG", "ai": "WARNING"}.
+        ring_turns (int, optional): Turns kept in memory; 0 keeps none. Defaults to 0.
+        ring_level (str or int, optional): Ring buffer threshold. Defaults to "DEBUG".
+        stream (file, optional): The console stream. Defaults to sys.stdout.
+
+    Returns:
+        LogSession: The installed handlers; close it to uninstall them.
+    """
+    handlers = []
+    listener = None
+    ring = None
+    if console_level is not None:
+        console = logging.StreamHandler(stream or sys.stdout)
+        console.setLevel(_level(console_level))
+        console.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console)
+    if file is not None:
+        file_handler = logging.FileHandler(file, encoding="utf-8")
+        file_handler.setLevel(_level(file_level))
+        file_handler.setFormatter(JsonFormatter())
+        records = queue.SimpleQueue()
+        queued = logging.handlers.QueueHandler(records)
+        queued.setLevel(_level(file_level))
+        queued.addFilter(TurnFilter())
+        listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+        listener.start()
+        handlers.append(queued)
+    if ring_turns:
+        ring = TurnRingHandler(ring_turns, _level(ring_level))
+        handlers.append(ring)
+
+    previous = {_root.name: _root.level}
+    propagate = _root.propagate
+    # Records are handled here; passing them on too would print them twice under an application's own logging setup.
+    _root.propagate = False
+    for handler in handlers:
+        _root.addHandler(handler)
+    # The package logger passes exactly what some handler wants, so disabled levels are rejected by the first check.
+    _root.setLevel(min((handler.level for handler in handlers), default=logging.WARNING))
+    for subsystem, level in (levels or {}).items():
+        logger = get_logger(subsystem)
+        previous[logger.name] = logger.level
+        logger.setLevel(_level(level))
+    return LogSession(handlers, listener, ring, previous, propagate)
@@ -19,7 +19,7 @@ class GameRunner:
         Runs the main game loop.
         """
         while True:
-            self.game.view.display_game_state(self.game.game_state)
+            self.game.view.display_game_state(self.game.game_state, self.game.get_view_model())
             action = self.game.controller.get_player_action()
             if action:
                 self.handle_action(action)
@@ -38,7 +38,7 @@ class GameRunner:
         elif action.type == "research":
             self.game.controller.set_research(self.game.game_state.player_nation, action.payload)
         elif action.type == "policy":
-            self.game.controller.set_policy(self.game.game_state.player_nation, action.payload)
+            self.game.controller.set_policy(self.game.game_state.player_nation, action.payload, self.game.game_state)
         elif action.type == "set_tax":
             self.game.controller.set_tax_rate(self.game.game_state.player_nation, action.payload)
         elif action.type == "budget":
@@ -54,7 +54,7 @@ class GameRunner:
             payload (ConstructionPayload): The construction payload.
         """
         if payload.type == "start_project":
-            self.game.controller.start_project(self.game.game_state.player_nation, payload.project_id, payload.target)
+            self.game.controller.start_project(self.game.game_state.player_nation, payload.project_id, payload.target, self.game.game_state)
         elif payload.type == "cancel_project":
             self.game.controller.cancel_project(self.game.game_state.player_nation, payload.queue_index)
         elif payload.type == "set_ic_focus":
@@ -0,0 +1,286 @@
+import json
+import os
+
+from src import persistence
+from src.commands import Command
+
+JOURNAL_FORMAT = 1
+JOURNAL_FILE = "journal.jsonl"
+
+class Checkpoint:
+    """
+    A saved state inside a journal.
+
+    Attributes:
+        turn (int): The turn of the saved state.
+        seq (int): The number of journal entries applied before the state was saved.
+        snapshot (Snapshot): The saved state; loaded from path on first use when None.
+        path (str): The checkpoint file, or None for in-memory journals.
+    """
+    def __init__(self, turn, seq, snapshot=None, path=None):
+        self.turn = turn
+        self.seq = seq
+        self.snapshot = snapshot
+        self.path = path
+
+    def load(self):
+        if self.snapshot is None:
+            self.snapshot = persistence.load_snapshot(self.path)
+        return self.snapshot
+
+class JournalEntry:
+    """
+    One recorded command.
+
+    Attributes:
+        seq (int): Position of the entry in the journal.
+        turn (int): The turn the command was issued in.
+        command (Command): The command. Fast-forwards are recorded as
+            Command("advance_until", {"turn": reached_turn}).
+    """
+    def __init__(self, seq, turn, command):
+        self.seq = seq
+        self.turn = turn
+        self.command = command
+
+class CommandJournal:
+    """
+    An append-only log of the commands applied to a game, with periodic checkpoints.
+
+    Attach a journal to a game and every command passed to Game.process_command,
+    and every fast-forward, is recorded. A full state checkpoint is taken when
+    the journal is attached and then every checkpoint_interval turns. Any turn
+    can be reconstructed by restoring the nearest earlier checkpoint and
+    replaying only the commands recorded after it.
+
+    With a directory, entries are streamed to journal.jsonl as they are recorded
+    and checkpoints are written next to it as binary snapshots, so a journal
+    from a long session can be reopened with CommandJournal.open().
+
+    Attributes:
+        directory (str): Where the journal is written, or None to keep it in memory.
+        checkpoint_interval (int): Turns between checkpoints.
+        entries (list[JournalEntry]): The recorded commands, in order.
+        checkpoints (list[Checkpoint]): The checkpoints, in order.
+        content_hash (str): The hash of the game data the journal was recorded with.
+    """
+    def __init__(self, directory=None, checkpoint_interval=10):
+        """
+        Initializes the CommandJournal.
+
+        Args:
+            directory (str, optional): Where to write the journal. Defaults to None (memory only).
+            checkpoint_interval (int, optional): Turns between checkpoints. Defaults to 10.
+        """
+        self.directory = directory
+        self.checkpoint_interval = checkpoint_interval
+        self.entries = []
+        self.checkpoints = []
+        self.content_hash = None
+        self._file = None
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Reads a journal written to a directory.
+
+        The journal can be replayed and searched. Checkpoint snapshots are
+        only read from disk when a seek needs them.
+
+        Args:
+            directory (str): The journal directory.
+
+        Returns:
+            CommandJournal: The journal.
+        """
+        journal = None
+        with open(os.path.join(directory, JOURNAL_FILE)) as f:
+            for line in f:
+                record = json.loads(line)
+                if "journal" in record:
+                    if record["journal"] > JOURNAL_FORMAT:
+                        raise ValueError(f"{directory} uses journal format {record['journal']}; this version reads up to {JOURNAL_FORMAT}")
+                    journal = cls(directory, record["checkpoint_interval"])
+                    journal.content_hash = record["content_hash"]
+                elif "checkpoint" in record:
+                    journal.checkpoints.append(Checkpoint(record["turn"], record["seq"], path=os.path.join(directory, record["checkpoint"])))
+                else:
+                    journal.entries.append(JournalEntry(record["seq"], record["turn"], Command(record["type"], record["payload"])))
+        return journal
+
+    def attach(self, game):
+        """
+        Starts recording a game, taking the first checkpoint of its current state.
+
+        Args:
+            game (Game): The game to record.
+        """
+        if self.entries or self.checkpoints:
+            raise ValueError("A journal can only record one game")
+        self.content_hash = game.data.content_hash
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(os.path.join(self.directory, JOURNAL_FILE), "w")
+            self._write({"journal": JOURNAL_FORMAT, "content_hash": self.content_hash, "checkpoint_interval": self.checkpoint_interval})
+        game.journal = self
+        self.checkpoint(game.game_state)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(self, turn, command):
+        """
+        Appends a command.
+
+        Args:
+            turn (int): The turn the command was issued in.
+            command (Command): The command.
+        """
+        entry = JournalEntry(len(self.entries), turn, command)
+        self.entries.append(entry)
+        if self._file is not None:
+            self._write({"seq": entry.seq, "turn": entry.turn, "type": command.type, "payload": command.payload})
+
+    def checkpoint_if_due(self, game_state):
+        """Takes a checkpoint if checkpoint_interval turns have passed since the last one."""
+        if game_state.turn >= self.checkpoints[-1].turn + self.checkpoint_interval:
+            self.checkpoint(game_state)
+
+    def checkpoint(self, game_state):
+        """Saves the current state as a checkpoint at the current end of the journal."""
+        snapshot = persistence.capture(game_state)
+        checkpoint = Checkpoint(game_state.turn, len(self.entries), snapshot)
+        if self.directory is not None:
+            name = f"checkpoint-{len(self.checkpoints):05d}-turn-{game_state.turn:06d}.sav"
+            checkpoint.path = os.path.join(self.directory, name)
+            persistence.write_snapshot(snapshot, checkpoint.path)
+            self._write({"checkpoint": name, "turn": checkpoint.turn, "seq": checkpoint.seq})
+        self.checkpoints.append(checkpoint)
+
+    @property
+    def last_turn(self):
+        """The last turn the recorded game reached."""
+        turn = self.checkpoints[-1].turn if self.checkpoints else 0
+        for entry in reversed(self.entries):
+            if entry.command.type == "advance_until":
+                return max(turn, entry.command.payload["turn"])
+            if entry.command.type == "end_turn":
+                return max(turn, entry.turn + 1)
+        return turn
+
+    def _check_data(self, game):
+        if self.content_hash is not None and game.data.content_hash is not None and game.data.content_hash != self.content_hash:
+            raise ValueError("The game uses different game data than the journal was recorded with")
+
+    def _replay(self, game, checkpoint, end, turn=None):
+        """Restores a checkpoint into game and applies entries up to end, stopping at the start of turn."""
+        self._check_data(game)
+        game_state = game.game_state = persistence.restore(checkpoint.load(), game)
+        for entry in self.entries[checkpoint.seq:end]:
+            if turn is not None and game_state.turn >= turn:
+                break
+            command = entry.command
+            if command.type == "advance_until":
+                target = command.payload["turn"] if turn is None else min(command.payload["turn"], turn)
+                game.controller.advance_until(game_state, turn=target)
+            else:
+                game.controller.execute_command(game_state, command)
+        return game_state
+
+    def seek(self, game, turn=None, seq=None):
+        """
+        Reconstructs the game as it was at a turn or after a number of entries.
+
+        Restores the latest checkpoint at or before the target and replays only
+        the entries recorded after it. With turn, the result is the state at the
+        start of that turn, before any command issued in it.
+
+        Args:
+            game (Game): A game built from the same data; its game_state is replaced.
+            turn (int, optional): The turn to reconstruct.
+            seq (int, optional): The number of entries to apply. Defaults to all of them.
+
+        Returns:
+            GameState: The reconstructed state, also assigned to game.game_state.
+        """
+        seq = len(self.entries) if seq is None else seq
+        if turn is not None and turn > self.last_turn:
+            raise ValueError(f"The journal ends at turn {self.last_turn}")
+        candidates = [c for c in self.checkpoints if c.seq <= seq and (turn is None or c.turn <= turn)]
+        return self._replay(game, candidates[-1], seq, turn)
+
+    def replay(self, game):
+        """
+        Replays the whole session from its first checkpoint.
+
+        Args:
+            game (Game): A game built from the same data; its game_state is replaced.
+
+        Returns:
+            GameState: The final state, also assigned to game.game_state.
+        """
+        return self._replay(game, self.checkpoints[0], len(self.entries))
+
+    def bisect(self, game, predicate, low=None, high=None):
+        """
+        Finds the first turn whose state satisfies a predicate.
+
+        The predicate must be false up to some turn and true from then on,
+        e.g. "the treasury is negative" or "the metric differs from the
+        reference run". Each probe is a seek, so a search costs about
+        log2(turns) checkpoint restores and short replays.
+
+        Args:
+            game (Game): A game built from the same data; its game_state is replaced.
+            predicate (callable): Called as predicate(game_state, turn).
+            low (int, optional): A turn known to fail the predicate. Defaults to the first checkpoint's turn.
+            high (int, optional): The last turn to search. Defaults to the end of the journal.
+
+        Returns:
+            int: The first turn satisfying the predicate, or None if no turn in range does.
+        """
+        low = self.checkpoints[0].turn if low is None else low
+        high = self.last_turn if high is None else high
+        if predicate(self.seek(game, turn=low), low):
+            return low
+        if not predicate(self.seek(game, turn=high), high):
+            return None
+        # Invariant: the predicate fails at low and holds at high.
+        while high - low > 1:
+            middle = (low + high) // 2
+            if predicate(self.seek(game, turn=middle), middle):
+                high = middle
+            else:
+                low = middle
+        return high
+
+def find_divergence(journal, game, metric, reference, low=None, high=None):
+    """
+    Finds the first turn at which a metric differs from a reference.
+
+    Args:
+        journal (CommandJournal): The journal to search.
+        game (Game): A game built from the same data; its game_state is replaced.
+        metric (callable): Returns the compared value, called as metric(game_state).
+        reference (callable or dict): The expected value for a turn, as reference(turn)
+            or {turn: value}; a reference game's journal can be sampled with seek().
+        low (int, optional): A turn known to match. Defaults to the start of the journal.
+        high (int, optional): The last turn to search. Defaults to the end of the journal.
+
+    Returns:
+        int: The first diverging turn, or None if the metric matches throughout.
+    """
+    expected = reference.get if isinstance(reference, dict) else reference
+    return journal.bisect(game, lambda game_state, turn: metric(game_state) != expected(turn), low, high)
@@ -0,0 +1,300 @@
+import json
+import os
+
+import numpy as np
+
+# Fields recorded by default and their array types. Any other numeric nation or
+# industry attribute can be recorded too; it is stored as float64 unless listed here.
+NATION_FIELDS = {
+    "treasury": np.float64,
+    "civilian_gdp": np.float64,
+    "public_opinion": np.float64,
+    "infrastructure_level": np.int64,
+}
+FIELD_TYPES = dict(NATION_FIELDS, construction_slots=np.int64)
+INDUSTRY_FIELDS = {
+    "government_ic": np.float64,
+    "private_ic": np.float64,
+    "level": np.int64,
+}
+# Fill value for samples taken before an industry existed.
+MISSING = {np.dtype(np.float64): np.nan, np.dtype(np.int64): -1}
+
+class MetricsRecorder:
+    """
+    Keeps a bounded per-turn history of every nation's and every industry's metrics.
+
+    Each sample appends one row to preallocated typed arrays: one column per
+    nation for nation fields, and one column per (nation, industry) pair for
+    industry fields. Columns are added when a nation unlocks an industry, with
+    earlier rows filled with NaN (-1 for integer fields).
+
+    Memory is bounded by capacity. In ring mode the most recent capacity samples
+    are kept; every row is written twice, capacity rows apart, so the samples
+    in chronological order are always one contiguous slice and every accessor
+    returns a view rather than a copy. In downsample mode the whole run is kept:
+    when the buffer fills up, every other sample is dropped and the sampling
+    interval doubles.
+
+    Attach a recorder to a game to sample after every end of turn, including
+    fast-forwarded ones:
+
+        recorder = MetricsRecorder(capacity=500)
+        recorder.attach(game)
+        ...
+        recorder.nation("treasury")        # (samples, nations) view
+        recorder.to_csv("history.csv")
+
+    Attributes:
+        capacity (int): The number of samples kept.
+        every (int): Turns between samples.
+        downsample (bool): Whether a full buffer halves its resolution instead of dropping old samples.
+        nation_names (list[str]): The nation of each nation column.
+        industry_columns (list[tuple]): (nation name, industry name) of each industry column.
+    """
+    def __init__(self, capacity=1024, every=1, downsample=False, nation_fields=None, industry_fields=None):
+        """
+        Initializes the MetricsRecorder.
+
+        Args:
+            capacity (int, optional): The number of samples kept. Defaults to 1024.
+            every (int, optional): Turns between samples. Defaults to 1.
+            downsample (bool, optional): Keep the whole run at decreasing resolution
+                instead of the most recent samples. Defaults to False.
+            nation_fields (iterable[str], optional): Nation fields to record. Defaults to NATION_FIELDS.
+            industry_fields (iterable[str], optional): Industry fields to record. Defaults to INDUSTRY_FIELDS.
+        """
+        if downsample and capacity < 2:
+            raise ValueError("Downsampling needs a capacity of at least 2")
+        self.capacity = capacity
+        self.every = every
+        self.downsample = downsample
+        nation_fields = NATION_FIELDS if nation_fields is None else nation_fields
+        industry_fields = INDUSTRY_FIELDS if industry_fields is None else industry_fields
+        self.nation_fields = {name: np.dtype(FIELD_TYPES.get(name, np.float64)) for name in nation_fields}
+        self.industry_fields = {name: np.dtype(INDUSTRY_FIELDS.get(name, np.float64)) for name in industry_fields}
+        self.nation_names = []
+        self.industry_columns = []
+        rows = capacity if downsample else 2 * capacity
+        self._turns = np.empty(rows, dtype=np.int64)
+        self._nation = {name: np.empty((rows, 0), dtype=dtype) for name, dtype in self.nation_fields.items()}
+        self._industry = {name: np.empty((rows, 0), dtype=dtype) for name, dtype in self.industry_fields.items()}
+        self._column_index = {}
+        self._layout = None
+        self._scatter = None
+        self._start = 0
+        self._size = 0
+        self._skipped = 0
+        self._engine = None
+
+    def attach(self, game):
+        """Samples the game after every end of turn from now on."""
+        self.detach()
+        self._engine = game.controller.turn_engine
+        self._engine.add_hook("after", self._after_turn)
+
+    def detach(self):
+        if self._engine is not None:
+            self._engine.remove_hook("after", self._after_turn)
+            self._engine = None
+
+    def _after_turn(self, game_state, phase):
+        # Turn hooks run before the turn counter advances; label the sample with the turn reached.
+        self.record(game_state, game_state.turn + 1)
+
+    def __len__(self):
+        return self._size
+
+    def record(self, game_state, turn=None):
+        """
+        Takes a sample, or skips it if it falls between sampling intervals.
+
+        Args:
+            game_state (GameState): The state to sample.
+            turn (int, optional): The sample's turn label. Defaults to game_state.turn.
+        """
+        self._skipped += 1
+        if self._skipped < self.every:
+            return
+        self._skipped = 0
+        nations = game_state.nations
+        if len(nations) != len(self.nation_names):
+            self._add_nations(nations)
+        layout = [len(nation.industries) for nation in nations]
+        if layout != self._layout:
+            self._add_industries(nations, layout)
+
+        row, mirror = self._claim_rows()
+        self._turns[row] = game_state.turn if turn is None else turn
+        count = len(nations)
+        for name, values in self._nation.items():
+            values[row, :count] = [getattr(nation, name) for nation in nations]
+        if self._industry:
+            scatter = self._scatter
+            ledgers = [nation.ledger for nation in nations]
+            for name, values in self._industry.items():
+                if all(ledger is not None for ledger in ledgers):
+                    sample = np.concatenate([ledger.column(name) for ledger in ledgers]) if ledgers else values[0, :0]
+                else:
+                    sample = [getattr(industry, name) for nation in nations for industry in nation.industries]
+                values[row, scatter] = sample
+        if mirror is not None:
+            # Copy the written row rather than converting the samples a second time.
+            self._turns[mirror] = self._turns[row]
+            for values in self._nation.values():
+                values[mirror] = values[row]
+            for values in self._industry.values():
+                values[mirror] = values[row]
+        if self.downsample and self._size == self.capacity:
+            self._compact()
+
+    def _claim_rows(self):
+        """Returns the buffer row the next sample is written to, and its mirror row in ring mode."""
+        if self.downsample:
+            self._size += 1
+            return self._size - 1, None
+        if self._size < self.capacity:
+            row = self._size
+            self._size += 1
+        else:
+            row = self._start
+            self._start = (self._start + 1) % self.capacity
+        return row, row + self.capacity
+
+    def _compact(self):
+        """Keeps every other sample, ending with the latest, and doubles the sampling interval."""
+        first = (self._size - 1) % 2
+        kept = len(range(first, self._size, 2))
+        for values in [self._turns, *self._nation.values(), *self._industry.values()]:
+            values[:kept] = values[first:self._size:2]
+        self._size = kept
+        self.every *= 2
+
+    def _add_nations(self, nations):
+        for nation in nations[len(self.nation_names):]:
+            self.nation_names.append(nation.name)
+        for name, values in self._nation.items():
+            self._nation[name] = self._widen(values, len(self.nation_names))
+
+    def _add_industries(self, nations, layout):
+        """Adds columns for industries seen for the first time and rebuilds the flat-to-column map."""
+        scatter = []
+        for nation_index, nation in enumerate(nations):
+            for industry in nation.industries:
+                key = (nation_index, industry.name)
+                column = self._column_index.get(key)
+                if column is None:
+                    column = self._column_index[key] = len(self.industry_columns)
+                    self.industry_columns.append((nation.name, industry.name))
+                scatter.append(column)
+        for name, values in self._industry.items():
+            self._industry[name] = self._widen(values, len(self.industry_columns))
+        self._scatter = np.array(scatter, dtype=np.intp)
+        self._layout = layout
+
+    def _widen(self, values, width):
+        if values.shape[1] == width:
+            return values
+        widened = np.full((values.shape[0], width), MISSING[values.dtype], dtype=values.dtype)
+        widened[:, :values.shape[1]] = values
+        return widened
+
+    def _window(self, values):
+        if self.downsample:
+            return values[:self._size]
+        return values[self._start:self._start + self._size]
+
+    @property
+    def turns(self):
+        """The turn of each sample, oldest first, as a read-only view."""
+        return self._readonly(self._window(self._turns))
+
+    def nation(self, field):
+        """
+        Returns the recorded values of a nation field.
+
+        Args:
+            field (str): One of the recorded nation fields.
+
+        Returns:
+            numpy.ndarray: A read-only (samples, nations) view, oldest sample first.
+        """
+        return self._readonly(self._window(self._nation[field]))
+
+    def industry(self, field, nation=None):
+        """
+        Returns the recorded values of an industry field.
+
+        Args:
+            field (str): One of the recorded industry fields.
+            nation (str, optional): Only this nation's industries. Defaults to every industry column.
+
+        Returns:
+            numpy.ndarray: A read-only (samples, industry columns) view, oldest sample first;
+                for one nation, a (samples, its industries) array.
+        """
+        values = self._readonly(self._window(self._industry[field]))
+        if nation is None:
+            return values
+        columns = [i for i, (nation_name, _) in enumerate(self.industry_columns) if nation_name == nation]
+        # A nation's industries are contiguous unless it unlocked some after other nations' columns were added.
+        if columns and columns[-1] - columns[0] == len(columns) - 1:
+            return values[:, columns[0]:columns[-1] + 1]
+        return values[:, columns]
+
+    def industrial_capacity(self):
+        """
+        Returns each nation's total IC per sample, summed from the recorded industry IC.
+
+        Returns:
+            numpy.ndarray: A (samples, nations) array.
+        """
+        ic = np.nan_to_num(self._window(self._industry["government_ic"])) + np.nan_to_num(self._window(self._industry["private_ic"]))
+        owner = {name: index for index, name in enumerate(self.nation_names)}
+        totals = np.zeros((ic.shape[0], len(self.nation_names)))
+        np.add.at(totals.T, np.array([owner[nation] for nation, _ in self.industry_columns], dtype=np.intp), ic.T)
+        return totals
+
+    def _readonly(self, view):
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def columns(self):
+        """Returns the CSV column names: turn, then nation fields, then industry fields."""
+        names = ["turn"]
+        for field in self._nation:
+            names.extend(f"{nation}.{field}" for nation in self.nation_names)
+        for field in self._industry:
+            names.extend(f"{nation}.{industry}.{field}" for nation, industry in self.industry_columns)
+        return names
+
+    def to_csv(self, path):
+        """
+        Writes the history as CSV, one row per sample and one column per series.
+
+        Values are written with full precision; missing values are written as nan.
+        """
+        blocks = [self.turns[:, None].astype(np.float64)]
+        for values in list(self._nation.values()) + list(self._industry.values()):
+            block = self._window(values).astype(np.float64)
+            if values.dtype.kind == "i":
+                block[self._window(values) == MISSING[values.dtype]] = np.nan
+            blocks.append(block)
+        np.savetxt(path, np.concatenate(blocks, axis=1), fmt="%.17g", delimiter=",", header=",".join(self.columns()), comments="")
+
+    def save_npy(self, directory):
+        """
+        Writes each series as an .npy file, plus columns.json naming the columns.
+
+        Files are turns.npy, nation.<field>.npy with shape (samples, nations) and
+        industry.<field>.npy with shape (samples, industry columns).
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "turns.npy"), self.turns)
+        for field in self._nation:
+            np.save(os.path.join(directory, f"nation.{field}.npy"), self.nation(field))
+        for field in self._industry:
+            np.save(os.path.join(directory, f"industry.{field}.npy"), self.industry(field))
+        with open(os.path.join(directory, "columns.json"), "w") as f:
+            json.dump({"nations": self.nation_names, "industries": [list(column) for column in self.industry_columns]}, f)
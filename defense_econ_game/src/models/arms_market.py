@@ -0,0 +1,372 @@
+import heapq
+import math
+from collections import namedtuple
+from numbers import Integral, Real
+
+import numpy as np
+
+BUY = "buy"
+SELL = "sell"
+COMPONENT = "component"
+LEASE = "lease"
+
+def component_item(name):
+    """The market item of a finished component."""
+    return f"{COMPONENT}:{name}"
+
+def lease_item(design):
+    """The market item of a design's production rights; one unit is one turn of lease."""
+    return f"{LEASE}:{design}"
+
+# An order as posted. Orders never change; what is left of each lives in the ArmsMarket.
+# expires is the last turn the order can trade in, or None for an order that stands until filled or cancelled.
+MarketOrder = namedtuple("MarketOrder", ("order_id", "nation", "side", "item", "quantity", "price", "turn", "expires"))
+# One fill: quantity units of item sold by seller to buyer at price each.
+Trade = namedtuple("Trade", ("turn", "item", "buyer", "seller", "quantity", "price", "buy_order", "sell_order"))
+
+class ArmsMarket:
+    """
+    The international arms market: a price-time priority order book per item.
+
+    Nations post buy and sell orders for components and design leases during
+    a turn; they queue until the market phase, which enters them into the
+    books in posting order. An incoming order trades against the best resting
+    orders on the other side (highest bid or lowest ask, oldest first at
+    equal prices) at the resting order's price for as long as prices cross,
+    and whatever is left rests in the book. Each side of a book is a binary
+    heap of (price key, order id) entries.
+
+    Filled, cancelled and expired orders are dropped from the heaps lazily,
+    when they reach the top, so cancelling is O(1). A buyer can only buy what
+    its treasury, plus its sales earlier in the same phase, pays for; bids it
+    cannot pay for are cancelled. Matching only records who owes whom, and
+    settle() then moves the net amounts between treasuries in one pass.
+
+    Nations are referred to by name, so the market stays valid when nations
+    are copied for forks and restored from saves. Sellers' stock is not
+    checked: nations do not yet produce components.
+
+    Attributes:
+        next_order_id (int): The id the next posted order receives.
+        holdings (dict): {nation name: {component item: units bought}}.
+        leases (dict): {(nation name, design): last turn of the lease}.
+        last_prices (dict): {item: price of the latest trade}.
+        trades (list[Trade]): The trades of the latest market phase.
+    """
+    __slots__ = ("next_order_id", "_orders", "_remaining", "_pending", "_books", "_expiries", "_garbage", "holdings", "leases", "last_prices", "trades")
+
+    def __init__(self):
+        self.next_order_id = 0
+        self._orders = {}
+        # Unfilled quantity of every live order; an order is live while it has an entry here.
+        self._remaining = {}
+        self._pending = []
+        # item -> (bids, asks) heaps; bids are keyed by -price so both pop best first.
+        self._books = {}
+        # (expires, order id) of orders that expire, earliest first.
+        self._expiries = []
+        self._garbage = 0
+        self.holdings = {}
+        self.leases = {}
+        self.last_prices = {}
+        self.trades = []
+
+    def copy(self):
+        """Returns an independent copy. Orders are immutable and shared."""
+        child = ArmsMarket.__new__(ArmsMarket)
+        child.next_order_id = self.next_order_id
+        child._orders = dict(self._orders)
+        child._remaining = dict(self._remaining)
+        child._pending = list(self._pending)
+        child._books = {item: (list(bids), list(asks)) for item, (bids, asks) in self._books.items()}
+        child._expiries = list(self._expiries)
+        child._garbage = self._garbage
+        child.holdings = {nation: dict(items) for nation, items in self.holdings.items()}
+        child.leases = dict(self.leases)
+        child.last_prices = dict(self.last_prices)
+        child.trades = list(self.trades)
+        return child
+
+    def __len__(self):
+        """The number of live orders, pending or resting."""
+        return len(self._remaining)
+
+    def post(self, nation, side, item, quantity, price, turn, duration=None):
+        """
+        Posts an order, to be matched in the coming market phase.
+
+        Args:
+            nation (str): The posting nation's name.
+            side (str): BUY or SELL.
+            item (str): The item, from component_item() or lease_item().
+            quantity (int): Units wanted or offered; for leases, turns.
+            price (float): Limit price per unit.
+            turn (int): The current turn.
+            duration (int, optional): Turns the order stands, counting this one. Defaults to until filled or cancelled.
+
+        Returns:
+            int: The order id.
+        """
+        if side not in (BUY, SELL):
+            raise ValueError(f"Invalid order side: {side}")
+        kind, _, name = item.partition(":") if isinstance(item, str) else ("", "", "")
+        if kind not in (COMPONENT, LEASE) or not name:
+            raise ValueError(f"Order item must be component:<name> or lease:<design>: {item!r}")
+        if not _is_number(quantity) or not 0 < quantity < math.inf or int(quantity) != quantity:
+            raise ValueError(f"Order quantity must be a positive whole number: {quantity!r}")
+        if not _is_number(price) or not 0 < price < math.inf:
+            raise ValueError(f"Order price must be a positive number: {price!r}")
+        if duration is not None and (not isinstance(duration, Integral) or isinstance(duration, bool) or duration < 1):
+            raise ValueError(f"Order duration must be a whole number of turns, at least one: {duration!r}")
+        order = MarketOrder(self.next_order_id, nation, side, item, int(quantity), float(price), turn,
+                            turn + duration - 1 if duration is not None else None)
+        self.next_order_id += 1
+        self._orders[order.order_id] = order
+        self._remaining[order.order_id] = order.quantity
+        self._pending.append(order)
+        if order.expires is not None:
+            heapq.heappush(self._expiries, (order.expires, order.order_id))
+        return order.order_id
+
+    def restore(self, order, remaining, pending):
+        """Puts back a saved order with what is left of it, as pending or resting."""
+        self._orders[order.order_id] = order
+        self._remaining[order.order_id] = remaining
+        self.next_order_id = max(self.next_order_id, order.order_id + 1)
+        if pending:
+            self._pending.append(order)
+        else:
+            self._rest(order)
+        if order.expires is not None:
+            heapq.heappush(self._expiries, (order.expires, order.order_id))
+
+    def cancel(self, order_id, nation=None):
+        """
+        Cancels a live order.
+
+        Args:
+            order_id (int): The order.
+            nation (str, optional): Only cancel if the order is this nation's.
+
+        Returns:
+            bool: Whether an order was cancelled.
+        """
+        order = self._orders.get(order_id)
+        if order is None or order_id not in self._remaining or (nation is not None and order.nation != nation):
+            return False
+        self._drop(order_id)
+        return True
+
+    def _drop(self, order_id):
+        del self._remaining[order_id]
+        del self._orders[order_id]
+        self._garbage += 1
+
+    def remaining(self, order_id):
+        """Returns the unfilled quantity of an order, or 0 if it is no longer live."""
+        return self._remaining.get(order_id, 0)
+
+    def orders(self, nation=None):
+        """Returns the live orders, or one nation's, in posting order."""
+        return [order for order in self._orders.values() if nation is None or order.nation == nation]
+
+    def entries(self):
+        """Returns (order, remaining quantity, is pending) for every live order, in posting order; for saving."""
+        pending = {order.order_id for order in self._pending}
+        return [(order, self._remaining[order_id], order_id in pending) for order_id, order in self._orders.items()]
+
+    @property
+    def pending(self):
+        """Orders posted since the last market phase, in posting order."""
+        return [order for order in self._pending if order.order_id in self._remaining]
+
+    def best_bid(self, item):
+        """The highest resting bid price for an item, or None."""
+        book = self._books.get(item)
+        top = self._top(book[0]) if book else None
+        return -top[0] if top else None
+
+    def best_ask(self, item):
+        """The lowest resting ask price for an item, or None."""
+        book = self._books.get(item)
+        top = self._top(book[1]) if book else None
+        return top[0] if top else None
+
+    def _top(self, heap):
+        """Returns the best live entry of a heap, popping dead entries above it."""
+        remaining = self._remaining
+        while heap:
+            entry = heap[0]
+            if entry[1] in remaining:
+                return entry
+            heapq.heappop(heap)
+            self._garbage -= 1
+        return None
+
+    def _rest(self, order):
+        bids, asks = self._books.get(order.item) or self._books.setdefault(order.item, ([], []))
+        if order.side == BUY:
+            heapq.heappush(bids, (-order.price, order.order_id))
+        else:
+            heapq.heappush(asks, (order.price, order.order_id))
+
+    def needs_matching(self, turn):
+        """Whether the market phase of a turn has anything to do: orders to enter or orders expiring."""
+        if self._pending:
+            return True
+        expiries = self._expiries
+        while expiries and expiries[0][1] not in self._remaining:
+            heapq.heappop(expiries)
+        return bool(expiries) and expiries[0][0] < turn
+
+    def has_lease(self, nation, design, turn):
+        """Whether a nation holds the production rights of a design in a turn."""
+        return self.leases.get((nation, design), -1) >= turn
+
+    def match(self, turn, treasuries):
+        """
+        Enters the pending orders into the books and matches them.
+
+        Args:
+            turn (int): The current turn; orders that expired before it are dropped first.
+            treasuries (dict): {nation name: treasury} of every nation that can trade.
+
+        Returns:
+            list[Trade]: The trades, in execution order.
+        """
+        self._expire(turn)
+        remaining = self._remaining
+        orders = self._orders
+        # Cash available to each buyer: its treasury plus what it has netted in this phase so far.
+        cash = {}
+        trades = []
+        for order in self._pending:
+            left = remaining.get(order.order_id)
+            if left is None:
+                continue
+            if order.nation not in treasuries:
+                self._drop(order.order_id)
+                continue
+            bids, asks = self._books.get(order.item) or self._books.setdefault(order.item, ([], []))
+            buying = order.side == BUY
+            opposite = asks if buying else bids
+            limit = order.price
+            while left and opposite:
+                key, resting_id = opposite[0]
+                resting_left = remaining.get(resting_id)
+                if resting_left is None:
+                    heapq.heappop(opposite)
+                    self._garbage -= 1
+                    continue
+                price = key if buying else -key
+                if (price > limit) if buying else (price < limit):
+                    break
+                resting = orders[resting_id]
+                if resting.nation == order.nation or resting.nation not in treasuries:
+                    # No nation trades with itself; the older order makes way.
+                    heapq.heappop(opposite)
+                    del remaining[resting_id]
+                    del orders[resting_id]
+                    continue
+                buy, sell = (order, resting) if buying else (resting, order)
+                funds = cash.get(buy.nation)
+                if funds is None:
+                    funds = treasuries[buy.nation]
+                quantity = min(left, resting_left, int(max(funds, 0.0) // price))
+                if quantity <= 0:
+                    # The buyer cannot pay for a single unit: its bid is cancelled.
+                    if buying:
+                        break
+                    heapq.heappop(opposite)
+                    del remaining[resting_id]
+                    del orders[resting_id]
+                    continue
+                amount = quantity * price
+                cash[buy.nation] = funds - amount
+                cash[sell.nation] = cash.get(sell.nation, treasuries[sell.nation]) + amount
+                trades.append(Trade(turn, order.item, buy.nation, sell.nation, quantity, price, buy.order_id, sell.order_id))
+                left -= quantity
+                if quantity == resting_left:
+                    heapq.heappop(opposite)
+                    del remaining[resting_id]
+                    del orders[resting_id]
+                else:
+                    remaining[resting_id] = resting_left - quantity
+            if not left:
+                del remaining[order.order_id]
+                del orders[order.order_id]
+            elif buying and (top := self._top(opposite)) is not None and top[0] <= limit:
+                # Stopped for lack of funds while prices still cross: resting would cross the book.
+                self._drop(order.order_id)
+            else:
+                remaining[order.order_id] = left
+                self._rest(order)
+        self._pending = []
+        self._compact()
+        self._deliver(trades)
+        self.trades = trades
+        return trades
+
+    def _expire(self, turn):
+        expiries = self._expiries
+        while expiries and expiries[0][0] < turn:
+            _, order_id = heapq.heappop(expiries)
+            if order_id in self._remaining:
+                self._drop(order_id)
+
+    def _compact(self):
+        """Rebuilds the heaps once dead entries outnumber live orders."""
+        if self._garbage <= len(self._remaining) + 64:
+            return
+        remaining = self._remaining
+        for item, (bids, asks) in list(self._books.items()):
+            bids[:] = [entry for entry in bids if entry[1] in remaining]
+            asks[:] = [entry for entry in asks if entry[1] in remaining]
+            if not bids and not asks:
+                del self._books[item]
+                continue
+            heapq.heapify(bids)
+            heapq.heapify(asks)
+        self._expiries = [entry for entry in self._expiries if entry[1] in remaining]
+        heapq.heapify(self._expiries)
+        self._garbage = 0
+
+    def _deliver(self, trades):
+        for trade in trades:
+            self.last_prices[trade.item] = trade.price
+            kind, _, name = trade.item.partition(":")
+            if kind == LEASE:
+                key = (trade.buyer, name)
+                # Leases run from the turn after the trade; buying more extends them.
+                self.leases[key] = max(self.leases.get(key, trade.turn), trade.turn) + trade.quantity
+            else:
+                items = self.holdings.setdefault(trade.buyer, {})
+                items[trade.item] = items.get(trade.item, 0) + trade.quantity
+
+    @staticmethod
+    def settle(trades, nations):
+        """
+        Moves the money of a batch of trades between treasuries, one update per nation.
+
+        Args:
+            trades (list[Trade]): The trades.
+            nations (list[Nation]): The nations that traded.
+
+        Returns:
+            numpy.ndarray: The treasury change of each nation.
+        """
+        index = {nation.name: i for i, nation in enumerate(nations)}
+        count = len(nations)
+        if not trades:
+            return np.zeros(count)
+        buyers = np.fromiter((index[trade.buyer] for trade in trades), dtype=np.int64, count=len(trades))
+        sellers = np.fromiter((index[trade.seller] for trade in trades), dtype=np.int64, count=len(trades))
+        amounts = np.fromiter((trade.quantity * trade.price for trade in trades), dtype=np.float64, count=len(trades))
+        change = np.bincount(sellers, weights=amounts, minlength=count) - np.bincount(buyers, weights=amounts, minlength=count)
+        for i in np.flatnonzero(change).tolist():
+            nations[i].treasury += change[i]
+        return change
+
+def _is_number(value):
+    """Whether a value is a real number; booleans and numeric strings are not."""
+    return isinstance(value, Real) and not isinstance(value, bool)
@@ -0,0 +1,142 @@
+from collections.abc import Mapping
+
+def freeze(value):
+    """Recursively converts dicts to Definitions and lists to tuples."""
+    if isinstance(value, Definition):
+        return value
+    if isinstance(value, dict):
+        return Definition(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+class Definition(Mapping):
+    """
+    An immutable definition record loaded from game data.
+
+    Supports both mapping access (definition['cp_cost']) and attribute access
+    (definition.cp_cost). Definitions are shared, never copied: copy and
+    deepcopy return the same object.
+    """
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields):
+        object.__setattr__(self, "_fields", {key: freeze(value) for key, value in fields.items()})
+
+    def __getitem__(self, key):
+        return self._fields[key]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getattr__(self, name):
+        try:
+            return self._fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Definition records are immutable")
+
+    def __hash__(self):
+        return id(self)
+
+    def __eq__(self, other):
+        return self is other or (isinstance(other, Mapping) and dict(self.items()) == dict(other.items()))
+
+    def __repr__(self):
+        return f"Definition({self._fields!r})"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_restore_definition, (self._fields,))
+
+def _restore_definition(fields):
+    """Rebuilds an unpickled Definition from fields that are already frozen."""
+    definition = object.__new__(Definition)
+    object.__setattr__(definition, "_fields", fields)
+    return definition
+
+class Record:
+    """
+    Base class of immutable, slotted definition records such as technologies and industry types.
+
+    Subclasses declare their fields in __slots__ and set them in __init__ with
+    _set. Like Definition, records are shared, never copied.
+    """
+    __slots__ = ()
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_restore_record, (type(self), tuple(getattr(self, name) for name in type(self).__slots__)))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({getattr(self, 'name', '')!r})"
+
+def _restore_record(cls, values):
+    record = object.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        object.__setattr__(record, name, value)
+    return record
+
+class Catalog:
+    """
+    An ordered, read-only collection of definitions indexed by key.
+
+    Iterates like the list it replaces, and get() finds a definition by its
+    key in constant time.
+    """
+    def __init__(self, records, key):
+        """
+        Initializes the Catalog.
+
+        Args:
+            records (iterable): The definitions, in load order.
+            key (callable): Returns the unique key of a definition.
+        """
+        self._records = tuple(records)
+        self._index = {key(record): record for record in self._records}
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def get(self, key, default=None):
+        return self._index.get(key, default)
+
+    def keys(self):
+        return self._index.keys()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
@@ -1,2 +1,8 @@
-class ComponentDesign:
-    pass
\ No newline at end of file
+from src.models.catalog import Record
+
+class ComponentDesign(Record):
+    """A designed component: the stats it adds to a unit and the runes woven into it."""
+    __slots__ = ("name", "slot", "hp", "armor", "damage", "stress_capacity", "runes")
+
+    def __init__(self, name, slot="special", hp=0.0, armor=0.0, damage=0.0, stress_capacity=0.0, runes=()):
+        self._set(name=name, slot=slot, hp=hp, armor=armor, damage=damage, stress_capacity=stress_capacity, runes=tuple(runes))
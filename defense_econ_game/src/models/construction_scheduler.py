@@ -0,0 +1,276 @@
+import copy
+import heapq
+import math
+from collections import deque
+
+class ConstructionScheduler:
+    """
+    A nation's construction slots and project queue.
+
+    Active projects (at most one per construction slot) each receive the
+    nation's full construction points every turn; queued projects wait in a
+    deque and move into free slots in order at the start of the next
+    construction phase. Every project gets a handle, unique within the nation
+    and kept through saves, so it can be cancelled or looked up without
+    knowing its position. Cancelling a queued project only forgets its handle;
+    the queue skips such dead entries and drops them in one pass once they
+    are half of it, so cancelling from a long queue costs O(1) amortized.
+
+    Completion predictions assume construction points stay at their current
+    rate and the treasury stays out of deficit. They are cached, stay valid
+    across turns for as long as that holds, and are extended in O(log slots)
+    when a project joins the back of the queue.
+
+    Attributes:
+        active (list[ProjectInstance]): Projects in construction slots, in start order.
+        queued (collections.deque[ProjectInstance]): Waiting projects, in queue order; an empty
+            tuple until the first project is queued, since most nations never queue one.
+        next_handle (int): The handle the next added project receives.
+    """
+    __slots__ = ("active", "_queued", "next_handle", "_projects", "_dead", "_queued_upkeep", "_version", "_advances", "_predictions")
+
+    def __init__(self):
+        self.active = []
+        self._queued = None
+        self.next_handle = 0
+        self._projects = {}
+        # Cancelled projects still in _queued.
+        self._dead = 0
+        self._queued_upkeep = 0.0
+        # Structural changes that invalidate predictions; see completion_turns().
+        self._version = 0
+        self._advances = 0
+        self._predictions = None
+
+    def copy(self):
+        """Returns an independent copy holding copies of every project."""
+        child = copy.copy(self)
+        child.active = [copy.copy(project) for project in self.active]
+        child._queued = deque(copy.copy(project) for project in self._waiting()) if self.queue_length else None
+        child._dead = 0
+        child._projects = {project.handle: project for project in child}
+        if self._predictions is not None:
+            key, turns, tail = self._predictions
+            child._predictions = (key, dict(turns), list(tail))
+        return child
+
+    @property
+    def queued(self):
+        if self._dead:
+            self._compact()
+        return self._queued if self._queued is not None else ()
+
+    @property
+    def queue_length(self):
+        """The number of queued projects, in O(1)."""
+        return len(self._queued) - self._dead if self._queued is not None else 0
+
+    def __len__(self):
+        return len(self.active) + self.queue_length
+
+    def __iter__(self):
+        yield from self.active
+        yield from self._waiting()
+
+    def _is_live(self, project):
+        return self._projects.get(project.handle) is project
+
+    def _waiting(self):
+        """The queued projects, skipping cancelled ones without dropping them."""
+        if self._queued is None:
+            return iter(())
+        if not self._dead:
+            return iter(self._queued)
+        return (project for project in self._queued if self._is_live(project))
+
+    def _compact(self):
+        self._queued = deque(project for project in self._queued if self._is_live(project))
+        self._dead = 0
+
+    def get(self, handle):
+        """Returns the project with a handle, or None."""
+        return self._projects.get(handle)
+
+    def add(self, project, slots):
+        """
+        Starts a project in a free slot, or queues it when every slot is taken.
+
+        Args:
+            project (ProjectInstance): The project; a handle is assigned if it has none.
+            slots (int): The nation's construction slots.
+
+        Returns:
+            int: The project's handle.
+        """
+        if project.handle is None:
+            project.handle = self.next_handle
+        self.next_handle = max(self.next_handle, project.handle + 1)
+        self._projects[project.handle] = project
+        if len(self.active) < slots:
+            self.active.append(project)
+            self._version += 1
+        else:
+            self._queue(project)
+            self._extend_predictions(project)
+        return project.handle
+
+    def restore(self, project, queued):
+        """Puts back a saved project with its handle, as active or queued."""
+        if project.handle is None:
+            project.handle = self.next_handle
+        self._projects[project.handle] = project
+        self.next_handle = max(self.next_handle, project.handle + 1)
+        if queued:
+            self._queue(project)
+        else:
+            self.active.append(project)
+        self._version += 1
+
+    def _queue(self, project):
+        if self._queued is None:
+            self._queued = deque()
+        self._queued.append(project)
+        self._queued_upkeep += self._upkeep(project)
+
+    def cancel(self, handle):
+        """
+        Removes a project by handle.
+
+        Returns:
+            ProjectInstance: The cancelled project, or None if there is no such project.
+        """
+        project = self._projects.pop(handle, None)
+        if project is None:
+            return None
+        if project in self.active:
+            self.active.remove(project)
+        else:
+            self._dead += 1
+            self._queued_upkeep -= self._upkeep(project)
+            if not self.queue_length:
+                self._queued.clear()
+                self._dead = 0
+                self._queued_upkeep = 0.0
+            elif self._dead * 2 > len(self._queued):
+                self._compact()
+        self._version += 1
+        return project
+
+    def cancel_at(self, index):
+        """
+        Removes a project by position, counting active projects first and then the queue.
+
+        Returns:
+            ProjectInstance: The cancelled project, or None if the index is out of range.
+        """
+        if 0 <= index < len(self.active):
+            return self.cancel(self.active[index].handle)
+        if 0 <= index - len(self.active) < self.queue_length:
+            return self.cancel(self.queued[index - len(self.active)].handle)
+        return None
+
+    def promote(self, slots):
+        """Moves queued projects into free slots, in queue order."""
+        while len(self.active) < slots and self.queue_length:
+            project = self._queued.popleft()
+            if not self._is_live(project):
+                self._dead -= 1
+                continue
+            self._queued_upkeep -= self._upkeep(project)
+            self.active.append(project)
+        if not self.queue_length:
+            if self._queued:
+                self._queued.clear()
+                self._dead = 0
+            self._queued_upkeep = 0.0
+
+    def advance(self, cp):
+        """
+        Adds a turn's construction points to every active project and removes the finished ones.
+
+        Args:
+            cp (float): The construction points every active project receives.
+
+        Returns:
+            list[ProjectInstance]: The completed projects, latest started first.
+        """
+        self._advances += 1
+        completed = []
+        for project in reversed(self.active):
+            definition = project.definition
+            if not definition:
+                continue
+            project.current_cp += cp
+            if project.current_cp >= definition['cp_cost']:
+                completed.append(project)
+        if completed:
+            finished = {id(project) for project in completed}
+            self.active = [project for project in self.active if id(project) not in finished]
+            for project in completed:
+                del self._projects[project.handle]
+        return completed
+
+    def active_upkeep(self):
+        return sum(self._upkeep(project) for project in self.active)
+
+    def committed_upkeep(self):
+        """The upkeep of every active and queued project."""
+        return self.active_upkeep() + self._queued_upkeep
+
+    def _upkeep(self, project):
+        return project.definition['upkeep_cost'] if project.definition else 0
+
+    def completion_turns(self, turn, cp, slots):
+        """
+        Predicts the turn each project completes on.
+
+        Args:
+            turn (int): The current turn.
+            cp (float): The construction points per active project per turn.
+            slots (int): The nation's construction slots.
+
+        Returns:
+            dict: {handle: turn}, where turn is the game turn reached by the end of turn
+                that completes the project, or None if it never completes at this rate.
+        """
+        key = (cp, slots, self._version, turn - self._advances)
+        if self._predictions is None or self._predictions[0] != key:
+            self._predictions = (key,) + self._predict(turn, cp, slots)
+        return self._predictions[1]
+
+    def _turns_needed(self, project, cp):
+        if not project.definition or cp <= 0:
+            return None
+        return max(1, math.ceil((project.definition['cp_cost'] - project.current_cp) / cp))
+
+    def _predict(self, turn, cp, slots):
+        """Full prediction: a min-heap of the turns each slot frees up, consumed in queue order."""
+        turns = {}
+        # Slots free now take their next project at the start of the coming end of turn.
+        tail = [turn] * max(0, slots - len(self.active))
+        for project in self.active:
+            needed = self._turns_needed(project, cp)
+            done = turn + needed if needed is not None else math.inf
+            turns[project.handle] = done if needed is not None else None
+            tail.append(done)
+        heapq.heapify(tail)
+        for project in self._waiting():
+            self._place(project, cp, turns, tail)
+        return turns, tail
+
+    def _place(self, project, cp, turns, tail):
+        if not tail:
+            turns[project.handle] = None
+            return
+        free = heapq.heappop(tail)
+        needed = self._turns_needed(project, cp)
+        done = free + needed if needed is not None and free != math.inf else math.inf
+        turns[project.handle] = done if done != math.inf else None
+        heapq.heappush(tail, done)
+
+    def _extend_predictions(self, project):
+        """Predicts a project appended to the queue from the cached slot free times."""
+        if self._predictions is None:
+            return
+        key, turns, tail = self._predictions
+        self._place(project, key[0], turns, tail)
@@ -0,0 +1,135 @@
+"""
+The economic formulas of a nation's end of turn.
+
+Nation, IndustryLedger, the end-of-turn phases and PolicyProjector all
+compute through these functions, so the rules live in one place. Each one
+takes Python numbers for a single nation or industry, or numpy arrays for
+many at once, and performs the same operations in the same order either
+way, so batched results are identical to one-at-a-time ones.
+"""
+import numpy as np
+
+# Public opinion is 50 at NEUTRAL_TAX_RATE and no social spending.
+BASE_PUBLIC_OPINION = 50.0
+NEUTRAL_TAX_RATE = 0.15
+# Share of the gap to the target public opinion closed every turn.
+OPINION_ADJUSTMENT_RATE = 0.20
+
+BASE_GDP_GROWTH = 0.01
+GROWTH_PER_INFRASTRUCTURE_LEVEL = 0.005
+# GDP growth from public opinion above HIGH_OPINION, below LOW_OPINION and in between.
+HIGH_OPINION, LOW_OPINION = 75, 25
+HIGH_OPINION_GROWTH, LOW_OPINION_GROWTH, NORMAL_OPINION_GROWTH = 0.01, -0.02, 0.005
+
+INFRASTRUCTURE_FOCUS = "Infrastructure_Focus"
+BASE_CONSTRUCTION_POINTS = 5
+# Construction points per IC are CP_PER_IC times the IC focus modifier.
+CP_PER_IC = 0.1
+INFRASTRUCTURE_FOCUS_MODIFIER, BALANCED_FOCUS_MODIFIER = 0.8, 0.5
+
+# Share of government IC profit that reaches the treasury.
+GOVERNMENT_PROFIT_SHARE = 0.8
+# Highest tax break an industry can be given.
+MAX_INDUSTRY_TAX_RATE = 0.20
+BASE_IC_COST = 10.0
+# Each industry level above 1 makes its reinvestment this much cheaper.
+LEVEL_COST_REDUCTION = 0.05
+
+def effective_research_points(research_points, research_bonus):
+    """The RP a nation puts into its current research in a turn."""
+    return research_points * (1 + research_bonus)
+
+def _clip_opinion(opinion):
+    if isinstance(opinion, np.ndarray):
+        return np.clip(opinion, 0, 100, out=opinion)
+    return max(0, min(100, opinion))
+
+def target_public_opinion(social_spending, tax_rate):
+    """The public opinion a nation's social spending and tax rate pull towards."""
+    opinion = BASE_PUBLIC_OPINION + (social_spending / 1000) * 100
+    opinion = opinion - (tax_rate - NEUTRAL_TAX_RATE) * 100
+    return _clip_opinion(opinion)
+
+def next_public_opinion(public_opinion, target):
+    """Public opinion after one turn of moving towards its target."""
+    return _clip_opinion(public_opinion + (target - public_opinion) * OPINION_ADJUSTMENT_RATE)
+
+def opinion_growth(public_opinion):
+    """The GDP growth public opinion adds."""
+    if isinstance(public_opinion, np.ndarray):
+        return np.where(public_opinion > HIGH_OPINION, HIGH_OPINION_GROWTH,
+                        np.where(public_opinion < LOW_OPINION, LOW_OPINION_GROWTH, NORMAL_OPINION_GROWTH))
+    if public_opinion > HIGH_OPINION:
+        return HIGH_OPINION_GROWTH
+    if public_opinion < LOW_OPINION:
+        return LOW_OPINION_GROWTH
+    return NORMAL_OPINION_GROWTH
+
+def gdp_growth_rate(infrastructure_level, public_opinion, growth_modifier):
+    """
+    The civilian GDP growth rate of a turn.
+
+    Args:
+        infrastructure_level: The nation's infrastructure level.
+        public_opinion: Public opinion at the start of the turn.
+        growth_modifier: The nation's gdp_growth_modifier.
+    """
+    growth = BASE_GDP_GROWTH + (infrastructure_level - 1) * GROWTH_PER_INFRASTRUCTURE_LEVEL
+    growth = growth + opinion_growth(public_opinion)
+    return growth + growth_modifier
+
+def construction_points(industrial_capacity, infrastructure_focus):
+    """
+    The construction points every active project gains in a turn.
+
+    Args:
+        industrial_capacity: The nation's total IC.
+        infrastructure_focus: Whether the nation's IC focus policy is INFRASTRUCTURE_FOCUS.
+    """
+    if isinstance(infrastructure_focus, np.ndarray):
+        focus_modifier = np.where(infrastructure_focus, INFRASTRUCTURE_FOCUS_MODIFIER, BALANCED_FOCUS_MODIFIER)
+    else:
+        focus_modifier = INFRASTRUCTURE_FOCUS_MODIFIER if infrastructure_focus else BALANCED_FOCUS_MODIFIER
+    return BASE_CONSTRUCTION_POINTS + industrial_capacity * focus_modifier * CP_PER_IC
+
+def industry_profitability(base_profitability, tax_rate, subsidy_per_ic):
+    """Effective profitability of private IC."""
+    return base_profitability * (1 - tax_rate) + subsidy_per_ic
+
+def industry_income(government_ic, private_ic, base_profitability, tax_rate, profitability):
+    """
+    One turn of an industry's income.
+
+    Returns:
+        tuple: (profit paid to the treasury, profit left for private reinvestment).
+    """
+    private_profit = private_ic * profitability
+    return government_ic * base_profitability * GOVERNMENT_PROFIT_SHARE + private_profit * tax_rate, private_profit * (1 - tax_rate)
+
+def reinvestment_shares(profitability, owner=None):
+    """
+    Each industry's share of its nation's private reinvestment pool, in proportion to its positive profitability.
+
+    Args:
+        profitability (numpy.ndarray): Profitability per industry, along the last axis.
+        owner (numpy.ndarray, optional): Each industry's nation, for the industries of many
+            nations in one flat array. Defaults to one nation per row.
+
+    Returns:
+        numpy.ndarray: The shares, 0 for unprofitable industries.
+    """
+    profitable = profitability > 0
+    positive = np.where(profitable, profitability, 0.0)
+    if owner is None:
+        total = positive.sum(axis=-1, keepdims=True)
+    else:
+        total = np.bincount(owner, weights=positive)[owner] if len(owner) else positive
+    return np.where(profitable & (total > 0), profitability / np.where(total > 0, total, 1.0), 0.0)
+
+def ic_cost_per_unit(private_ic_cost_reduction):
+    """What one unit of private IC costs before industry level discounts."""
+    return BASE_IC_COST * (1 - private_ic_cost_reduction)
+
+def level_cost_multiplier(level):
+    """The multiplier an industry's level applies to its IC cost."""
+    return 1 - (level - 1) * LEVEL_COST_REDUCTION
@@ -1,6 +1,47 @@
-class Event:
-    def __init__(self, name, description, trigger_threshold, effects):
-        self.name = name
-        self.description = description
-        self.trigger_threshold = trigger_threshold
-        self.effects = effects
+from operator import attrgetter
+
+from src.models.catalog import Record
+from src.random_stream import stream_key
+
+class CompiledEffects:
+    """
+    An event's effects compiled into a callable that applies them to a nation.
+
+    Each effect adds its value to the nation attribute of the same name. The
+    attribute getters are built once at load time instead of on every trigger.
+    """
+    __slots__ = ("adders",)
+
+    def __init__(self, effects):
+        self.adders = tuple((attrgetter(attribute), attribute, value) for attribute, value in effects.items())
+
+    def __call__(self, nation):
+        for get, attribute, value in self.adders:
+            setattr(nation, attribute, get(nation) + value)
+
+class Event(Record):
+    """
+    A game event.
+
+    Without a base_chance, the event fires once for every nation the first time
+    its meter reaches the trigger threshold. With one, it is a recurring random
+    event: once the meter has reached the threshold, every nation draws for it
+    every turn and the effects apply to the nations whose draw succeeds.
+    """
+    __slots__ = ("name", "description", "trigger_threshold", "trigger_meter", "effects", "base_chance", "key", "apply")
+
+    def __init__(self, name, description, trigger_threshold, effects, trigger_meter="crisis_awareness", base_chance=None):
+        self._set(
+            name=name,
+            description=description,
+            trigger_threshold=trigger_threshold,
+            trigger_meter=trigger_meter,
+            effects=effects,
+            base_chance=base_chance,
+            key=stream_key(name),
+            apply=CompiledEffects(effects),
+        )
+
+    @property
+    def stochastic(self):
+        return self.base_chance is not None
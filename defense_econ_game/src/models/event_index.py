@@ -0,0 +1,123 @@
+from bisect import bisect_right
+
+import numpy as np
+
+from src.random_stream import stream_key, uniforms
+
+class EventIndex:
+    """
+    Pending events ordered by trigger threshold on each meter, plus the recurring random events.
+
+    A meter is a GameState attribute such as crisis_awareness,
+    social_dissonance or turn. Checking for triggered events is one bisect per
+    meter, so a turn in which no threshold was crossed costs nothing per event.
+    Threshold events fire once, the first time their meter reaches the threshold.
+
+    Random events (those with a base_chance) never leave the index. Each turn,
+    every nation draws for every random event whose meter has reached its
+    threshold, with a chance of base_chance * (1 + crisis_awareness / 100) *
+    (1 + social_dissonance / 100), capped at 1. All draws of a turn are one
+    vectorized call to the counter-based stream in src/random_stream.py, keyed
+    by the game seed, the turn, the nation name and the event name.
+
+    Attributes:
+        stochastic (tuple[Event]): The random events.
+    """
+    def __init__(self, events=()):
+        self._thresholds = {}
+        self._events = {}
+        self.stochastic = ()
+        self._stochastic_arrays = None
+        for event in events:
+            self.add(event)
+
+    def __len__(self):
+        """The number of pending threshold events."""
+        return sum(len(events) for events in self._events.values())
+
+    def __iter__(self):
+        """Iterates over the pending threshold events."""
+        for events in self._events.values():
+            yield from events
+
+    def copy(self):
+        """Returns an index with its own pending lists; the events themselves are shared."""
+        index = EventIndex()
+        index._thresholds = {meter: list(thresholds) for meter, thresholds in self._thresholds.items()}
+        index._events = {meter: list(events) for meter, events in self._events.items()}
+        index.stochastic = self.stochastic
+        index._stochastic_arrays = self._stochastic_arrays
+        return index
+
+    def add(self, event):
+        if event.stochastic:
+            self.stochastic += (event,)
+            self._stochastic_arrays = None
+            return
+        thresholds = self._thresholds.setdefault(event.trigger_meter, [])
+        events = self._events.setdefault(event.trigger_meter, [])
+        position = bisect_right(thresholds, event.trigger_threshold)
+        thresholds.insert(position, event.trigger_threshold)
+        events.insert(position, event)
+
+    def next_threshold(self, meter):
+        """Returns the lowest pending threshold on a meter, or None."""
+        thresholds = self._thresholds.get(meter)
+        return thresholds[0] if thresholds else None
+
+    def pop_triggered(self, game_state):
+        """
+        Removes and returns every pending event whose meter has reached its threshold.
+
+        Args:
+            game_state (GameState): The state the meters are read from.
+
+        Returns:
+            list[Event]: The triggered events, in meter then threshold order.
+        """
+        triggered = []
+        for meter, thresholds in self._thresholds.items():
+            if not thresholds:
+                continue
+            end = bisect_right(thresholds, getattr(game_state, meter))
+            if end:
+                triggered.extend(self._events[meter][:end])
+                del thresholds[:end]
+                del self._events[meter][:end]
+        return triggered
+
+    def _arrays(self):
+        if self._stochastic_arrays is None:
+            events = self.stochastic
+            meters = tuple(sorted({event.trigger_meter for event in events}))
+            self._stochastic_arrays = (
+                np.array([event.key for event in events], dtype=np.uint64),
+                np.array([event.base_chance for event in events], dtype=np.float64),
+                np.array([event.trigger_threshold for event in events], dtype=np.float64),
+                meters,
+                np.array([meters.index(event.trigger_meter) for event in events], dtype=np.intp),
+            )
+        return self._stochastic_arrays
+
+    def draw(self, game_state, nations):
+        """
+        Draws this turn's random events for every nation. The index is not changed.
+
+        Args:
+            game_state (GameState): The state the seed, turn and meters are read from.
+            nations (list[Nation]): The nations drawing.
+
+        Returns:
+            list[tuple]: (nation, event) pairs that fire, in nation then event order.
+        """
+        if not self.stochastic or not nations:
+            return []
+        keys, base_chances, thresholds, meters, meter_of = self._arrays()
+        meter_values = np.array([getattr(game_state, meter) for meter in meters], dtype=np.float64)
+        scale = (1 + game_state.crisis_awareness / 100) * (1 + game_state.social_dissonance / 100)
+        chances = np.where(meter_values[meter_of] >= thresholds, np.minimum(base_chances * scale, 1.0), 0.0)
+        if not chances.any():
+            return []
+        nation_keys = np.fromiter((stream_key(nation.name) for nation in nations), dtype=np.uint64, count=len(nations))
+        fired_nations, fired_events = np.nonzero(uniforms(game_state.seed, game_state.turn, nation_keys, keys) < chances)
+        return [(nations[n], self.stochastic[e]) for n, e in zip(fired_nations.tolist(), fired_events.tolist())]
@@ -1,13 +1,177 @@
+import weakref
+
 from src.models.nation import Nation
+from src.models.catalog import Catalog
+from src.models.event_index import EventIndex
+from src.models.arms_market import ArmsMarket
+
+# The slot index of the player nation, next to the positions in ai_nations.
+PLAYER = -1
+# Dead forks are dropped from a nation's sharers once this many have built up.
+PRUNE_SHARERS_AT = 16
 
 class GameState:
+    """
+    Everything that changes over a game: the turn, the nations and the world meters and market.
+
+    Forks share nations copy-on-write (see fork()), so nations are reached
+    through player_nation, ai_nations, nations and nation_at(), which hand out
+    a nation this state may change, or through read_nations() by callers that
+    only read them.
+    """
     def __init__(self):
         self.turn = 0
-        self.player_nation = None
-        self.ai_nations = []
-        self.available_technologies = []
+        self.seed = 0
+        # Marks the nations this state owns, and may change in place.
+        self._owner = object()
+        # Whether every AI nation is owned by this state and lent to no fork, so ai_nations can skip checking them.
+        self._exclusive = True
+        self._player_nation = None
+        self._ai_nations = []
+        self.available_technologies = Catalog((), key=lambda tech: tech.name)
         self.crisis_awareness = 0
         self.social_dissonance = 0
-        self.available_events = []
-        self.all_industries = []
-        self.available_projects = []
+        self.available_events = EventIndex()
+        self.all_industries = Catalog((), key=lambda industry: industry.name)
+        self.available_projects = Catalog((), key=lambda project: project['id'])
+        self.market = ArmsMarket()
+        # Incremented whenever the state changes, so derived data such as the view model can be cached.
+        self.version = 0
+
+    @property
+    def player_nation(self):
+        nation = self._player_nation
+        if nation is not None and (nation._owner is not self._owner or nation._sharers):
+            nation = self._take(nation, PLAYER)
+        return nation
+
+    @player_nation.setter
+    def player_nation(self, nation):
+        self._player_nation = nation
+
+    @property
+    def ai_nations(self):
+        if not self._exclusive:
+            for index, nation in enumerate(self._ai_nations):
+                if nation._owner is not self._owner or nation._sharers:
+                    self._take(nation, index)
+            self._exclusive = True
+        return self._ai_nations
+
+    @ai_nations.setter
+    def ai_nations(self, nations):
+        self._ai_nations = list(nations)
+        self._exclusive = False
+
+    @property
+    def nations(self):
+        """All nations in the world, player first."""
+        if self.player_nation is None:
+            return list(self.ai_nations)
+        return [self.player_nation] + self.ai_nations
+
+    @property
+    def has_player_nation(self):
+        return self._player_nation is not None
+
+    def nation_at(self, index):
+        """The nation at index in nations, copying only that one if it is shared."""
+        if self._player_nation is not None:
+            if index == 0:
+                return self.player_nation
+            index -= 1
+        nation = self._ai_nations[index]
+        if nation._owner is not self._owner or nation._sharers:
+            nation = self._take(nation, index)
+        return nation
+
+    def read_nations(self):
+        """
+        All nations in the world, player first, for callers that only read them.
+
+        Nations shared with a fork or with the parent of this one are returned
+        as they are rather than copied, so they must not be changed.
+        """
+        if self._player_nation is None:
+            return list(self._ai_nations)
+        return [self._player_nation] + self._ai_nations
+
+    def fork(self):
+        """
+        Returns a cheap child state for speculative play.
+
+        The child shares the immutable catalogs and, copy-on-write, every
+        nation with this state, so forking costs O(nations) list entries
+        rather than a copy of each nation. Whichever state reaches a shared
+        nation for change first pays for one Nation.fork(): the child copies
+        a nation the first time it takes it from player_nation, ai_nations,
+        nations or nation_at(), and this state, which keeps its own nation
+        objects, first hands every live fork still sharing a nation a copy
+        of it. The parent and the child can then be changed in any way,
+        through commands or through nations they hand out, without affecting
+        each other; only references to a nation kept from before the fork
+        bypass this.
+        """
+        child = GameState.__new__(GameState)
+        child.__dict__.update(self.__dict__)
+        child._owner = object()
+        child._exclusive = False
+        child._ai_nations = list(self._ai_nations)
+        child.available_events = self.available_events.copy()
+        child.market = self.market.copy()
+        self._exclusive = False
+        reference = weakref.ref(child)
+        for nation in self.read_nations():
+            if nation._owner is None and not nation._sharers:
+                # Added without passing through this state's accessors.
+                nation._owner = self._owner
+            elif len(nation._sharers) >= PRUNE_SHARERS_AT:
+                nation._sharers = [sharer for sharer in nation._sharers if sharer() is not None]
+            nation._sharers.append(reference)
+        return child
+
+    def _slot(self, index):
+        if index == PLAYER:
+            return self._player_nation
+        return self._ai_nations[index] if index < len(self._ai_nations) else None
+
+    def _set_slot(self, index, nation):
+        if index == PLAYER:
+            self._player_nation = nation
+        else:
+            self._ai_nations[index] = nation
+
+    def _take(self, nation, index):
+        """Makes the nation at index (PLAYER for the player nation) one this state may change, and returns it."""
+        if nation._owner is self._owner:
+            self._lend(nation, index)
+            return nation
+        others = [sharer for sharer in nation._sharers if sharer() is not None and sharer() is not self]
+        if nation._owner is None and not others:
+            nation._owner = self._owner
+            nation._sharers = []
+            return nation
+        nation._sharers = others
+        own = nation.fork()
+        own._owner = self._owner
+        self._set_slot(index, own)
+        return own
+
+    @staticmethod
+    def _lend(nation, index):
+        """Hands every live fork still sharing a nation one copy of it, before its owner changes it."""
+        snapshot = None
+        for sharer in nation._sharers:
+            state = sharer()
+            if state is not None and state._slot(index) is nation:
+                if snapshot is None:
+                    snapshot = nation.fork()
+                    snapshot._owner = None
+                state._set_slot(index, snapshot)
+                state._exclusive = False
+                snapshot._sharers.append(sharer)
+        nation._sharers = []
+
+    def mark_changed(self):
+        """Records that the state is about to change, invalidating anything cached from it."""
+        self.version += 1
@@ -1,16 +1,78 @@
-import math
+from src.models import economy_rules
+from src.models.catalog import Record
+
+class IndustryType(Record):
+    """The shared definition of an industry. Each nation's holdings of it are an Industry."""
+    __slots__ = ("name", "tier", "profitability", "government_ic", "private_ic", "level_bonuses", "modifier_source")
+
+    def __init__(self, name, tier, profitability=1.0, government_ic=0.0, private_ic=0.0, level_bonuses=None):
+        self._set(
+            name=name,
+            tier=tier,
+            profitability=profitability,
+            # Starting IC of a nation's first holdings.
+            government_ic=government_ic,
+            private_ic=private_ic,
+            level_bonuses=level_bonuses if level_bonuses is not None else [],
+            modifier_source=("industry", name),
+        )
 
 class Industry:
+    """
+    A nation's holdings in an industry: its level, IC and tax settings.
+
+    Name, tier and level bonuses come from the shared IndustryType.
+    """
+    __slots__ = ("definition", "level", "government_ic", "private_ic", "base_profitability", "tax_rate", "subsidy_per_ic")
+
+    DEFAULT_TAX_RATE = 0.20
+
     def __init__(self, name, tier, profitability=1.0, government_ic=0.0, private_ic=0.0, level_bonuses=None):
-        self.name = name
-        self.tier = tier
+        self._init(IndustryType(name, tier, profitability, government_ic, private_ic, level_bonuses), profitability, government_ic, private_ic)
+
+    @classmethod
+    def of(cls, definition, profitability=None, government_ic=None, private_ic=None):
+        """
+        Creates holdings of a shared IndustryType.
+
+        Args:
+            definition (IndustryType): The industry.
+            profitability (float, optional): The base profitability. Defaults to the definition's.
+            government_ic (float, optional): Starting government IC. Defaults to the definition's.
+            private_ic (float, optional): Starting private IC. Defaults to the definition's.
+
+        Returns:
+            Industry: The new holdings.
+        """
+        industry = cls.__new__(cls)
+        industry._init(
+            definition,
+            definition.profitability if profitability is None else profitability,
+            definition.government_ic if government_ic is None else government_ic,
+            definition.private_ic if private_ic is None else private_ic,
+        )
+        return industry
+
+    def _init(self, definition, profitability, government_ic, private_ic):
+        self.definition = definition
         self.level = 1
         self.government_ic = government_ic
         self.private_ic = private_ic
-        self.base_profitability = profitability # Store base profitability
-        self.tax_rate = 0.20 # Default tax rate
-        self.subsidy_per_ic = 0.0 # Default subsidy
-        self.level_bonuses = level_bonuses if level_bonuses is not None else []
+        self.base_profitability = profitability
+        self.tax_rate = self.DEFAULT_TAX_RATE
+        self.subsidy_per_ic = 0.0
+
+    @property
+    def name(self):
+        return self.definition.name
+
+    @property
+    def tier(self):
+        return self.definition.tier
+
+    @property
+    def level_bonuses(self):
+        return self.definition.level_bonuses
 
     @property
     def ic(self):
@@ -19,8 +81,8 @@ class Industry:
     @property
     def profitability(self):
         # Effective profitability for private IC
-        return self.base_profitability * (1 - self.tax_rate) + self.subsidy_per_ic
+        return economy_rules.industry_profitability(self.base_profitability, self.tax_rate, self.subsidy_per_ic)
 
     def get_ic_reinvestment_cost_reduction(self):
         # Each level decreases cost by 0.05 (5%)
-        return (self.level - 1) * 0.05
+        return (self.level - 1) * economy_rules.LEVEL_COST_REDUCTION
@@ -0,0 +1,128 @@
+import numpy as np
+
+from src.models import economy_rules
+from src.models.industry import Industry
+
+
+class _LedgerColumn:
+    """Descriptor that reads and writes one column of an IndustryLedger row."""
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._ledger._columns[self.name][obj._row].item()
+
+    def __set__(self, obj, value):
+        obj._ledger._columns[self.name][obj._row] = value
+
+
+class LedgerIndustry(Industry):
+    """
+    An Industry whose numeric state lives in a row of an IndustryLedger.
+
+    Behaves exactly like an Industry; reads and writes of the ledger columns go
+    straight to the backing arrays, so vectorized passes over the ledger and
+    per-object access always agree.
+    """
+    government_ic = _LedgerColumn()
+    private_ic = _LedgerColumn()
+    base_profitability = _LedgerColumn()
+    tax_rate = _LedgerColumn()
+    subsidy_per_ic = _LedgerColumn()
+    level = _LedgerColumn()
+    __slots__ = ("_ledger", "_row")
+
+    def __init__(self, ledger, row, definition):
+        self._ledger = ledger
+        self._row = row
+        self.definition = definition
+
+
+class IndustryLedger:
+    """
+    Structure-of-arrays storage for a nation's industries.
+
+    Acts as a drop-in replacement for the plain list in Nation.industries:
+    appending an Industry copies its values into a new row and stores a
+    LedgerIndustry view onto that row. Income, reinvestment and IC totals are
+    then computed with one vectorized pass over the columns.
+    """
+    FLOAT_COLUMNS = ("government_ic", "private_ic", "base_profitability", "tax_rate", "subsidy_per_ic")
+    INT_COLUMNS = ("level",)
+
+    def __init__(self, capacity=16):
+        self._size = 0
+        self._industries = []
+        self._columns = {name: np.zeros(capacity, dtype=np.float64) for name in self.FLOAT_COLUMNS}
+        self._columns.update({name: np.ones(capacity, dtype=np.int64) for name in self.INT_COLUMNS})
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self._industries)
+
+    def __getitem__(self, index):
+        return self._industries[index]
+
+    def copy(self):
+        """Returns an independent ledger with the same rows."""
+        ledger = IndustryLedger.__new__(IndustryLedger)
+        ledger._size = self._size
+        ledger._columns = {name: values.copy() for name, values in self._columns.items()}
+        ledger._industries = [
+            LedgerIndustry(ledger, industry._row, industry.definition)
+            for industry in self._industries
+        ]
+        return ledger
+
+    def column(self, name):
+        """Returns a view of the live rows of a column."""
+        return self._columns[name][:self._size]
+
+    def append(self, industry):
+        """Copies an Industry into a new row and stores a view onto it."""
+        if self._size == len(self._columns["level"]):
+            self._grow()
+        row = self._size
+        self._size += 1
+        view = LedgerIndustry(self, row, industry.definition)
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS:
+            setattr(view, name, getattr(industry, name))
+        self._industries.append(view)
+        return view
+
+    def _grow(self):
+        for name, values in self._columns.items():
+            grown = np.zeros(len(values) * 2, dtype=values.dtype)
+            grown[:len(values)] = values
+            self._columns[name] = grown
+
+    def profitability(self):
+        """Effective profitability for private IC of every industry."""
+        return economy_rules.industry_profitability(self.column("base_profitability"), self.column("tax_rate"), self.column("subsidy_per_ic"))
+
+    def total_ic(self):
+        return float(self.column("government_ic").sum() + self.column("private_ic").sum())
+
+    def income(self):
+        """Returns (industrial_profit, private_reinvestment_pool) for all industries."""
+        industrial_profit, reinvestment_pool = economy_rules.industry_income(self.column("government_ic"), self.column("private_ic"),
+                                                                             self.column("base_profitability"), self.column("tax_rate"),
+                                                                             self.profitability())
+        return float(industrial_profit.sum()), float(reinvestment_pool.sum())
+
+    def reinvestment_shares(self):
+        """Share of the private reinvestment pool each industry attracts."""
+        return economy_rules.reinvestment_shares(self.profitability())
+
+    def reinvest(self, reinvestment_pool, effective_ic_cost_per_unit):
+        """Distributes the reinvestment pool as new private IC in one pass."""
+        investment = reinvestment_pool * self.reinvestment_shares()
+        cost_multiplier = economy_rules.level_cost_multiplier(self.column("level"))
+        final_ic_cost_per_unit = effective_ic_cost_per_unit * cost_multiplier
+        valid = (investment > 0) & (final_ic_cost_per_unit > 0)
+        private_ic = self.column("private_ic")
+        private_ic[valid] += investment[valid] / final_ic_cost_per_unit[valid]
@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+class ModifierRegistry:
+    """
+    Aggregated modifier totals for one nation, keyed by (stat, target).
+
+    Each source (a researched technology, an industry's level bonuses, a rune
+    or a policy) registers the modifiers it grants. Totals are updated only
+    when a source is added, changed or removed, so reading a total is a single
+    dictionary lookup.
+
+    Sources are kept as the tuples the compile functions return, which are
+    shared by every nation with the same technology or industry level, so a
+    registry holds little more than its totals.
+    """
+    __slots__ = ("_totals", "_sources")
+
+    def __init__(self):
+        self._totals = {}
+        self._sources = {}
+
+    def copy(self):
+        registry = ModifierRegistry()
+        registry._totals = dict(self._totals)
+        registry._sources = dict(self._sources)
+        return registry
+
+    def get(self, stat, target=None):
+        """Returns the total of a stat, optionally for a specific target such as a technology name."""
+        return self._totals.get((stat, target), 0.0)
+
+    def set_source(self, source, modifiers):
+        """
+        Replaces everything a source contributes.
+
+        Args:
+            source (tuple): A unique key for the source, e.g. ("technology", "Industrialization").
+            modifiers (iterable): (stat, target, value) triples granted by the source.
+        """
+        modifiers = tuple(modifiers)
+        replaced = self._sources.pop(source, ())
+        if modifiers:
+            # A replaced source moves to the end, so totals sum in order of last change.
+            self._sources[source] = modifiers
+        if not replaced:
+            # A new source adds to the end of each sum, which is the same as summing again.
+            for key, contribution in self._contributions(modifiers).items():
+                self._totals[key] = self._totals.get(key, 0) + contribution
+            return
+        affected = set(self._contributions(replaced)) | set(self._contributions(modifiers))
+        for key in affected:
+            contributions = [granted[key] for granted in map(self._contributions, self._sources.values()) if key in granted]
+            if contributions:
+                self._totals[key] = sum(contributions)
+            else:
+                self._totals.pop(key, None)
+
+    @staticmethod
+    def _contributions(modifiers):
+        """Sums a source's modifiers per (stat, target)."""
+        contributions = {}
+        for stat, target, value in modifiers:
+            contributions[(stat, target)] = contributions.get((stat, target), 0.0) + value
+        return contributions
+
+    def remove_source(self, source):
+        self.set_source(source, ())
+
+@lru_cache(maxsize=None)
+def compile_technology_modifiers(tech):
+    """Returns the (stat, target, value) modifiers a researched technology grants."""
+    modifiers = [(stat, None, value) for stat, value in tech.effects.items() if isinstance(value, (int, float))]
+    if tech.private_ic_cost_reduction:
+        modifiers.append(("private_ic_cost_reduction", None, tech.private_ic_cost_reduction))
+    return tuple(modifiers)
+
+def compile_industry_modifiers(industry):
+    """Returns the (stat, target, value) modifiers an industry's level bonuses grant at its current level."""
+    return _industry_modifiers(industry.definition, industry.level)
+
+@lru_cache(maxsize=None)
+def _industry_modifiers(definition, level):
+    modifiers = []
+    for level_bonus in definition.level_bonuses:
+        if level_bonus['level'] <= level and 'research_bonus' in level_bonus:
+            research_bonus_info = level_bonus['research_bonus']
+            modifiers.append(("research_bonus", research_bonus_info['technology_name'], research_bonus_info['bonus_per_level'] * level))
+    return tuple(modifiers)
@@ -1,85 +1,267 @@
-from src.models.project_instance import ProjectInstance
+import copy
+
+import numpy as np
+
+from src.models import economy_rules
+from src.models.construction_scheduler import ConstructionScheduler
+from src.models.modifiers import ModifierRegistry, compile_industry_modifiers, compile_technology_modifiers
+
+NOTHING_RESEARCHED = frozenset()
 
 class Nation:
-    def __init__(self, name):
+    """
+    A player or AI faction.
+
+    Only per-nation state lives here and in its slotted state objects
+    (Industry holdings, ResearchProgress, ProjectInstance). Technologies,
+    industry types and project definitions are shared records, so a nation
+    costs a few kilobytes and thousands fit in one process.
+    """
+    __slots__ = (
+        "name", "treasury", "research_points", "public_opinion", "target_public_opinion", "ledger", "industries",
+        "_industry_index", "technologies", "_researched_names", "modifiers", "current_research", "research_progress",
+        "policies", "civilian_gdp", "tax_rate", "budget", "construction_slots", "construction", "infrastructure_level",
+        "ic_focus_policy", "_owner", "_sharers",
+    )
+
+    def __init__(self, name, use_ledger=False):
         self.name = name
         self.treasury = 1000
         self.research_points = 50
         self.public_opinion = 50.0
         self.target_public_opinion = 50.0
+        self.ledger = None
         self.industries = []
+        self._industry_index = {}
+        if use_ledger:
+            from src.models.industry_ledger import IndustryLedger
+            self.ledger = IndustryLedger()
+            self.industries = self.ledger
+        # Researched Technology definitions, shared with every other nation.
         self.technologies = []
+        self._researched_names = NOTHING_RESEARCHED
+        self.modifiers = ModifierRegistry()
         self.current_research = None
+        self.research_progress = {}
         self.policies = {}
         self.civilian_gdp = 10000.0
         self.tax_rate = 0.15
         self.budget = {"social_spending": 0}
         self.construction_slots = 3
-        self.active_projects: list[ProjectInstance] = []
-        self.project_queue: list[ProjectInstance] = []
+        self.construction = ConstructionScheduler()
         self.infrastructure_level = 1
         self.ic_focus_policy = "Balanced"
+        # The GameState ownership mark of the state that may change this nation in place,
+        # and weak references to forks sharing it; see GameState.fork().
+        self._owner = None
+        self._sharers = []
         self._calculate_target_public_opinion()
 
+    def __getstate__(self):
+        # Copies and pickles share with no fork.
+        state = {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+        state["_sharers"] = []
+        return None, state
+
+    def fork(self):
+        """
+        Returns an independent copy of this nation, for a GameState taking a nation it shares with a fork.
+
+        Mutable per-nation state (industries, research progress, projects,
+        budget and policies) is copied; definitions and the researched
+        technology names are shared.
+        """
+        child = copy.copy(self)
+        if self.ledger is not None:
+            child.ledger = self.ledger.copy()
+            child.industries = child.ledger
+        else:
+            child.industries = [copy.copy(industry) for industry in self.industries]
+        child._industry_index = {industry.name: industry for industry in child.industries}
+        child.research_progress = {name: progress.copy() for name, progress in self.research_progress.items()}
+        child.technologies = list(self.technologies)
+        child.current_research = child.research_progress.get(self.current_research.name) if self.current_research else None
+        child.modifiers = self.modifiers.copy()
+        child.policies = dict(self.policies)
+        child.budget = dict(self.budget)
+        child.construction = self.construction.copy()
+        return child
+
+    @staticmethod
+    def industry_columns(nations, names):
+        """
+        Gathers industry fields of many nations into flat arrays, nation by nation in industry order.
+
+        Args:
+            nations (list[Nation]): The nations.
+            names (tuple[str]): The Industry fields to gather.
+
+        Returns:
+            tuple: (owner, columns): each industry's index in nations, and {name: numpy.ndarray}.
+        """
+        sizes = np.fromiter((len(nation.industries) for nation in nations), dtype=np.int64, count=len(nations))
+        owner = np.repeat(np.arange(len(nations)), sizes)
+        if all(nation.ledger is None for nation in nations):
+            industries = [industry for nation in nations for industry in nation.industries]
+            return owner, {name: np.fromiter((getattr(industry, name) for industry in industries), dtype=np.float64, count=len(industries))
+                           for name in names}
+
+        def column(nation, name):
+            if nation.ledger is not None:
+                return nation.ledger.column(name).astype(np.float64)
+            return np.fromiter((getattr(industry, name) for industry in nation.industries), dtype=np.float64, count=len(nation.industries))
+        return owner, {name: np.concatenate([column(nation, name) for nation in nations]) for name in names}
+
+    @staticmethod
+    def set_industry_column(nations, name, values, owner, which=None):
+        """
+        Writes a flat array from industry_columns() back to the nations' industries.
+
+        Args:
+            nations (list[Nation]): The nations, as passed to industry_columns().
+            name (str): The Industry field.
+            values (numpy.ndarray): The new values.
+            owner (numpy.ndarray): Each industry's index in nations, from industry_columns().
+            which (iterable[int], optional): Only write these nations' industries. Defaults to all.
+        """
+        starts = np.searchsorted(owner, np.arange(len(nations) + 1)).tolist()
+        for i in range(len(nations)) if which is None else which:
+            nation = nations[i]
+            chunk = values[starts[i]:starts[i + 1]]
+            if nation.ledger is not None:
+                nation.ledger.column(name)[:] = chunk
+            else:
+                for industry, value in zip(nation.industries, chunk.tolist()):
+                    setattr(industry, name, value)
+
+    @property
+    def active_projects(self):
+        """Projects in construction slots; see ConstructionScheduler."""
+        return self.construction.active
+
+    @property
+    def project_queue(self):
+        """Projects waiting for a construction slot, in queue order."""
+        return self.construction.queued
+
+    def predict_project_completions(self, turn):
+        """
+        Predicts when each active and queued project completes at the current construction rate.
+
+        Args:
+            turn (int): The current turn.
+
+        Returns:
+            dict: {handle: completion turn, or None if it never completes}.
+        """
+        return self.construction.completion_turns(turn, self.calculate_construction_points(), self.construction_slots)
+
     def _calculate_target_public_opinion(self):
-        ideal_opinion = 50.0
-        ideal_opinion += (self.budget["social_spending"] / 1000) * 100
-        ideal_opinion -= (self.tax_rate - 0.15) * 100
-        self.target_public_opinion = max(0, min(100, ideal_opinion))
+        self.target_public_opinion = economy_rules.target_public_opinion(self.budget["social_spending"], self.tax_rate)
+
+    def add_industry(self, industry):
+        """Adds an industry to the nation and returns the stored industry object."""
+        if self.ledger is not None:
+            industry = self.ledger.append(industry)
+        else:
+            self.industries.append(industry)
+        self._industry_index[industry.name] = industry
+        self.refresh_industry_modifiers(industry)
+        return industry
+
+    def refresh_industry_modifiers(self, industry):
+        """Recompiles an industry's level bonuses; call after its level changes."""
+        self.modifiers.set_source(industry.definition.modifier_source, compile_industry_modifiers(industry))
+
+    def set_industry_level(self, industry, level):
+        industry.level = level
+        self.refresh_industry_modifiers(industry)
+
+    def add_technology(self, tech):
+        """Records a researched technology and registers its effects."""
+        self.technologies.append(tech)
+        # Immutable, so forks share it.
+        self._researched_names = self._researched_names | {tech.name}
+        self.modifiers.set_source(tech.modifier_source, compile_technology_modifiers(tech))
+
+    def get_industry(self, name):
+        return self._industry_index.get(name)
+
+    def has_researched(self, tech_name):
+        return tech_name in self._researched_names
 
     @property
     def industrial_capacity(self):
+        if self.ledger is not None:
+            return self.ledger.total_ic()
         return sum(industry.ic for industry in self.industries)
 
+    def calculate_industry_income(self):
+        """Returns (industrial_profit, private_reinvestment_pool) for the current turn."""
+        if self.ledger is not None:
+            return self.ledger.income()
+        industrial_profit = 0
+        private_reinvestment_pool = 0
+        for industry in self.industries:
+            profit, reinvestment = economy_rules.industry_income(industry.government_ic, industry.private_ic, industry.base_profitability,
+                                                                 industry.tax_rate, industry.profitability)
+            industrial_profit += profit
+            private_reinvestment_pool += reinvestment
+        return industrial_profit, private_reinvestment_pool
+
+    def get_reinvestment_shares(self):
+        """Returns each industry's share of the private reinvestment pool, in industry order."""
+        if self.ledger is not None:
+            return self.ledger.reinvestment_shares()
+        profitability = np.fromiter((industry.profitability for industry in self.industries), dtype=np.float64, count=len(self.industries))
+        return economy_rules.reinvestment_shares(profitability).tolist()
+
+    def reinvest_private_profits(self, private_reinvestment_pool, effective_ic_cost_per_unit):
+        """Adds private IC to industries in proportion to their profitability."""
+        if private_reinvestment_pool <= 0:
+            return
+        if self.ledger is not None:
+            self.ledger.reinvest(private_reinvestment_pool, effective_ic_cost_per_unit)
+            return
+        for industry, share in zip(self.industries, self.get_reinvestment_shares()):
+            if share <= 0:
+                continue
+            investment_amount = private_reinvestment_pool * share
+            final_ic_cost_per_unit = effective_ic_cost_per_unit * economy_rules.level_cost_multiplier(industry.level)
+            if final_ic_cost_per_unit > 0:
+                industry.private_ic += investment_amount / final_ic_cost_per_unit
+
     def get_effective_research_points(self):
         bonus = 0
         if self.current_research:
-            for industry in self.industries:
-                for level_bonus in industry.level_bonuses:
-                    if level_bonus['level'] <= industry.level and 'research_bonus' in level_bonus:
-                        research_bonus_info = level_bonus['research_bonus']
-                        if research_bonus_info['technology_name'] == self.current_research.name:
-                            bonus += research_bonus_info['bonus_per_level'] * industry.level
-        return self.research_points * (1 + bonus)
+            bonus = self.modifiers.get("research_bonus", self.current_research.name)
+        return economy_rules.effective_research_points(self.research_points, bonus)
 
     def get_gdp_growth_rate(self):
-        final_growth_rate = 0.01
-        final_growth_rate += (self.infrastructure_level - 1) * 0.005
-        if self.public_opinion > 75:
-            final_growth_rate += 0.01
-        elif self.public_opinion < 25:
-            final_growth_rate -= 0.02
-        else:
-            final_growth_rate += 0.005
-        tech_bonus = sum(tech.effects.get("gdp_growth_modifier", 0) for tech in self.technologies if tech.is_researched)
-        final_growth_rate += tech_bonus
-        return final_growth_rate
+        return economy_rules.gdp_growth_rate(self.infrastructure_level, self.public_opinion, self.modifiers.get("gdp_growth_modifier"))
 
     def calculate_construction_points(self):
-        total_ic = self.industrial_capacity
-        ic_focus_modifier = 0.8 if self.ic_focus_policy == "Infrastructure_Focus" else 0.5
-        cp_from_ic = total_ic * ic_focus_modifier * 0.1
-        tech_bonus = 0  # TODO: Implement technology bonus for CP
-        return 5 + cp_from_ic + tech_bonus
-
-    def calculate_projected_treasury_change(self, available_projects):
-        """Calculates the projected treasury change for the next turn."""
+        # TODO: Implement technology bonus for CP
+        return economy_rules.construction_points(self.industrial_capacity, self.ic_focus_policy == economy_rules.INFRASTRUCTURE_FOCUS)
+
+    def calculate_upkeep_costs(self):
+        return self.construction.active_upkeep()
+
+    def calculate_projected_treasury_change(self, available_projects=None):
+        """Calculates the projected treasury change for the next turn.
+
+        Project upkeep comes from the definitions the active projects point to;
+        available_projects is accepted for backwards compatibility.
+        """
         # Income
-        industrial_profit = sum(
-            (ind.government_ic * ind.base_profitability * 0.8) + (ind.private_ic * ind.profitability * ind.tax_rate)
-            for ind in self.industries
-        )
+        industrial_profit, _ = self.calculate_industry_income()
         projected_gdp = self.civilian_gdp * (1 + self.get_gdp_growth_rate())
         tax_revenue = projected_gdp * self.tax_rate
         total_income = industrial_profit + tax_revenue
 
         # Expenses
         social_spending = self.budget["social_spending"]
-        upkeep_costs = sum(
-            p_def['upkeep_cost']
-            for proj in self.active_projects
-            if (p_def := next((p for p in available_projects if p['id'] == proj.project_id), None))
-        )
+        upkeep_costs = self.calculate_upkeep_costs()
         total_expenses = social_spending + upkeep_costs
 
         return total_income - total_expenses
\ No newline at end of file
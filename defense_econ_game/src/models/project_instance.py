@@ -1,5 +1,10 @@
 class ProjectInstance:
-    def __init__(self, project_id: str, target: str = None):
+    __slots__ = ("project_id", "definition", "current_cp", "target", "handle")
+
+    def __init__(self, project_id: str, target: str = None, definition=None):
         self.project_id = project_id
+        self.definition = definition
         self.current_cp = 0
         self.target = target
+        # Assigned by the nation's ConstructionScheduler.
+        self.handle = None
@@ -1,2 +1,13 @@
-class Rune:
-    pass
\ No newline at end of file
+from src.models.catalog import Record
+
+class Rune(Record):
+    """
+    A rune woven into a component.
+
+    Every combat round a unit uses its runes, they add their damage bonus to
+    its attack and their stress to its Aetheric Stress bar.
+    """
+    __slots__ = ("name", "damage_bonus", "stress_per_round")
+
+    def __init__(self, name, damage_bonus=0.0, stress_per_round=0.0):
+        self._set(name=name, damage_bonus=damage_bonus, stress_per_round=stress_per_round)
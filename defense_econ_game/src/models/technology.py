@@ -1,10 +1,39 @@
-class Technology:
-    def __init__(self, name, rp_cost, unlocks_industries=None, private_ic_cost_reduction=0.0, effects=None):
-        self.name = name
-        self.rp_cost = rp_cost
-        self.rp_progress = 0
+from src.models.catalog import Record
+
+class Technology(Record):
+    """The shared definition of a technology. Per-nation progress lives in ResearchProgress."""
+    __slots__ = ("name", "rp_cost", "unlocks_industries", "unlocked_industries", "private_ic_cost_reduction", "effects", "modifier_source")
+
+    def __init__(self, name, rp_cost, unlocks_industries=None, private_ic_cost_reduction=0.0, effects=None, unlocked_industries=()):
+        self._set(
+            name=name,
+            rp_cost=rp_cost,
+            unlocks_industries=unlocks_industries if unlocks_industries is not None else [],
+            # The IndustryType definitions of unlocks_industries, resolved when the data is compiled.
+            unlocked_industries=tuple(unlocked_industries),
+            private_ic_cost_reduction=private_ic_cost_reduction,
+            effects=effects if effects is not None else {},
+            modifier_source=("technology", name),
+        )
+
+class ResearchProgress:
+    """A nation's progress towards one technology."""
+    __slots__ = ("definition", "rp_progress", "is_researched")
+
+    def __init__(self, definition, rp_progress=0):
+        self.definition = definition
+        self.rp_progress = rp_progress
         self.is_researched = False
-        self.unlocks_industries = unlocks_industries if unlocks_industries is not None else []
-        self.private_ic_cost_reduction = private_ic_cost_reduction
-        self.effects = effects if effects is not None else {}
-        self.private_ic_cost_reduction = private_ic_cost_reduction
+
+    @property
+    def name(self):
+        return self.definition.name
+
+    @property
+    def rp_cost(self):
+        return self.definition.rp_cost
+
+    def copy(self):
+        progress = ResearchProgress(self.definition, self.rp_progress)
+        progress.is_researched = self.is_researched
+        return progress
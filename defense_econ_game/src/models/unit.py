@@ -1,2 +1,24 @@
-class Unit:
-    pass
\ No newline at end of file
+from src.models.catalog import Record
+
+class Unit(Record):
+    """
+    A unit design: a chassis's base stats plus the sum of its components.
+
+    Units are shared like other definitions; the hit points, stress and
+    status of units in a fight live in the combat resolver's arrays.
+    """
+    __slots__ = ("name", "components", "hp", "armor", "damage", "stress_capacity", "damage_bonus", "stress_per_round")
+
+    def __init__(self, name, components=(), hp=100.0, armor=0.0, damage=0.0, stress_capacity=0.0):
+        components = tuple(components)
+        runes = [rune for component in components for rune in component.runes]
+        self._set(
+            name=name,
+            components=components,
+            hp=hp + sum(component.hp for component in components),
+            armor=armor + sum(component.armor for component in components),
+            damage=damage + sum(component.damage for component in components),
+            stress_capacity=stress_capacity + sum(component.stress_capacity for component in components),
+            damage_bonus=sum(rune.damage_bonus for rune in runes),
+            stress_per_round=sum(rune.stress_per_round for rune in runes),
+        )
@@ -0,0 +1,442 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import uuid
+
+import numpy as np
+
+from src.models.game_state import GameState
+from src.models.nation import Nation
+from src.models.industry import Industry
+from src.models.technology import ResearchProgress
+from src.models.project_instance import ProjectInstance
+from src.models.event_index import EventIndex
+from src.models.arms_market import BUY, SELL, MarketOrder
+
+SAVE_DIR = "saves"
+MAGIC = b"DEGS"
+FORMAT_VERSION = 1
+FULL_SNAPSHOT = 0
+DELTA_SNAPSHOT = 1
+ALIGNMENT = 64
+# magic, format version, snapshot kind, header length
+PREAMBLE = struct.Struct("<4sHBxI")
+
+NATION_FLOAT_FIELDS = ("treasury", "research_points", "public_opinion", "target_public_opinion", "civilian_gdp", "tax_rate")
+NATION_INT_FIELDS = ("construction_slots", "infrastructure_level")
+INDUSTRY_FLOAT_FIELDS = ("government_ic", "private_ic", "base_profitability", "tax_rate", "subsidy_per_ic")
+INDUSTRY_INT_FIELDS = ("level",)
+
+class Snapshot:
+    """
+    A GameState flattened into a JSON structure and a set of numeric arrays.
+
+    Attributes:
+        structure (dict): Names, per-nation research state, policies and other
+            non-bulk fields.
+        arrays (dict): Bulk numeric fields as numpy arrays; after loading from
+            disk these are read-only views onto the memory-mapped file.
+        snapshot_id (str): Unique id, referenced by delta snapshots.
+    """
+    def __init__(self, structure, arrays, snapshot_id=None):
+        self.structure = structure
+        self.arrays = arrays
+        self.snapshot_id = snapshot_id or uuid.uuid4().hex
+
+def capture(game_state):
+    """
+    Flattens a GameState into a Snapshot.
+
+    Definitions are not stored; they are referenced by id or name and resolved
+    against the catalogs of the game the snapshot is restored into.
+    """
+    nations = game_state.read_nations()
+    industry_names = list(game_state.all_industries.keys())
+    industry_name_index = {name: i for i, name in enumerate(industry_names)}
+    project_ids = list(game_state.available_projects.keys())
+    project_id_index = {project_id: i for i, project_id in enumerate(project_ids)}
+
+    arrays = {}
+    for field in NATION_FLOAT_FIELDS:
+        arrays[f"nation.{field}"] = np.fromiter((getattr(n, field) for n in nations), dtype=np.float64, count=len(nations))
+    for field in NATION_INT_FIELDS:
+        arrays[f"nation.{field}"] = np.fromiter((getattr(n, field) for n in nations), dtype=np.int64, count=len(nations))
+
+    industries = [(i, industry) for i, nation in enumerate(nations) for industry in nation.industries]
+    arrays["industry.nation"] = np.fromiter((i for i, _ in industries), dtype=np.int32, count=len(industries))
+    arrays["industry.name"] = np.fromiter((industry_name_index[ind.name] for _, ind in industries), dtype=np.int32, count=len(industries))
+    for field in INDUSTRY_FLOAT_FIELDS:
+        arrays[f"industry.{field}"] = np.fromiter((getattr(ind, field) for _, ind in industries), dtype=np.float64, count=len(industries))
+    for field in INDUSTRY_INT_FIELDS:
+        arrays[f"industry.{field}"] = np.fromiter((getattr(ind, field) for _, ind in industries), dtype=np.int64, count=len(industries))
+
+    projects = [
+        (i, project, queued)
+        for i, nation in enumerate(nations)
+        for queued, project_list in ((0, nation.active_projects), (1, nation.project_queue))
+        for project in project_list
+    ]
+    arrays["project.nation"] = np.fromiter((i for i, _, _ in projects), dtype=np.int32, count=len(projects))
+    arrays["project.queued"] = np.fromiter((queued for _, _, queued in projects), dtype=np.uint8, count=len(projects))
+    arrays["project.definition"] = np.fromiter((project_id_index.get(p.project_id, -1) for _, p, _ in projects), dtype=np.int32, count=len(projects))
+    arrays["project.target"] = np.fromiter((industry_name_index.get(p.target, -1) for _, p, _ in projects), dtype=np.int32, count=len(projects))
+    arrays["project.current_cp"] = np.fromiter((p.current_cp for _, p, _ in projects), dtype=np.float64, count=len(projects))
+    arrays["project.handle"] = np.fromiter((p.handle for _, p, _ in projects), dtype=np.int64, count=len(projects))
+
+    market, market_arrays = _capture_market(game_state.market)
+    arrays.update(market_arrays)
+
+    structure = {
+        "turn": game_state.turn,
+        "seed": game_state.seed,
+        "crisis_awareness": game_state.crisis_awareness,
+        "social_dissonance": game_state.social_dissonance,
+        "pending_events": [event.name for event in game_state.available_events],
+        "industry_names": industry_names,
+        "project_ids": project_ids,
+        "has_player": game_state.has_player_nation,
+        "nations": [_capture_nation(nation) for nation in nations],
+        "market": market,
+    }
+    return Snapshot(structure, arrays)
+
+def state_hash(game_state):
+    """
+    Returns a canonical hash of everything a snapshot of the state records.
+
+    States with equal contents hash equally however they were reached, so the
+    hash can key caches of evaluated states.
+    """
+    snapshot = capture(game_state)
+    digest = hashlib.blake2b(json.dumps(snapshot.structure, sort_keys=True, separators=(",", ":")).encode(), digest_size=16)
+    for name in sorted(snapshot.arrays):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(snapshot.arrays[name]).tobytes())
+    return digest.hexdigest()
+
+def _capture_market(market):
+    """Flattens the arms market: its orders into arrays, holdings and leases into the structure."""
+    entries = market.entries()
+    items = list(dict.fromkeys(order.item for order, _, _ in entries))
+    item_index = {item: i for i, item in enumerate(items)}
+    names = list(dict.fromkeys(order.nation for order, _, _ in entries))
+    name_index = {name: i for i, name in enumerate(names)}
+    count = len(entries)
+    arrays = {
+        "order.id": np.fromiter((order.order_id for order, _, _ in entries), dtype=np.int64, count=count),
+        "order.nation": np.fromiter((name_index[order.nation] for order, _, _ in entries), dtype=np.int32, count=count),
+        "order.item": np.fromiter((item_index[order.item] for order, _, _ in entries), dtype=np.int32, count=count),
+        "order.buy": np.fromiter((order.side == BUY for order, _, _ in entries), dtype=np.uint8, count=count),
+        "order.quantity": np.fromiter((order.quantity for order, _, _ in entries), dtype=np.int64, count=count),
+        "order.remaining": np.fromiter((remaining for _, remaining, _ in entries), dtype=np.int64, count=count),
+        "order.price": np.fromiter((order.price for order, _, _ in entries), dtype=np.float64, count=count),
+        "order.turn": np.fromiter((order.turn for order, _, _ in entries), dtype=np.int64, count=count),
+        "order.expires": np.fromiter((-1 if order.expires is None else order.expires for order, _, _ in entries), dtype=np.int64, count=count),
+        "order.pending": np.fromiter((pending for _, _, pending in entries), dtype=np.uint8, count=count),
+    }
+    structure = {
+        "next_order_id": market.next_order_id,
+        "items": items,
+        "nations": names,
+        "holdings": {nation: dict(held) for nation, held in market.holdings.items()},
+        "leases": [[nation, design, last] for (nation, design), last in market.leases.items()],
+        "last_prices": dict(market.last_prices),
+    }
+    return structure, arrays
+
+def _restore_market(market, structure, arrays):
+    items = structure["items"]
+    names = structure["nations"]
+    rows = zip(*(arrays[f"order.{field}"].tolist() for field in ("id", "nation", "item", "buy", "quantity", "remaining", "price", "turn", "expires", "pending")))
+    for order_id, nation, item, buy, quantity, remaining, price, turn, expires, pending in rows:
+        order = MarketOrder(order_id, names[nation], BUY if buy else SELL, items[item], quantity, price, turn, None if expires < 0 else expires)
+        market.restore(order, remaining, bool(pending))
+    market.next_order_id = structure["next_order_id"]
+    market.holdings = {nation: dict(held) for nation, held in structure["holdings"].items()}
+    market.leases = {(nation, design): last for nation, design, last in structure["leases"]}
+    market.last_prices = dict(structure["last_prices"])
+
+def _capture_nation(nation):
+    return {
+        "name": nation.name,
+        "use_ledger": nation.ledger is not None,
+        "technologies": [tech.name for tech in nation.technologies],
+        "research_progress": {name: tech.rp_progress for name, tech in nation.research_progress.items()},
+        "current_research": nation.current_research.name if nation.current_research else None,
+        "budget": dict(nation.budget),
+        "policies": dict(nation.policies),
+        "ic_focus_policy": nation.ic_focus_policy,
+        "next_project_handle": nation.construction.next_handle,
+    }
+
+def restore(snapshot, game):
+    """
+    Rebuilds a GameState from a Snapshot.
+
+    Args:
+        snapshot (Snapshot): The snapshot to restore.
+        game (Game): A freshly constructed game whose catalogs and events provide the definitions.
+
+    Returns:
+        GameState: The restored state.
+    """
+    structure = snapshot.structure
+    arrays = snapshot.arrays
+    template = game.game_state
+    game_state = GameState()
+    game_state.available_technologies = template.available_technologies
+    game_state.all_industries = template.all_industries
+    game_state.available_projects = template.available_projects
+    for field in ("turn", "seed", "crisis_awareness", "social_dissonance"):
+        setattr(game_state, field, structure[field])
+    pending = set(structure["pending_events"])
+    game_state.available_events = EventIndex([event for event in template.available_events if event.name in pending] + list(template.available_events.stochastic))
+
+    nations = [_restore_nation(data, game_state) for data in structure["nations"]]
+    for field in NATION_FLOAT_FIELDS + NATION_INT_FIELDS:
+        for nation, value in zip(nations, arrays[f"nation.{field}"].tolist()):
+            setattr(nation, field, value)
+
+    industry_names = structure["industry_names"]
+    columns = {field: arrays[f"industry.{field}"].tolist() for field in INDUSTRY_FLOAT_FIELDS + INDUSTRY_INT_FIELDS}
+    for row, (nation_index, name_index) in enumerate(zip(arrays["industry.nation"].tolist(), arrays["industry.name"].tolist())):
+        definition = template.all_industries.get(industry_names[name_index])
+        industry = Industry.of(definition)
+        for field, values in columns.items():
+            setattr(industry, field, values[row])
+        nations[nation_index].add_industry(industry)
+
+    project_ids = structure["project_ids"]
+    # Saves from before project handles were stored number each nation's projects in order.
+    handles = arrays["project.handle"].tolist() if "project.handle" in arrays else [None] * len(arrays["project.nation"])
+    project_rows = zip(
+        arrays["project.nation"].tolist(), arrays["project.queued"].tolist(), arrays["project.definition"].tolist(),
+        arrays["project.target"].tolist(), arrays["project.current_cp"].tolist(), handles,
+    )
+    for nation_index, queued, definition_index, target_index, current_cp, handle in project_rows:
+        project_id = project_ids[definition_index] if definition_index >= 0 else None
+        target = industry_names[target_index] if target_index >= 0 else None
+        project = ProjectInstance(project_id, target, template.available_projects.get(project_id))
+        project.current_cp = current_cp
+        project.handle = handle
+        nations[nation_index].construction.restore(project, queued)
+
+    # Saves from before the arms market have no market.
+    if "market" in structure:
+        _restore_market(game_state.market, structure["market"], arrays)
+
+    if structure["has_player"]:
+        game_state.player_nation = nations[0]
+        game_state.ai_nations = nations[1:]
+    else:
+        game_state.ai_nations = nations
+    return game_state
+
+def _restore_nation(data, game_state):
+    nation = Nation(data["name"], use_ledger=data["use_ledger"])
+    nation.budget = dict(data["budget"])
+    nation.policies = dict(data["policies"])
+    nation.ic_focus_policy = data["ic_focus_policy"]
+    nation.construction.next_handle = data.get("next_project_handle", 0)
+    technologies = game_state.available_technologies
+    for name, rp_progress in data["research_progress"].items():
+        nation.research_progress[name] = ResearchProgress(technologies.get(name), rp_progress)
+    for name in data["technologies"]:
+        if name in nation.research_progress:
+            nation.research_progress[name].is_researched = True
+        nation.add_technology(technologies.get(name))
+    if data["current_research"]:
+        nation.current_research = nation.research_progress[data["current_research"]]
+    return nation
+
+def diff(base, snapshot):
+    """
+    Returns a delta Snapshot holding only what changed in snapshot since base.
+
+    Arrays whose shape is unchanged are stored as changed indices and values;
+    arrays that grew or shrank are stored whole. Only changed nation entries
+    and top-level structure fields are kept.
+    """
+    arrays = {}
+    for name, values in snapshot.arrays.items():
+        base_values = base.arrays.get(name)
+        if base_values is None or base_values.shape != values.shape:
+            arrays[f"{name}#full"] = values
+            continue
+        changed = np.flatnonzero(base_values != values)
+        if len(changed):
+            arrays[f"{name}#index"] = changed.astype(np.int64)
+            arrays[f"{name}#value"] = values[changed]
+
+    base_nations = base.structure["nations"]
+    structure = {key: value for key, value in snapshot.structure.items() if key != "nations" and base.structure.get(key) != value}
+    structure["nation_count"] = len(snapshot.structure["nations"])
+    structure["nations"] = {
+        str(i): nation for i, nation in enumerate(snapshot.structure["nations"])
+        if i >= len(base_nations) or base_nations[i] != nation
+    }
+    return Snapshot(structure, arrays, snapshot.snapshot_id)
+
+def apply_delta(base, delta):
+    """Rebuilds the full Snapshot that a delta was taken from."""
+    arrays = {}
+    for name, base_values in base.arrays.items():
+        if f"{name}#full" in delta.arrays:
+            arrays[name] = delta.arrays[f"{name}#full"]
+        elif f"{name}#index" in delta.arrays:
+            values = np.array(base_values)
+            values[delta.arrays[f"{name}#index"]] = delta.arrays[f"{name}#value"]
+            arrays[name] = values
+        else:
+            arrays[name] = base_values
+    for key, values in delta.arrays.items():
+        name, _, kind = key.partition("#")
+        if kind == "full" and name not in arrays:
+            arrays[name] = values
+
+    structure = dict(base.structure)
+    structure.update({key: value for key, value in delta.structure.items() if key not in ("nations", "nation_count")})
+    nations = list(base.structure["nations"][:delta.structure["nation_count"]])
+    for index, nation in delta.structure["nations"].items():
+        index = int(index)
+        if index < len(nations):
+            nations[index] = nation
+        else:
+            nations.append(nation)
+    structure["nations"] = nations
+    return Snapshot(structure, arrays, delta.snapshot_id)
+
+def write_snapshot(snapshot, path, base=None):
+    """
+    Writes a snapshot to a versioned binary file.
+
+    The file is a fixed preamble, a JSON header describing the structure and
+    the array layout, then each array as raw little-endian bytes aligned to 64
+    bytes so it can be memory-mapped directly.
+
+    Args:
+        snapshot (Snapshot): The snapshot, or delta from diff(), to write.
+        path (str): The destination file.
+        base (Snapshot, optional): For deltas, the full snapshot they apply to.
+    """
+    layout = {}
+    offset = 0
+    for name, values in snapshot.arrays.items():
+        values = np.ascontiguousarray(values)
+        offset = _align(offset)
+        layout[name] = {"dtype": values.dtype.newbyteorder("<").str, "shape": list(values.shape), "offset": offset}
+        offset += values.nbytes
+    header = {
+        "snapshot_id": snapshot.snapshot_id,
+        "base_id": base.snapshot_id if base is not None else None,
+        "structure": snapshot.structure,
+        "arrays": layout,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _align(PREAMBLE.size + len(header_bytes))
+    kind = DELTA_SNAPSHOT if base is not None else FULL_SNAPSHOT
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, kind, len(header_bytes)))
+        f.write(header_bytes)
+        for name, values in snapshot.arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(values, dtype=layout[name]["dtype"]).tobytes())
+        # Pad to the end of the data section so empty trailing arrays can still be mapped.
+        f.truncate(max(f.tell(), data_start + offset))
+
+def read_snapshot(path, base=None):
+    """
+    Reads a snapshot file, memory-mapping its arrays.
+
+    Args:
+        path (str): The snapshot file.
+        base (Snapshot, optional): The full snapshot a delta file applies to.
+
+    Returns:
+        Snapshot: The full snapshot; deltas are applied to base.
+
+    Raises:
+        ValueError: If the file is not a snapshot, has a newer format version,
+            or is a delta whose base is missing or does not match.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, kind, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a saved game")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"{path} uses save format {version}; this version reads up to {FORMAT_VERSION}")
+    header = json.loads(buffer[PREAMBLE.size:PREAMBLE.size + header_length])
+    data_start = _align(PREAMBLE.size + header_length)
+    arrays = {
+        name: np.frombuffer(buffer, dtype=spec["dtype"], count=int(np.prod(spec["shape"])), offset=data_start + spec["offset"]).reshape(spec["shape"])
+        for name, spec in header["arrays"].items()
+    }
+    snapshot = Snapshot(header["structure"], arrays, header["snapshot_id"])
+    if kind == FULL_SNAPSHOT:
+        return snapshot
+    if base is None or base.snapshot_id != header["base_id"]:
+        raise ValueError(f"{path} is a delta checkpoint and needs its base snapshot {header['base_id']}")
+    return apply_delta(base, snapshot)
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def save_game(game_state, path):
+    """
+    Saves a full binary snapshot of a GameState.
+
+    Returns:
+        Snapshot: The snapshot written, usable as the base of later delta checkpoints.
+    """
+    snapshot = capture(game_state)
+    write_snapshot(snapshot, path)
+    return snapshot
+
+def save_checkpoint(game_state, path, base):
+    """
+    Saves a delta checkpoint storing only what changed since the base snapshot.
+
+    Args:
+        game_state (GameState): The state to save.
+        path (str): The destination file.
+        base (Snapshot): The last full snapshot, as returned by save_game or load_snapshot.
+    """
+    write_snapshot(diff(base, capture(game_state)), path, base=base)
+
+def load_snapshot(path, base=None):
+    return read_snapshot(path, base)
+
+def load_game(path, game, base=None):
+    """
+    Loads a saved GameState.
+
+    Args:
+        path (str): A full snapshot or, together with base, a delta checkpoint.
+        game (Game): A freshly constructed game providing the definitions.
+        base (Snapshot, optional): The full snapshot a delta checkpoint applies to.
+    """
+    return restore(read_snapshot(path, base), game)
+
+def export_json(game_state, path):
+    """Writes a human-readable JSON version of a GameState for debugging."""
+    snapshot = capture(game_state)
+    document = {
+        "format_version": FORMAT_VERSION,
+        "structure": snapshot.structure,
+        "arrays": {name: {"dtype": values.dtype.str, "values": values.tolist()} for name, values in snapshot.arrays.items()},
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+def import_json(path, game):
+    """Loads a GameState written by export_json."""
+    with open(path) as f:
+        document = json.load(f)
+    arrays = {name: np.array(array["values"], dtype=array["dtype"]) for name, array in document["arrays"].items()}
+    return restore(Snapshot(document["structure"], arrays), game)
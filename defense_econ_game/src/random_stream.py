@@ -0,0 +1,51 @@
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+# SplitMix64 constants.
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_MASK = (1 << 64) - 1
+
+@lru_cache(maxsize=None)
+def stream_key(name):
+    """
+    Returns a stable 64-bit key for a name, such as a nation or event name.
+
+    Unlike hash(), the key is the same in every process and every run.
+    """
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little")
+
+def _mix(x):
+    """The SplitMix64 finalizer: a bijective scramble of uint64 values."""
+    x = np.asarray(x, dtype=np.uint64) + _GAMMA
+    x = (x ^ (x >> np.uint64(30))) * _MIX1
+    x = (x ^ (x >> np.uint64(27))) * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+def uniforms(seed, turn, nation_keys, event_keys):
+    """
+    Draws one uniform number in [0, 1) for every (nation, event) pair of a turn.
+
+    The generator is counter-based: each number is a hash of (seed, turn,
+    nation key, event key) and nothing else. No state is carried between
+    draws, so a nation's draws are the same whichever other nations are in
+    the batch, whichever process evaluates them and in whatever order.
+
+    Args:
+        seed (int): The game seed.
+        turn (int): The turn being drawn for.
+        nation_keys (numpy.ndarray): uint64 keys of the nations, from stream_key.
+        event_keys (numpy.ndarray): uint64 keys of the events, from stream_key.
+
+    Returns:
+        numpy.ndarray: A (nations, events) float64 array.
+    """
+    with np.errstate(over="ignore"):
+        base = _mix(_mix(seed & _MASK) ^ np.uint64(turn & _MASK))
+        per_nation = _mix(base ^ np.asarray(nation_keys, dtype=np.uint64))
+        bits = _mix(per_nation[:, None] ^ np.asarray(event_keys, dtype=np.uint64)[None, :])
+    # The top 53 bits give every double in [0, 1) at a spacing of 2**-53.
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
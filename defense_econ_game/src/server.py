@@ -0,0 +1,407 @@
+"""Serves many concurrent games over a local socket with a newline-delimited JSON protocol.
+
+Run from the defense_econ_game directory:
+
+    python -m src.server --port 8765 --workers 4
+
+Every request is one JSON object per line:
+
+    {"id": 1, "type": "new_session", "payload": {"num_ai_nations": 10, "ai": true, "seed": 7}}
+    {"id": 2, "session": "<id>", "type": "research", "payload": "Industrialization"}
+    {"id": 3, "session": "<id>", "type": "end_turn"}
+    {"id": 4, "session": "<id>", "type": "state"}
+    {"id": 5, "session": "<id>", "type": "close_session"}
+
+type and payload are those of Command, plus the server requests new_session,
+state, advance_until ({"turn": n}) and close_session. Every response echoes the
+request id: {"id": 3, "ok": true, "result": {"turn": 1}} or
+{"id": 3, "ok": false, "error": "..."}.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.game import Game
+from src.commands import Command
+from src.controller.ai_controller import AIController
+from src import persistence
+from src.game_log import configure_logging, get_logger
+
+server_log = get_logger("server")
+
+# Commands that run a whole end of turn and are moved off the event loop.
+HEAVY_COMMANDS = ("end_turn", "advance_until")
+# Commands applied to the game on the event loop.
+LIGHT_COMMANDS = ("research", "policy", "set_tax", "budget", "construction", "market")
+
+# Template games of a worker process, keyed by session settings, see _process_turns.
+_WORKER_GAMES = {}
+
+class ServerError(Exception):
+    """An invalid request; its message is sent back to the client."""
+
+def _create_game(settings):
+    return Game(
+        test_mode=True,
+        use_ledger=settings.get("use_ledger", False),
+        num_ai_nations=settings.get("num_ai_nations", 0),
+        data_dir=settings.get("data_dir"),
+        ai_controller=AIController() if settings.get("ai") else None,
+        seed=settings.get("seed", 0),
+    )
+
+def _run_heavy(game, command):
+    if command.type == "advance_until":
+        game.advance_until(turn=command.payload["turn"])
+    else:
+        game.process_command(command)
+
+def _process_turns(settings, snapshot, command):
+    """Runs a heavy command in a worker process on a state shipped as a persistence snapshot."""
+    key = json.dumps(settings, sort_keys=True)
+    game = _WORKER_GAMES.get(key)
+    if game is None:
+        game = _WORKER_GAMES[key] = _create_game(settings)
+    game.game_state = persistence.restore(snapshot, game)
+    _run_heavy(game, command)
+    return persistence.capture(game.game_state)
+
+class Session:
+    """
+    One hosted game.
+
+    Requests for a session are queued and handled one at a time, in order, by
+    the session's own task, so sessions progress independently.
+
+    Attributes:
+        session_id (str): The id clients address the session by.
+        game (Game): The hosted game.
+        settings (dict): The new_session payload the game was created with.
+        queue (asyncio.Queue): Requests waiting to be handled.
+        last_active (float): time.monotonic() of the last handled request.
+    """
+    def __init__(self, session_id, game, settings, max_pending):
+        self.session_id = session_id
+        self.game = game
+        self.settings = settings
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.last_active = time.monotonic()
+        self.busy = False
+        self.task = None
+
+class GameServer:
+    """
+    An asyncio server hosting many Game sessions.
+
+    Light commands (research, policy, tax, budget, construction, market, state) run
+    on the event loop. end_turn and advance_until run on a worker pool, so a
+    slow turn in one session does not hold up the others. With processes, the
+    state travels to and from the worker as a persistence snapshot.
+
+    Each session accepts at most max_pending queued requests. When a session's
+    queue is full, the server stops reading from that connection until the
+    session catches up, which pushes back on the client through the socket.
+    Sessions idle for idle_timeout seconds are evicted; with save_dir they are
+    saved first and restored transparently on their next request.
+
+    Attributes:
+        sessions (dict): Live sessions by id.
+        address (tuple): (host, port) the server listens on once started.
+    """
+    def __init__(self, host="127.0.0.1", port=0, max_workers=None, use_processes=False, max_pending=32,
+                 idle_timeout=600.0, save_dir=None, data_dir=None):
+        """
+        Initializes the GameServer.
+
+        Args:
+            host (str, optional): The interface to listen on. Defaults to localhost.
+            port (int, optional): The port; 0 picks a free one. Defaults to 0.
+            max_workers (int, optional): Worker pool size. Defaults to the CPU count.
+            use_processes (bool, optional): Run turns in worker processes instead of threads. Defaults to False.
+            max_pending (int, optional): Queued requests allowed per session. Defaults to 32.
+            idle_timeout (float, optional): Seconds without requests before a session is evicted. Defaults to 600.
+            save_dir (str, optional): Where evicted sessions are saved. Defaults to None (discarded).
+            data_dir (str, optional): The game data directory of every session; clients cannot choose another. Defaults to DATA_DIR.
+        """
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.idle_timeout = idle_timeout
+        self.save_dir = save_dir
+        self.data_dir = data_dir
+        self.use_processes = use_processes
+        max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers) if use_processes else ThreadPoolExecutor(max_workers)
+        self.sessions = {}
+        self.address = None
+        self._server = None
+        self._evictor = None
+        self._connections = {}
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.address = self._server.sockets[0].getsockname()[:2]
+        self._evictor = asyncio.create_task(self._evict_idle_sessions())
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._evictor.cancel()
+        self._server.close()
+        for session in list(self.sessions.values()):
+            session.task.cancel()
+            # Frees connections waiting on a full queue so they see their socket close.
+            while not session.queue.empty():
+                session.queue.get_nowait()
+        self.sessions.clear()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle_connection(self, reader, writer):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while line := await reader.readline():
+                request = {}
+                try:
+                    parsed = json.loads(line)
+                    if not isinstance(parsed, dict):
+                        raise ServerError("A request must be a JSON object")
+                    request = parsed
+                    if request.get("type") == "new_session":
+                        settings = request.get("payload") or {}
+                        if "data_dir" in settings:
+                            raise ServerError("Sessions use the server's game data; data_dir cannot be set")
+                        session = self._new_session(settings)
+                        await self._respond(writer, request, result={"session": session.session_id, "turn": session.game.game_state.turn})
+                        continue
+                    session = self._get_session(request.get("session"))
+                except (ServerError, ValueError, KeyError, TypeError) as error:
+                    # A line that is not a JSON object gets an error with no id.
+                    await self._respond(writer, request, error=str(error))
+                    continue
+                # Waits while the session's queue is full, so this connection is not read any further.
+                await session.queue.put((request, writer))
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+    def _new_session(self, settings, session_id=None, game=None):
+        settings = dict(settings)
+        # Game data always comes from the server's own directory, never from a client.
+        settings.pop("data_dir", None)
+        if self.data_dir is not None:
+            settings["data_dir"] = self.data_dir
+        session = Session(session_id or uuid.uuid4().hex, game or _create_game(settings), settings, self.max_pending)
+        session.task = asyncio.create_task(self._run_session(session))
+        self.sessions[session.session_id] = session
+        return session
+
+    def _get_session(self, session_id):
+        if not isinstance(session_id, str):
+            raise ServerError(f"Unknown session: {session_id}")
+        session = self.sessions.get(session_id)
+        if session is not None:
+            return session
+        path = self._save_path(session_id) if session_id else None
+        if path and os.path.exists(path):
+            with open(path + ".json") as f:
+                settings = json.load(f)
+            game = _create_game(settings)
+            game.game_state = persistence.load_game(path, game)
+            return self._new_session(settings, session_id, game)
+        raise ServerError(f"Unknown session: {session_id}")
+
+    def _save_path(self, session_id):
+        if self.save_dir is None or not session_id.isalnum():
+            return None
+        return os.path.join(self.save_dir, f"{session_id}.sav")
+
+    async def _run_session(self, session):
+        while True:
+            request, writer = await session.queue.get()
+            session.busy = True
+            try:
+                try:
+                    result = await self._execute(session, request)
+                except Exception as error:
+                    server_log.warning("Request %s of session %s failed: %s", request.get("type"), session.session_id, error,
+                                       extra={"session": session.session_id, "request": request.get("type")})
+                    await self._respond(writer, request, error=f"{type(error).__name__}: {error}")
+                else:
+                    await self._respond(writer, request, result=result)
+            except OSError as error:
+                # The client went away; the session keeps serving its queue and other connections.
+                server_log.info("Could not answer request %s of session %s: %s", request.get("type"), session.session_id, error,
+                                extra={"session": session.session_id, "request": request.get("type")})
+            finally:
+                session.busy = False
+                session.last_active = time.monotonic()
+                session.queue.task_done()
+
+    async def _execute(self, session, request):
+        command_type = request.get("type")
+        payload = request.get("payload")
+        game = session.game
+        if command_type == "state":
+            return game.get_view_model().to_dict()
+        if command_type == "close_session":
+            self._remove_session(session)
+            return {"closed": session.session_id}
+        if command_type not in HEAVY_COMMANDS and command_type not in LIGHT_COMMANDS:
+            raise ServerError(f"Unknown command: {command_type}")
+        if command_type in HEAVY_COMMANDS:
+            if command_type == "advance_until" and not isinstance(payload, dict):
+                raise ServerError("advance_until needs a payload of {\"turn\": n}")
+            command = Command(command_type, payload)
+            loop = asyncio.get_running_loop()
+            if self.use_processes:
+                snapshot = persistence.capture(game.game_state)
+                snapshot = await loop.run_in_executor(self.executor, _process_turns, session.settings, snapshot, command)
+                game.game_state = persistence.restore(snapshot, game)
+            else:
+                await loop.run_in_executor(self.executor, _run_heavy, game, command)
+        else:
+            game.process_command(Command(command_type, payload))
+        return {"turn": game.game_state.turn}
+
+    def _remove_session(self, session):
+        self.sessions.pop(session.session_id, None)
+        # A session closing itself is still running its own task; it ends when the task next waits.
+        if session.task is not asyncio.current_task():
+            session.task.cancel()
+        else:
+            session.task.get_loop().call_soon(session.task.cancel)
+
+    def evict_idle_sessions(self, now=None):
+        """
+        Evicts every session idle for longer than idle_timeout.
+
+        Returns:
+            list[str]: The ids of the evicted sessions.
+        """
+        now = time.monotonic() if now is None else now
+        evicted = []
+        for session in list(self.sessions.values()):
+            if session.busy or not session.queue.empty() or now - session.last_active < self.idle_timeout:
+                continue
+            path = self._save_path(session.session_id)
+            if path:
+                os.makedirs(self.save_dir, exist_ok=True)
+                persistence.save_game(session.game.game_state, path)
+                with open(path + ".json", "w") as f:
+                    json.dump(session.settings, f)
+            self._remove_session(session)
+            evicted.append(session.session_id)
+            server_log.info("Evicted idle session %s", session.session_id, extra={"session": session.session_id, "saved": bool(path)})
+        return evicted
+
+    async def _evict_idle_sessions(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60.0))
+            self.evict_idle_sessions()
+
+    async def _respond(self, writer, request, result=None, error=None):
+        response = {"id": request.get("id"), "ok": error is None}
+        if error is None:
+            response["result"] = result
+        else:
+            response["error"] = error
+        writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+
+class GameClient:
+    """
+    A minimal asyncio client for GameServer, for scripts and load tests.
+
+    Requests may be pipelined; responses are matched to requests by id.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        while line := await self._reader.readline():
+            response = json.loads(line)
+            future = self._waiting.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("Server closed the connection"))
+
+    async def request(self, command_type, payload=None, session=None):
+        """
+        Sends one request and waits for its response.
+
+        Returns:
+            The response's result.
+
+        Raises:
+            ServerError: If the server reports an error.
+        """
+        self._next_id += 1
+        request = {"id": self._next_id, "type": command_type, "payload": payload}
+        if session is not None:
+            request["session"] = session
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = future
+        self._writer.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        await self._writer.drain()
+        response = await future
+        if not response["ok"]:
+            raise ServerError(response["error"])
+        return response["result"]
+
+    async def new_session(self, **settings):
+        return (await self.request("new_session", settings))["session"]
+
+    async def close(self):
+        self._writer.close()
+        self._receiver.cancel()
+
+async def _serve(args):
+    server = GameServer(args.host, args.port, args.workers, args.processes, args.max_pending, args.idle_timeout, args.save_dir)
+    await server.start()
+    server_log.info("Serving games on %s:%s", *server.address[:2])
+    await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="Worker pool size. Defaults to the CPU count.")
+    parser.add_argument("--processes", action="store_true", help="Run turns in worker processes instead of threads.")
+    parser.add_argument("--max-pending", type=int, default=32, help="Queued requests allowed per session.")
+    parser.add_argument("--idle-timeout", type=float, default=600.0, help="Seconds before an idle session is evicted.")
+    parser.add_argument("--save-dir", help="Save evicted sessions here so they can resume.")
+    parser.add_argument("--log-file", help="Write DEBUG JSON lines logs here.")
+    args = parser.parse_args()
+    with configure_logging(file=args.log_file, levels={"research": "WARNING", "construction": "WARNING", "events": "WARNING", "commands": "WARNING"}):
+        asyncio.run(_serve(args))
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,175 @@
-import math
+import sys
+from src.view.view_model import build_view_model
 
 class CLIView:
     """
     The command-line interface view for the game.
+
+    Renders a GameViewModel section by section. The text of each section is
+    kept between frames and only reformatted when that section changed, and
+    each frame is written to the output in a single call.
+
+    Attributes:
+        out (file): The stream frames are written to. Defaults to sys.stdout at write time.
     """
-    def display_game_state(self, game_state):
+    def __init__(self, out=None):
+        self.out = out
+        self._section_cache = {}
+
+    def display_game_state(self, game_state, view_model=None, changed_only=False):
         """
         Displays the current game state to the user.
 
         Args:
             game_state (GameState): The current state of the game.
+            view_model (GameViewModel, optional): An already built view model of game_state.
+            changed_only (bool, optional): Only write the sections that changed since
+                the previous frame. Defaults to False.
+        """
+        if view_model is None:
+            view_model = build_view_model(game_state)
+        self.display(view_model, changed_only)
+
+    def display(self, view_model, changed_only=False):
+        """
+        Writes a view model as one frame.
+
+        Args:
+            view_model (GameViewModel): The view model to display.
+            changed_only (bool, optional): Only write the sections that changed since
+                the previous frame. Defaults to False.
         """
-        player = game_state.player_nation
-        projected_treasury_change = player.calculate_projected_treasury_change(game_state.available_projects)
-        crisis_gain = player.industrial_capacity / 10
-
-        print("--- Game State ---")
-        print(f"Turn: {game_state.turn}")
-        print(f"Player Nation: {player.name}")
-        print(f"  Treasury: {player.treasury:.1f} ({projected_treasury_change:+.1f})")
-        print(f"  Industrial Capacity: {player.industrial_capacity}")
-        print(f"  Research Points: {player.research_points}")
-        opinion_change_rate = (player.target_public_opinion - player.public_opinion) * 0.20
-        print(f"  Public Opinion: {player.public_opinion:.1f} (Target: {player.target_public_opinion:.1f}, Change: {opinion_change_rate:+.1f})")
-        projected_gdp_increase = player.civilian_gdp * player.get_gdp_growth_rate()
-        print(f"  Civilian GDP: {player.civilian_gdp:.2f} (+{projected_gdp_increase:.2f})")
-        print(f"  Tax Rate: {player.tax_rate*100:.0f}%")
-        print(f"  Social Spending: {player.budget['social_spending']}")
-        print(f"  Infrastructure Level: {player.infrastructure_level}")
-        print(f"  IC Focus: {player.ic_focus_policy}")
-        print("  Industries:")
-        profitable_industries = [ind for ind in player.industries if ind.profitability > 0]
-        total_profitability = sum(ind.profitability for ind in profitable_industries)
-
-        for industry in player.industries:
-            reinvestment_share = 0
-            if total_profitability > 0 and industry.profitability > 0:
-                reinvestment_share = (industry.profitability / total_profitability) * 100
-            print(f"    - {industry.name} (Tier {industry.tier}, Level {industry.level}, Gov IC: {industry.government_ic:.1f}, Private IC: {industry.private_ic:.1f}, Base Profit: {industry.base_profitability:.1f}, Tax: {industry.tax_rate*100:.0f}%, Subsidy/IC: {industry.subsidy_per_ic:.2f}, Effective Profit: {industry.profitability:.1f}, Reinvestment Share: {reinvestment_share:.1f}%)")
-        
-        effective_rp = player.get_effective_research_points()
-        if player.current_research:
-            research = player.current_research
-            turns_to_complete = math.ceil((research.rp_cost - research.rp_progress) / effective_rp) if effective_rp > 0 else 'N/A'
-            print(f"  Current Research: {research.name} ({research.rp_progress}/{research.rp_cost} RP) (+{effective_rp:.1f} RP/turn) - {turns_to_complete} turns remaining")
+        out = self.out if self.out is not None else sys.stdout
+        out.write(self.render(view_model, changed_only))
+        out.flush()
+
+    def display_plan(self, plan):
+        """
+        Writes a planner suggestion, one line per turn of the plan.
+
+        Args:
+            plan (Plan): The plan to display.
+        """
+        lines = [f"--- Suggestion ({plan.objective} {plan.score:.1f} after {len(plan.actions)} turns) ---\n"]
+        lines.extend(f"  Turn {turn}: {self._describe_command(command)}\n" for turn, command in enumerate(plan.actions, 1))
+        out = self.out if self.out is not None else sys.stdout
+        out.write("".join(lines))
+        out.flush()
+
+    def display_options(self, projection, metric="treasury", limit=10):
+        """
+        Writes a comparison of policy options, best first, one line per option.
+
+        Args:
+            projection (Projection): The projected options.
+            metric (str, optional): The metric options are ranked by at the end of the projection. Defaults to "treasury".
+            limit (int, optional): The number of options shown. Defaults to 10.
+        """
+        order = projection.ranked(metric)[:limit]
+        treasury = projection.at("treasury")
+        next_treasury = projection.next_turn("treasury")
+        civilian_gdp = projection.at("civilian_gdp")
+        public_opinion = projection.at("public_opinion")
+        industrial_capacity = projection.at("industrial_capacity")
+        lines = [f"--- Compare Options ({len(projection)} options, {projection.turns} turns, by {metric.replace('_', ' ')}) ---\n"]
+        lines.extend(
+            f"  {rank}. {projection.options[i].describe()}: Treasury {treasury[i]:.1f} (next turn {next_treasury[i]:.1f}), "
+            f"GDP {civilian_gdp[i]:.2f}, Opinion {public_opinion[i]:.1f}, IC {industrial_capacity[i]:.1f}\n"
+            for rank, i in enumerate(order.tolist(), 1)
+        )
+        out = self.out if self.out is not None else sys.stdout
+        out.write("".join(lines))
+        out.flush()
+
+    def _completion(self, row):
+        return f" - done by turn {row.completion_turn}" if row.completion_turn is not None else ""
+
+    def _describe_command(self, command):
+        if command is None:
+            return "No action"
+        payload = command.payload
+        if command.type == "research":
+            return f"Research {payload}"
+        if command.type == "set_tax":
+            return f"Set tax rate to {payload*100:.0f}%"
+        if command.type == "budget":
+            return f"Set {payload['category'].replace('_', ' ')} to {payload['amount']}"
+        if command.type == "construction" and payload["type"] == "start_project":
+            target_str = f" [{payload['target']}]" if payload.get("target") else ""
+            return f"Start {payload['project_id']}{target_str}"
+        return f"{command.type} {payload}"
+
+    def render(self, view_model, changed_only=False):
+        """
+        Returns the text of one frame.
+
+        Args:
+            view_model (GameViewModel): The view model to render.
+            changed_only (bool, optional): Leave out sections that are unchanged since the
+                previous frame. Defaults to False.
+
+        Returns:
+            str: The frame, ending in a newline.
+        """
+        parts = ["--- Game State ---\n", f"Turn: {view_model.turn}\n"]
+        for name, section in view_model.sections():
+            cached = self._section_cache.get(name)
+            if cached is not None and cached[0] == section:
+                if not changed_only:
+                    parts.append(cached[1])
+                continue
+            text = getattr(self, f"_render_{name}")(section)
+            self._section_cache[name] = (section, text)
+            parts.append(text)
+        parts.append("------------------\n")
+        return "".join(parts)
+
+    def _render_summary(self, summary):
+        return (
+            f"Player Nation: {summary.name}\n"
+            f"  Treasury: {summary.treasury:.1f} ({summary.projected_treasury_change:+.1f})\n"
+            f"  Industrial Capacity: {summary.industrial_capacity}\n"
+            f"  Research Points: {summary.research_points}\n"
+            f"  Public Opinion: {summary.public_opinion:.1f} (Target: {summary.target_public_opinion:.1f}, Change: {summary.opinion_change_rate:+.1f})\n"
+            f"  Civilian GDP: {summary.civilian_gdp:.2f} (+{summary.projected_gdp_increase:.2f})\n"
+            f"  Tax Rate: {summary.tax_rate*100:.0f}%\n"
+            f"  Social Spending: {summary.social_spending}\n"
+            f"  Infrastructure Level: {summary.infrastructure_level}\n"
+            f"  IC Focus: {summary.ic_focus_policy}\n"
+        )
+
+    def _render_industries(self, industries):
+        lines = ["  Industries:\n"]
+        lines.extend(
+            f"    - {row.name} (Tier {row.tier}, Level {row.level}, Gov IC: {row.government_ic:.1f}, Private IC: {row.private_ic:.1f}, Base Profit: {row.base_profitability:.1f}, Tax: {row.tax_rate*100:.0f}%, Subsidy/IC: {row.subsidy_per_ic:.2f}, Effective Profit: {row.profitability:.1f}, Reinvestment Share: {row.reinvestment_share:.1f}%)\n"
+            for row in industries
+        )
+        return "".join(lines)
+
+    def _render_research(self, research):
+        if research.name:
+            turns_to_complete = research.turns_to_complete if research.turns_to_complete is not None else 'N/A'
+            line = f"  Current Research: {research.name} ({research.rp_progress}/{research.rp_cost} RP) (+{research.effective_rp:.1f} RP/turn) - {turns_to_complete} turns remaining\n"
         else:
-            print(f"  Current Research: None (+{effective_rp:.1f} RP/turn)")
-            
-        print(f"  Researched Technologies: {[tech.name for tech in player.technologies]}")
-        print(f"Crisis Awareness: {game_state.crisis_awareness:.1f} (+{crisis_gain:.1f})")
-        print(f"Social Dissonance: {game_state.social_dissonance} (+0)")
-
-        print("--- Construction ---")
-        print(f"Construction Slots: {len(player.active_projects)}/{player.construction_slots}")
-        if player.active_projects:
-            print("Active Projects:")
-            total_cp_generated = player.calculate_construction_points()
-            cp_per_project = total_cp_generated
-
-            for i, project in enumerate(player.active_projects):
-                project_def = next((p for p in game_state.available_projects if p['id'] == project.project_id), None)
-                if project_def:
-                    target_str = f" [{project.target}]" if project.target else ""
-                    print(f"  {i+1}. {project_def['name']}{target_str} ({project.current_cp:.0f}/{project_def['cp_cost']} CP, +{cp_per_project:.1f} CP/turn)")
-        if player.project_queue:
-            print("Project Queue:")
-            for i, project in enumerate(player.project_queue):
-                project_def = next((p for p in game_state.available_projects if p['id'] == project.project_id), None)
-                if project_def:
-                    target_str = f" [{project.target}]" if project.target else ""
-                    print(f"  {i+1+len(player.active_projects)}. {project_def['name']}{target_str}")
-        print("------------------")
\ No newline at end of file
+            line = f"  Current Research: None (+{research.effective_rp:.1f} RP/turn)\n"
+        return line + f"  Researched Technologies: {list(research.researched)}\n"
+
+    def _render_meters(self, meters):
+        return (
+            f"Crisis Awareness: {meters.crisis_awareness:.1f} (+{meters.crisis_gain:.1f})\n"
+            f"Social Dissonance: {meters.social_dissonance} (+0)\n"
+        )
+
+    def _render_construction(self, construction):
+        lines = ["--- Construction ---\n", f"Construction Slots: {construction.used_slots}/{construction.construction_slots}\n"]
+        if construction.active_projects:
+            lines.append("Active Projects:\n")
+            for row in construction.active_projects:
+                target_str = f" [{row.target}]" if row.target else ""
+                lines.append(f"  {row.position}. {row.name}{target_str} ({row.current_cp:.0f}/{row.cp_cost} CP, +{row.cp_per_turn:.1f} CP/turn){self._completion(row)}\n")
+        if construction.queued_projects:
+            lines.append("Project Queue:\n")
+            for row in construction.queued_projects:
+                target_str = f" [{row.target}]" if row.target else ""
+                lines.append(f"  {row.position}. {row.name}{target_str}{self._completion(row)}\n")
+        return "".join(lines)
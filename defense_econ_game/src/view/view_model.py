@@ -0,0 +1,122 @@
+import math
+from collections import namedtuple
+
+NationSummary = namedtuple("NationSummary", (
+    "name", "treasury", "projected_treasury_change", "industrial_capacity", "research_points",
+    "public_opinion", "target_public_opinion", "opinion_change_rate", "civilian_gdp",
+    "projected_gdp_increase", "tax_rate", "social_spending", "infrastructure_level", "ic_focus_policy",
+))
+IndustryRow = namedtuple("IndustryRow", (
+    "name", "tier", "level", "government_ic", "private_ic", "base_profitability",
+    "tax_rate", "subsidy_per_ic", "profitability", "reinvestment_share",
+))
+ResearchSummary = namedtuple("ResearchSummary", ("name", "rp_progress", "rp_cost", "effective_rp", "turns_to_complete", "researched"))
+MeterSummary = namedtuple("MeterSummary", ("crisis_awareness", "crisis_gain", "social_dissonance"))
+ProjectRow = namedtuple("ProjectRow", ("position", "handle", "name", "target", "current_cp", "cp_cost", "cp_per_turn", "completion_turn"))
+ConstructionSummary = namedtuple("ConstructionSummary", ("used_slots", "construction_slots", "active_projects", "queued_projects"))
+
+class GameViewModel:
+    """
+    Everything a front end shows for one state of the game, computed once.
+
+    Each section is an immutable value (a namedtuple, or a tuple of them), so
+    sections can be compared to decide what to redraw and converted to plain
+    dicts for non-terminal front ends.
+
+    Attributes:
+        turn (int): The current turn.
+        version (int): The GameState version the view model was built from.
+        summary (NationSummary): The player nation's headline figures.
+        industries (tuple[IndustryRow]): One row per player industry.
+        research (ResearchSummary): Current research and researched technologies.
+        meters (MeterSummary): World crisis meters.
+        construction (ConstructionSummary): Construction slots, active projects and the queue.
+    """
+    SECTIONS = ("summary", "industries", "research", "meters", "construction")
+
+    def __init__(self, turn, version, summary, industries, research, meters, construction):
+        self.turn = turn
+        self.version = version
+        self.summary = summary
+        self.industries = industries
+        self.research = research
+        self.meters = meters
+        self.construction = construction
+
+    def sections(self):
+        """Returns (name, section) pairs in display order."""
+        return [(name, getattr(self, name)) for name in self.SECTIONS]
+
+    def to_dict(self):
+        """Returns the view model as plain dicts, lists and numbers."""
+        return {
+            "turn": self.turn,
+            "summary": self.summary._asdict(),
+            "industries": [row._asdict() for row in self.industries],
+            "research": self.research._asdict(),
+            "meters": self.meters._asdict(),
+            "construction": {
+                **self.construction._asdict(),
+                "active_projects": [row._asdict() for row in self.construction.active_projects],
+                "queued_projects": [row._asdict() for row in self.construction.queued_projects],
+            },
+        }
+
+def build_view_model(game_state):
+    """
+    Computes the view model of the player nation.
+
+    Args:
+        game_state (GameState): The current state of the game.
+
+    Returns:
+        GameViewModel: The computed view model.
+    """
+    player = game_state.player_nation
+    summary = NationSummary(
+        player.name,
+        player.treasury,
+        player.calculate_projected_treasury_change(game_state.available_projects),
+        player.industrial_capacity,
+        player.research_points,
+        player.public_opinion,
+        player.target_public_opinion,
+        (player.target_public_opinion - player.public_opinion) * 0.20,
+        player.civilian_gdp,
+        player.civilian_gdp * player.get_gdp_growth_rate(),
+        player.tax_rate,
+        player.budget['social_spending'],
+        player.infrastructure_level,
+        player.ic_focus_policy,
+    )
+
+    industries = tuple(
+        IndustryRow(industry.name, industry.tier, industry.level, industry.government_ic, industry.private_ic, industry.base_profitability,
+                    industry.tax_rate, industry.subsidy_per_ic, industry.profitability, share * 100)
+        for industry, share in zip(player.industries, player.get_reinvestment_shares())
+    )
+
+    effective_rp = player.get_effective_research_points()
+    researched = tuple(tech.name for tech in player.technologies)
+    research = player.current_research
+    if research:
+        turns_to_complete = math.ceil((research.rp_cost - research.rp_progress) / effective_rp) if effective_rp > 0 else None
+        research_summary = ResearchSummary(research.name, research.rp_progress, research.rp_cost, effective_rp, turns_to_complete, researched)
+    else:
+        research_summary = ResearchSummary(None, 0, 0, effective_rp, None, researched)
+
+    meters = MeterSummary(game_state.crisis_awareness, summary.industrial_capacity / 10, game_state.social_dissonance)
+
+    cp_per_project = player.calculate_construction_points() if player.active_projects else 0.0
+    completions = player.predict_project_completions(game_state.turn) if player.construction else {}
+    active_projects = tuple(
+        ProjectRow(i + 1, project.handle, project.definition['name'], project.target, project.current_cp, project.definition['cp_cost'], cp_per_project, completions.get(project.handle))
+        for i, project in enumerate(player.active_projects) if project.definition
+    )
+    queued_projects = tuple(
+        ProjectRow(i + 1 + len(player.active_projects), project.handle, project.definition['name'], project.target, project.current_cp, project.definition['cp_cost'], None, completions.get(project.handle))
+        for i, project in enumerate(player.project_queue) if project.definition
+    )
+    construction = ConstructionSummary(len(player.active_projects), player.construction_slots, active_projects, queued_projects)
+
+    return GameViewModel(game_state.turn, game_state.version, summary, industries, research_summary, meters, construction)
@@ -0,0 +1,9 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Test runs keep the precompiled game data cache in a temporary directory, not in the user's home.
+_cache_dir = tempfile.mkdtemp(prefix="defense_econ_game-tests-")
+os.environ["DEFENSE_ECON_CACHE_DIR"] = _cache_dir
+atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+import numpy as np
+from src.game import Game, load_game_data
+from src.commands import Command
+from src.controller.ai_controller import AIController
+from src.controller.planner import Planner
+from src import persistence
+
+class TestAIController(unittest.TestCase):
+    def setUp(self):
+        self.ai = AIController()
+        self.game = Game(test_mode=True, num_ai_nations=4, ai_controller=self.ai)
+        self.nations = self.game.game_state.ai_nations
+
+    def decisions(self):
+        return [(nation.name, command.type, command.payload) for nation, command in self.ai.decide(self.game.game_state, self.nations)]
+
+    def test_idle_nations_start_their_next_technology(self):
+        self.game.controller.set_research(self.nations[1], "Industrialization", self.game.game_state)
+        self.nations[2].add_technology(self.game.game_state.available_technologies.get("Industrialization"))
+        research = [(name, payload) for name, command_type, payload in self.decisions() if command_type == "research"]
+        self.assertEqual(research, [("AI Nation 1", "Industrialization"), ("AI Nation 3", "Advanced Manufacturing"), ("AI Nation 4", "Industrialization")])
+
+    def test_construction_targets_the_most_profitable_industry(self):
+        self.nations[0].get_industry("Lumber Mills").subsidy_per_ic = 5.0
+        self.nations[1].treasury = 100
+        for _ in range(3):
+            self.game.controller.start_project(self.nations[2], "build_ic_1", "Ore Mining", self.game.game_state)
+        construction = {name: payload["target"] for name, command_type, payload in self.decisions() if command_type == "construction"}
+        self.assertEqual(construction["AI Nation 1"], "Lumber Mills")
+        self.assertNotIn("AI Nation 2", construction)
+        self.assertNotIn("AI Nation 3", construction)
+        best = max(self.nations[3].industries, key=lambda industry: industry.profitability)
+        self.assertEqual(construction["AI Nation 4"], best.name)
+
+    def test_projects_without_requires_target_are_untargeted(self):
+        data = load_game_data()
+        for project in data["projects"]:
+            del project["requires_target"]
+        game = Game(test_mode=True, num_ai_nations=1, data=data, ai_controller=self.ai)
+        decisions = [(command.type, command.payload) for _, command in self.ai.decide(game.game_state, game.game_state.ai_nations)]
+        self.assertIn(("construction", {"type": "start_project", "project_id": "build_ic_1", "target": None}), decisions)
+        actions = Planner(construction_targets=1).candidate_actions(game.game_state, game.game_state.player_nation)
+        described = [(command.type, command.payload) for command in actions if command is not None]
+        self.assertIn(("construction", {"type": "start_project", "project_id": "build_ic_1", "target": None}), described)
+
+    def test_budget_tracks_public_opinion(self):
+        unhappy, broke, content, poor_and_unhappy = self.nations
+        self.game.controller.set_tax_rate(unhappy, 0.35)
+        broke.treasury = -10
+        self.game.controller.set_budget(broke, "social_spending", 200)
+        self.game.controller.set_tax_rate(content, 0.04)
+        self.game.controller.set_tax_rate(poor_and_unhappy, 0.35)
+        poor_and_unhappy.treasury = 0
+        budget = sorted((name, command_type, payload) for name, command_type, payload in self.decisions() if command_type in ("set_tax", "budget"))
+        self.assertEqual(budget, [
+            ("AI Nation 1", "budget", {"category": "social_spending", "amount": 50.0}),
+            ("AI Nation 2", "budget", {"category": "social_spending", "amount": 150.0}),
+            ("AI Nation 2", "set_tax", 0.16),
+            ("AI Nation 3", "set_tax", 0.05),
+            ("AI Nation 4", "set_tax", 0.34),
+        ])
+
+    def test_ai_acts_for_ai_nations_only(self):
+        self.game.process_command(Command("end_turn"))
+        player = self.game.game_state.player_nation
+        self.assertIsNone(player.current_research)
+        self.assertEqual(player.active_projects, [])
+        for nation in self.nations:
+            self.assertEqual(nation.current_research.name, "Industrialization")
+            self.assertEqual(len(nation.active_projects), 1)
+        self.game.controller.set_ai_controller(None)
+        self.assertNotIn("ai", [name for name, _ in self.game.controller.turn_engine.phases])
+
+    def test_fast_forward_matches_stepping_with_ai(self):
+        stepped = Game(test_mode=True, num_ai_nations=4, ai_controller=AIController())
+        for _ in range(40):
+            stepped.process_command(Command("end_turn"))
+        self.game.advance_until(turn=40)
+        expected = persistence.capture(stepped.game_state)
+        actual = persistence.capture(self.game.game_state)
+        self.assertEqual(actual.structure, expected.structure)
+        for name, values in expected.arrays.items():
+            np.testing.assert_array_equal(actual.arrays[name], values, err_msg=name)
+
+    def test_fast_forward_decides_once_per_turn(self):
+        with mock.patch.object(self.ai, "decide", wraps=self.ai.decide) as decide:
+            self.game.advance_until(turn=40)
+        self.assertEqual(decide.call_count, 40)
+        self.assertIsNone(self.game.controller._ai_decisions)
+
+    def test_fast_forward_with_metrics_measures_every_turn(self):
+        metrics = self.game.controller.turn_engine.metrics
+        metrics.enable()
+        self.game.advance_until(turn=10)
+        self.assertEqual([report.turn for report in metrics.history], list(range(10)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import unittest
+
+import numpy as np
+
+from src import persistence
+from src.game import Game
+from src.commands import Command
+from src.models.arms_market import BUY, SELL, ArmsMarket, component_item, lease_item
+
+CORE = component_item("Helios-I Power Core")
+
+class TestArmsMarket(unittest.TestCase):
+    def setUp(self):
+        self.market = ArmsMarket()
+        self.treasuries = {"A": 1000.0, "B": 1000.0, "C": 1000.0}
+
+    def match(self, turn=0):
+        return [(trade.buyer, trade.seller, trade.quantity, trade.price) for trade in self.market.match(turn, self.treasuries)]
+
+    def test_best_price_then_oldest_order_trades_first(self):
+        self.market.post("A", SELL, CORE, 2, 30.0, 0)
+        first = self.market.post("B", SELL, CORE, 2, 20.0, 0)
+        second = self.market.post("C", SELL, CORE, 2, 20.0, 0)
+        self.assertEqual(self.match(), [])
+        self.assertEqual(self.market.best_ask(CORE), 20.0)
+        self.market.post("A", BUY, CORE, 5, 25.0, 1)
+        # Fills at the resting prices; the rest of the bid rests below the 30 ask.
+        self.assertEqual(self.match(1), [("A", "B", 2, 20.0), ("A", "C", 2, 20.0)])
+        self.assertEqual((self.market.remaining(first), self.market.remaining(second)), (0, 0))
+        self.assertEqual(self.market.best_bid(CORE), 25.0)
+        self.assertEqual(self.market.best_ask(CORE), 30.0)
+        self.assertEqual(self.market.holdings["A"][CORE], 4)
+        self.assertEqual(self.market.last_prices[CORE], 20.0)
+
+    def test_incoming_sell_hits_highest_bid(self):
+        self.market.post("A", BUY, CORE, 3, 10.0, 0)
+        self.market.post("B", BUY, CORE, 3, 12.0, 0)
+        self.market.post("C", SELL, CORE, 4, 9.0, 0)
+        self.assertEqual(self.match(), [("B", "C", 3, 12.0), ("A", "C", 1, 10.0)])
+        self.assertEqual(len(self.market), 1)
+
+    def test_buyers_only_buy_what_they_can_pay_for(self):
+        self.treasuries["A"] = 50.0
+        self.market.post("B", SELL, CORE, 10, 20.0, 0)
+        bid = self.market.post("A", BUY, CORE, 10, 20.0, 0)
+        self.assertEqual(self.match(), [("A", "B", 2, 20.0)])
+        # The rest of the bid would cross the book, so it is cancelled.
+        self.assertEqual(self.market.remaining(bid), 0)
+        self.assertEqual(self.market.best_ask(CORE), 20.0)
+
+    def test_unpayable_resting_bids_are_cancelled(self):
+        self.treasuries["A"] = 5.0
+        poor = self.market.post("A", BUY, CORE, 1, 20.0, 0)
+        self.market.post("B", BUY, CORE, 1, 15.0, 0)
+        self.market.post("C", SELL, CORE, 2, 10.0, 0)
+        self.assertEqual(self.match(), [("B", "C", 1, 15.0)])
+        self.assertEqual(self.market.remaining(poor), 0)
+
+    def test_cancel_and_expiry(self):
+        kept = self.market.post("A", SELL, CORE, 1, 50.0, 0)
+        cancelled = self.market.post("A", SELL, CORE, 1, 10.0, 0)
+        expiring = self.market.post("B", SELL, CORE, 1, 20.0, 0, duration=2)
+        self.assertFalse(self.market.cancel(cancelled, nation="B"))
+        self.assertTrue(self.market.cancel(cancelled, nation="A"))
+        self.match(0)
+        self.assertEqual(self.market.best_ask(CORE), 20.0)
+        # Posted on turn 0 for two turns, it can trade until the market phase of turn 1.
+        self.assertFalse(self.market.needs_matching(1))
+        self.assertTrue(self.market.needs_matching(2))
+        self.market.post("C", BUY, CORE, 1, 60.0, 2)
+        self.assertEqual(self.match(2), [("C", "A", 1, 50.0)])
+        self.assertEqual((self.market.remaining(kept), self.market.remaining(expiring)), (0, 0))
+
+    def test_nations_do_not_trade_with_themselves(self):
+        self.market.post("A", SELL, CORE, 1, 10.0, 0)
+        self.market.post("B", SELL, CORE, 1, 11.0, 0)
+        self.market.post("A", BUY, CORE, 1, 20.0, 0)
+        self.assertEqual(self.match(), [("A", "B", 1, 11.0)])
+
+    def test_leases_last_one_turn_per_unit_after_the_trade(self):
+        design = "Helios-I Power Core"
+        self.market.post("A", SELL, lease_item(design), 3, 40.0, 5)
+        self.market.post("B", BUY, lease_item(design), 3, 40.0, 5)
+        self.match(5)
+        self.assertTrue(self.market.has_lease("B", design, 8))
+        self.assertFalse(self.market.has_lease("B", design, 9))
+        self.assertFalse(self.market.has_lease("A", design, 6))
+        self.market.post("A", SELL, lease_item(design), 2, 40.0, 7)
+        self.market.post("B", BUY, lease_item(design), 2, 40.0, 7)
+        self.match(7)
+        self.assertTrue(self.market.has_lease("B", design, 10))
+
+    def test_invalid_orders_are_rejected(self):
+        for side, quantity, price in ((BUY, 0, 1.0), (BUY, 1.5, 1.0), (SELL, 1, 0.0), ("swap", 1, 1.0), (BUY, "5", 1.0), (BUY, True, 1.0),
+                                      (BUY, float("inf"), 1.0), (SELL, 1, "5"), (SELL, 1, None), (SELL, 1, float("nan")), (SELL, 1, float("inf"))):
+            with self.assertRaises(ValueError):
+                self.market.post("A", side, CORE, quantity, price, 0)
+        for item in ("Helios-I Power Core", "tank:Helios-I Power Core", "component:", None):
+            with self.assertRaises(ValueError):
+                self.market.post("A", BUY, item, 1, 1.0, 0)
+        for duration in (0, 1.5, "2"):
+            with self.assertRaises(ValueError):
+                self.market.post("A", BUY, CORE, 1, 1.0, 0, duration)
+        self.assertEqual(len(self.market), 0)
+        self.market.post("A", BUY, lease_item("Helios-I Power Core"), np.int64(2), np.float64(1.5), 0, 2)
+        self.assertEqual(len(self.market), 1)
+
+    def test_copies_are_independent(self):
+        self.market.post("A", SELL, CORE, 2, 10.0, 0)
+        self.match()
+        copy = self.market.copy()
+        copy.post("B", BUY, CORE, 2, 10.0, 1)
+        copy.match(1, self.treasuries)
+        self.assertEqual(len(copy), 0)
+        self.assertEqual(self.market.best_ask(CORE), 10.0)
+        self.assertNotIn("B", self.market.holdings)
+
+    def test_tens_of_thousands_of_orders_match_consistently(self):
+        rng = np.random.default_rng(7)
+        nations = [f"N{i}" for i in range(300)]
+        treasuries = {name: 1e6 for name in nations}
+        items = [component_item(f"Part {i}") for i in range(50)]
+        count = 30000
+        for nation, item, buying, quantity, price in zip(rng.integers(0, 300, count), rng.integers(0, 50, count), rng.random(count) < 0.5,
+                                                         rng.integers(1, 20, count), rng.uniform(50, 150, count).round(1)):
+            self.market.post(nations[nation], BUY if buying else SELL, items[item], int(quantity), float(price), 0)
+        trades = self.market.match(0, treasuries)
+        self.assertGreater(len(trades), 1000)
+        # The books end uncrossed and no order is overfilled.
+        for item in items:
+            bid, ask = self.market.best_bid(item), self.market.best_ask(item)
+            if bid is not None and ask is not None:
+                self.assertLess(bid, ask)
+        change = ArmsMarket.settle(trades, [_Treasury(name) for name in nations])
+        self.assertAlmostEqual(change.sum(), 0.0, delta=1e-6)
+
+class _Treasury:
+    def __init__(self, name):
+        self.name = name
+        self.treasury = 0.0
+
+class TestMarketInGame(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True, num_ai_nations=2)
+        self.buyer, self.seller = self.game.game_state.ai_nations
+
+    def order(self, nation, side, quantity, price, **extra):
+        self.game.controller.execute_command(self.game.game_state, Command("market", {"type": side, "item": CORE, "quantity": quantity, "price": price, **extra}), nation)
+
+    def test_trades_settle_between_treasuries_at_end_of_turn(self):
+        self.order(self.seller, "sell", 5, 40.0)
+        self.order(self.buyer, "buy", 3, 45.0)
+        other = Game(test_mode=True, num_ai_nations=2)
+        other.process_command(Command("end_turn"))
+        self.game.process_command(Command("end_turn"))
+        reference = other.game_state.ai_nations
+        self.assertAlmostEqual(self.buyer.treasury, reference[0].treasury - 120.0)
+        self.assertAlmostEqual(self.seller.treasury, reference[1].treasury + 120.0)
+        self.assertEqual(self.game.game_state.market.holdings[self.buyer.name][CORE], 3)
+        self.assertEqual(len(self.game.game_state.market), 1)
+
+    def test_invalid_order_logs_warning(self):
+        with self.assertLogs("defense_econ_game.commands", "WARNING") as logs:
+            self.order(self.buyer, "buy", -1, 45.0)
+            self.order(self.buyer, "buy", 1, "45")
+            self.game.controller.execute_command(self.game.game_state, Command("market", {"type": "buy", "item": "Helios"}), self.buyer)
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(len(self.game.game_state.market), 0)
+
+    def test_fork_and_save_keep_the_book(self):
+        self.order(self.seller, "sell", 5, 40.0)
+        self.game.process_command(Command("end_turn"))
+        self.order(self.buyer, "buy", 1, 30.0, duration=3)
+        fork = self.game.game_state.fork()
+        fork.market.cancel(0)
+        self.assertEqual(len(self.game.game_state.market), 2)
+
+        restored = persistence.restore(persistence.capture(self.game.game_state), Game(test_mode=True))
+        self.assertEqual(persistence.state_hash(restored), persistence.state_hash(self.game.game_state))
+        self.assertEqual([(order.order_id, order.expires) for order in restored.market.pending], [(1, 3)])
+        self.assertEqual(restored.market.best_ask(CORE), 40.0)
+
+    def test_fast_forward_matches_stepping(self):
+        self.order(self.seller, "sell", 5, 40.0, duration=4)
+        stepped = persistence.restore(persistence.capture(self.game.game_state), Game(test_mode=True))
+        stepper = Game(test_mode=True)
+        stepper.game_state = stepped
+        for _ in range(10):
+            stepper.process_command(Command("end_turn"))
+        self.game.controller.advance_until(self.game.game_state, turn=10)
+        self.assertEqual(persistence.state_hash(self.game.game_state), persistence.state_hash(stepped))
+        self.assertEqual(len(stepped.market), 0)
+
+if __name__ == '__main__':
+    unittest.main()
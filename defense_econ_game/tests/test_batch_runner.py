@@ -0,0 +1,25 @@
+import unittest
+import numpy as np
+from src.game import load_game_data
+from src.batch_runner import METRICS, ScriptedPolicy, policy_grid, run_batch, run_game
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.data = load_game_data()
+
+    def test_policy_grid_is_cartesian_product(self):
+        policies = policy_grid(tax_rates=(0.1, 0.2), social_spending=(0, 100), ic_focus_policies=("Balanced", "Infrastructure_Focus"))
+        self.assertEqual(len(policies), 8)
+
+    def test_run_game_records_every_turn(self):
+        history = run_game(ScriptedPolicy(research_order=("Industrialization",)), seed=0, turns=5, data=self.data)
+        self.assertEqual(history.shape, (5, len(METRICS)))
+        self.assertTrue(np.all(np.diff(history[:, METRICS.index("civilian_gdp")]) > 0))
+
+    def test_batch_aggregates_match_single_games(self):
+        policies = policy_grid(tax_rates=(0.1, 0.3))
+        result = run_batch(policies, seeds=range(3), turns=4, max_workers=2, chunk_size=2, data=self.data)
+        self.assertEqual(result.stats.shape, (2, 3, 4, len(METRICS)))
+        for policy_index, policy in enumerate(policies):
+            expected = run_game(policy, seed=0, turns=4, data=self.data)
+            np.testing.assert_allclose(result.get(policy_index, "treasury"), expected[:, METRICS.index("treasury")])
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from src.game import Game, load_game_data
+from benchmarks.generators import generate_data, write_data
+from benchmarks.run_benchmarks import build_game, compare, missing_from
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generated_data_scales_the_shipped_data(self):
+        data = generate_data(10)
+        self.assertEqual(len(data["industries"]), 120)
+        self.assertEqual(len(data["technologies"]), 30)
+        self.assertEqual(len(data["projects"]), 20)
+        self.assertEqual(len(data["events"]), 10)
+
+    def test_generated_data_loads_and_plays(self):
+        with tempfile.TemporaryDirectory() as directory:
+            write_data(directory, 3)
+            game = Game(test_mode=True, data=load_game_data(directory))
+        self.assertEqual(len(game.game_state.player_nation.industries), 12)
+        self.assertTrue(all(tech.unlocked_industries for tech in game.game_state.available_technologies))
+        for _ in range(71):
+            game.controller._process_end_turn(game.game_state)
+        self.assertNotIn("Event 2", [event.name for event in game.game_state.available_events])
+
+    def test_deep_queue_scenario_fills_the_queue(self):
+        game = build_game(generate_data(2), nations=2, queue_depth=10)
+        self.assertEqual(len(game.game_state.ai_nations), 1)
+        player = game.game_state.player_nation
+        self.assertEqual(len(player.active_projects) + len(player.project_queue), 10)
+
+    def test_compare_flags_only_slowdowns_past_the_threshold(self):
+        baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0, "threshold": 3.0}, "c": {"median": 1.0}}}
+        results = {"a": {"median": 1.5}, "b": {"median": 1.5}, "c": {"median": 1.1}}
+        self.assertEqual([name for name, *_ in compare(results, baseline, threshold=1.25)], ["a"])
+
+    def test_benchmarks_without_a_baseline_are_reported(self):
+        baseline = {"results": {"a": {"median": 1.0}, "stale": {"median": 1.0}}}
+        results = {"a": {"median": 1.0}, "new": {"median": 9.0}}
+        self.assertEqual(compare(results, baseline), [])
+        self.assertEqual(missing_from(results, baseline), ["new"])
+
+if __name__ == '__main__':
+    unittest.main()
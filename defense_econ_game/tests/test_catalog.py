@@ -0,0 +1,61 @@
+import copy
+import pickle
+from src.commands import Command
+from tests.test_harness import TestHarness
+
+class TestCatalog(TestHarness):
+    def test_project_lookup_by_id(self):
+        project_def = self.game.game_state.available_projects.get("build_ic_1")
+        self.assertEqual(project_def['name'], "Construct Industrial Complex")
+        self.assertEqual(project_def.cp_cost, project_def['cp_cost'])
+        self.assertIsNone(self.game.game_state.available_projects.get("missing_project"))
+
+    def test_definitions_are_immutable_and_shared(self):
+        project_def = self.game.game_state.available_projects.get("build_ic_1")
+        with self.assertRaises(AttributeError):
+            project_def.cp_cost = 1
+        with self.assertRaises(TypeError):
+            project_def['cp_cost'] = 1
+        self.assertIs(copy.deepcopy(project_def), project_def)
+
+    def test_project_instance_points_at_definition(self):
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        project = self.game.game_state.player_nation.active_projects[0]
+        self.assertIs(project.definition, self.game.game_state.available_projects.get("build_ic_1"))
+
+    def test_technology_unlocks_are_resolved(self):
+        tech = self.game.game_state.available_technologies.get("Industrialization")
+        self.assertEqual([industry.name for industry in tech.unlocked_industries], tech.unlocks_industries)
+        self.assertIs(tech.unlocked_industries[0], self.game.game_state.all_industries.get("Metal Refineries"))
+
+    def test_nation_industry_lookup_by_name(self):
+        nation = self.game.game_state.player_nation
+        self.assertIs(nation.get_industry("Ore Mining"), next(ind for ind in nation.industries if ind.name == "Ore Mining"))
+
+    def test_technology_and_industry_records_are_immutable_and_shared(self):
+        tech = self.game.game_state.available_technologies.get("Industrialization")
+        industry_type = self.game.game_state.all_industries.get("Ore Mining")
+        for record in (tech, industry_type):
+            with self.assertRaises(AttributeError):
+                record.name = "Changed"
+            self.assertIs(copy.deepcopy(record), record)
+            restored = pickle.loads(pickle.dumps(record))
+            self.assertEqual(restored.name, record.name)
+        nations = self.game.game_state.nations
+        self.assertTrue(all(nation.get_industry("Ore Mining").definition is industry_type for nation in nations))
+
+    def test_per_nation_state_is_slotted(self):
+        self.game.process_command(Command("research", "Industrialization"))
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        nation = self.game.game_state.player_nation
+        for state in (nation, nation.industries[0], nation.current_research, nation.active_projects[0], nation.construction, nation.modifiers):
+            self.assertFalse(hasattr(state, "__dict__"), type(state).__name__)
+
+    def test_research_progress_is_not_shared_by_forks(self):
+        self.game.process_command(Command("research", "Industrialization"))
+        self.run_command("end_turn")
+        fork = self.game.game_state.fork()
+        fork.player_nation.current_research.rp_progress += 10
+        progress = self.game.game_state.player_nation.current_research
+        self.assertEqual(fork.player_nation.current_research.rp_progress, progress.rp_progress + 10)
+        self.assertIs(fork.player_nation.current_research.definition, progress.definition)
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+from src.controller.combat import ATTACKER, DEFENDER, UNDECIDED, CombatResolver, Engagement
+from src.models.component_design import ComponentDesign
+from src.models.rune import Rune
+from src.models.unit import Unit
+
+FURY = Rune("Rune of Fury", damage_bonus=0.5, stress_per_round=8.0)
+CORE = ComponentDesign("Helios-I Power Core", "engine", stress_capacity=20.0, runes=[FURY])
+CANNON = ComponentDesign("45mm Autocannon", "weapon", damage=20.0)
+PLATING = ComponentDesign("Composite Plating", "armor", hp=50.0, armor=5.0)
+
+class TestUnitDesign(unittest.TestCase):
+    def test_stats_are_the_sum_of_chassis_and_components(self):
+        tank = Unit("Light Tank", [CORE, CANNON, PLATING], hp=100.0, armor=2.0)
+        self.assertEqual((tank.hp, tank.armor, tank.damage, tank.stress_capacity), (150.0, 7.0, 20.0, 20.0))
+        self.assertEqual((tank.damage_bonus, tank.stress_per_round), (0.5, 8.0))
+        self.assertEqual(CORE.runes, (FURY,))
+
+class TestCombatResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = CombatResolver()
+        self.tank = Unit("Light Tank", [CANNON, PLATING])
+        self.rune_tank = Unit("Rune Tank", [CORE, CANNON, PLATING])
+
+    def test_stronger_force_wins_and_empty_sides_lose(self):
+        result = self.resolver.resolve([
+            Engagement([self.tank] * 6, [self.tank] * 2),
+            Engagement([self.tank], [self.tank] * 6),
+            Engagement([], [self.tank]),
+            Engagement([self.tank], [Unit("Wall", hp=1e9, armor=1e9)]),
+        ], max_rounds=20)
+        self.assertEqual(list(result.winner), [ATTACKER, DEFENDER, DEFENDER, UNDECIDED])
+        self.assertEqual(list(result.rounds), [int(result.rounds[0]), int(result.rounds[1]), 0, 20])
+        self.assertEqual(result.survivors[2].tolist(), [0, 1])
+        attackers, defenders = result.units(0)
+        self.assertEqual((len(attackers), len(defenders)), (6, 2))
+        self.assertTrue((defenders <= 0).all())
+        self.assertEqual(int((attackers > 0).sum()), result.survivors[0, 0])
+
+    def test_armor_only_stops_part_of_a_hit(self):
+        wall = Unit("Wall", hp=1000.0, armor=1e6)
+        result = self.resolver.resolve([Engagement([self.tank], [wall])], max_rounds=10)
+        _, (hp,) = result.units(0)
+        # Every hit does 10% of its 16 to 24 damage roll.
+        self.assertTrue(1000.0 - 10 * 2.4 <= hp <= 1000.0 - 10 * 1.6)
+
+    def test_overload_tiers(self):
+        target = Unit("Target", hp=1e9)
+        # Stress 8, 16, 24: minor overload in round 3 (20% over), every third round after venting.
+        minor = Unit("Minor", [ComponentDesign("Core", stress_capacity=20.0, runes=[Rune("r", stress_per_round=8.0)])], hp=1000.0)
+        # Stress 12, 24: major overload in round 2 (50% over), then stunned in round 3.
+        major = Unit("Major", [ComponentDesign("Core", stress_capacity=16.0, runes=[Rune("r", stress_per_round=12.0)])], hp=1000.0)
+        # Stress 30: critical overload in round 1 burns the rune out for good.
+        critical = Unit("Critical", [ComponentDesign("Core", stress_capacity=10.0, runes=[Rune("r", stress_per_round=30.0)])], hp=1000.0)
+        result = self.resolver.resolve([Engagement([unit], [target]) for unit in (minor, major, critical)], max_rounds=9)
+        self.assertEqual(list(result.overloads[0::2]), [3, 3, 1])
+        hp = result.hp[0::2]
+        np.testing.assert_allclose(hp, [1000.0 - 3 * 50.0, 1000.0 - 3 * 150.0, 1000.0 - 300.0])
+
+    def test_runes_trade_damage_for_overloads(self):
+        plain = self.resolver.simulate(Engagement([self.tank] * 4, [self.tank] * 4), 2000, seed=3)
+        runed = self.resolver.simulate(Engagement([self.rune_tank] * 4, [self.tank] * 4), 2000, seed=3)
+        self.assertAlmostEqual(plain.win_rate(), plain.win_rate(DEFENDER), delta=0.05)
+        self.assertGreater(runed.win_rate(), 0.9)
+        self.assertGreater(runed.overloads.sum(), 0)
+        self.assertEqual(plain.overloads.sum(), 0)
+
+    def test_results_do_not_depend_on_the_batch(self):
+        engagement = Engagement([self.rune_tank] * 3, [self.tank] * 4)
+        trials = self.resolver.simulate(engagement, 50, seed=11)
+        mixed = self.resolver.resolve([Engagement([self.tank] * 9, [self.rune_tank], key=99),
+                                       Engagement(engagement.attackers, engagement.defenders, key=17)], seed=11)
+        np.testing.assert_array_equal(np.concatenate(mixed.units(1)), np.concatenate(trials.units(17)))
+        self.assertEqual(mixed.winner[1], trials.winner[17])
+        self.assertEqual(mixed.rounds[1], trials.rounds[17])
+        again = self.resolver.simulate(engagement, 50, seed=11)
+        np.testing.assert_array_equal(again.hp, trials.hp)
+        self.assertFalse((self.resolver.simulate(engagement, 50, seed=12).hp == trials.hp).all())
+        self.assertFalse(trials.hp.flags.writeable)
+
+    def test_many_engagements_in_one_batch(self):
+        engagements = [Engagement([self.tank] * (i % 9 + 1), [self.rune_tank] * (i % 5 + 1)) for i in range(2000)]
+        result = self.resolver.resolve(engagements, seed=5)
+        self.assertEqual(len(result), 2000)
+        self.assertEqual(result.offsets[-1], sum(len(e.attackers) + len(e.defenders) for e in engagements))
+        # Every undecided engagement ended with both sides destroyed in the same round.
+        undecided = result.winner == UNDECIDED
+        self.assertTrue((result.survivors[undecided] == 0).all())
+        self.assertTrue((result.rounds < 50).all())
+        for i in (0, 4, 8, 1999):
+            attackers, defenders = result.units(i)
+            self.assertEqual(result.survivors[i].tolist(), [int((attackers > 0).sum()), int((defenders > 0).sum())])
+
+if __name__ == '__main__':
+    unittest.main()
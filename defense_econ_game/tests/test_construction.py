@@ -1,6 +1,11 @@
+from unittest import mock
 from tests.test_harness import TestHarness
+from src.game import Game
 from src.commands import Command
-import copy
+from src import persistence
+from src.models.construction_scheduler import ConstructionScheduler
+from src.models.project_instance import ProjectInstance
+from src.models import economy_rules
 
 class TestConstruction(TestHarness):
     def test_project_starts_in_active_slot(self):
@@ -67,8 +72,113 @@ class TestConstruction(TestHarness):
     def test_treasury_deduction_for_upkeep(self):
         """Test that treasury is deducted for active project upkeep."""
         self.run_command("start_project", "build_ic_1", "Ore Mining")
-        initial_nation_state = copy.deepcopy(self.game.game_state.player_nation)
-        initial_game_state = copy.deepcopy(self.game.game_state)
+        initial_game_state = self.game.game_state.fork()
+        initial_nation_state = initial_game_state.player_nation
         expected_treasury = self._simulate_treasury_change_for_turn(initial_nation_state, initial_game_state)
         self.run_command("end_turn")
-        self.assertAlmostEqual(self.game.game_state.player_nation.treasury, expected_treasury, places=2)
\ No newline at end of file
+        self.assertAlmostEqual(self.game.game_state.player_nation.treasury, expected_treasury, places=2)
+
+    def start(self, project_id="build_ic_1", target="Ore Mining"):
+        nation = self.game.game_state.player_nation
+        return self.game.controller.start_project(nation, project_id, target, self.game.game_state)
+
+    def test_cancel_project_by_handle(self):
+        """Test that handles stay valid while positions shift."""
+        handles = [self.start() for _ in range(5)]
+        self.assertEqual(handles, [0, 1, 2, 3, 4])
+        self.game.process_command(Command("construction", {"type": "cancel_project", "handle": 1}))
+        self.game.process_command(Command("construction", {"type": "cancel_project", "handle": 4}))
+        nation = self.game.game_state.player_nation
+        self.assertEqual([project.handle for project in nation.active_projects], [0, 2])
+        self.assertEqual([project.handle for project in nation.project_queue], [3])
+        self.assertIsNone(nation.construction.get(1))
+        self.assertEqual(self.start(), 5)
+
+    def test_cancelling_from_the_middle_of_a_long_queue(self):
+        """Test that cancelled queued projects leave the queue, its upkeep and its predictions."""
+        definition = self.game.game_state.available_projects.get("build_ic_1")
+        scheduler = ConstructionScheduler()
+        for _ in range(1000):
+            project = ProjectInstance("build_ic_1", "Ore Mining", definition)
+            scheduler.add(project, slots=2)
+        cancelled = set(range(100, 900, 3))
+        for handle in sorted(cancelled):
+            self.assertEqual(scheduler.cancel(handle).handle, handle)
+        kept = [handle for handle in range(1000) if handle not in cancelled]
+        self.assertEqual(len(scheduler), len(kept))
+        self.assertEqual([project.handle for project in scheduler], kept)
+        self.assertEqual(scheduler.committed_upkeep(), len(kept) * definition['upkeep_cost'])
+        self.assertEqual(set(scheduler.completion_turns(0, 10.0, 2)), set(kept))
+        fork = scheduler.copy()
+        for _ in range(3):
+            scheduler.cancel(scheduler.active[0].handle)
+            scheduler.promote(2)
+        self.assertEqual([project.handle for project in scheduler.active], kept[3:5])
+        self.assertEqual([project.handle for project in scheduler.queued], kept[5:])
+        self.assertIsNone(scheduler.cancel_at(len(kept)))
+        self.assertEqual(scheduler.cancel_at(2).handle, kept[5])
+        self.assertEqual([project.handle for project in fork], kept)
+
+    def test_unknown_project_is_rejected(self):
+        """Test that an unknown project id is not queued."""
+        with self.assertLogs("defense_econ_game.commands", "WARNING"):
+            self.assertIsNone(self.start("no_such_project"))
+        self.assertEqual(len(self.game.game_state.player_nation.construction), 0)
+
+    def test_started_project_is_built(self):
+        """Test that a project started through the controller gains CP and completes."""
+        handle = self.start()
+        nation = self.game.game_state.player_nation
+        for _ in range(30):
+            self.run_command("end_turn")
+        self.assertIsNone(nation.construction.get(handle))
+        self.assertEqual(len(nation.active_projects), 0)
+
+    def test_queue_is_promoted_in_order(self):
+        """Test that queued projects fill freed slots in queue order."""
+        for _ in range(3):
+            self.start()
+        queued = [self.start("build_infrastructure_1", None), self.start(), self.start()]
+        nation = self.game.game_state.player_nation
+        while len(nation.project_queue) == 3:
+            self.run_command("end_turn")
+        self.assertEqual([project.handle for project in nation.project_queue], [])
+        self.run_command("end_turn")
+        self.assertEqual([project.handle for project in nation.active_projects], queued)
+
+    def test_completion_predictions_match_play_at_a_constant_rate(self):
+        """Test that predicted completion turns are exact while construction points stay constant."""
+        nation = self.game.game_state.player_nation
+        for project_id in ("build_ic_1", "build_ic_1", "build_infrastructure_1", "build_ic_1", "build_ic_1"):
+            self.start(project_id, "Ore Mining")
+        # A constant rate for the nation and the batched construction phase alike.
+        with mock.patch.object(economy_rules, "construction_points", side_effect=lambda ic, focus: ic * 0 + 12.5):
+            predicted = dict(nation.predict_project_completions(self.game.game_state.turn))
+            self.start()
+            # Appending to the queue extends the cached predictions instead of recomputing them.
+            with mock.patch.object(ConstructionScheduler, "_predict", side_effect=AssertionError):
+                predicted = dict(nation.predict_project_completions(self.game.game_state.turn))
+            completed = {}
+            while nation.construction:
+                before = {project.handle for project in nation.construction}
+                self.run_command("end_turn")
+                for handle in before - {project.handle for project in nation.construction}:
+                    completed[handle] = self.game.game_state.turn
+                # Predictions stay valid from turn to turn.
+                with mock.patch.object(ConstructionScheduler, "_predict", side_effect=AssertionError):
+                    nation.predict_project_completions(self.game.game_state.turn)
+        self.assertEqual(completed, predicted)
+        self.assertEqual(predicted, {0: 8, 1: 8, 2: 40, 3: 16, 4: 16, 5: 24})
+
+    def test_handles_survive_save_fork_and_load(self):
+        """Test that project handles are kept by forks and saved games."""
+        for _ in range(5):
+            self.start()
+        self.game.process_command(Command("construction", {"type": "cancel_project", "queue_index": 0}))
+        fork = self.game.game_state.fork()
+        self.assertEqual([project.handle for project in fork.player_nation.construction], [1, 2, 3, 4])
+        restored = persistence.restore(persistence.capture(self.game.game_state), Game(test_mode=True))
+        construction = restored.player_nation.construction
+        self.assertEqual([project.handle for project in construction.active], [1, 2])
+        self.assertEqual([project.handle for project in construction.queued], [3, 4])
+        self.assertEqual(construction.next_handle, 5)
@@ -1,14 +1,18 @@
+import unittest
+
+import numpy as np
+
 from tests.test_harness import TestHarness
 from src.commands import Command
-import copy
+from src.models import economy_rules
 
 class TestEconomy(TestHarness):
     def test_initial_treasury(self):
         self.assert_game_state("treasury", 1000)
 
     def test_treasury_gain_after_turn(self):
-        initial_nation_state = copy.deepcopy(self.game.game_state.player_nation)
-        initial_game_state = copy.deepcopy(self.game.game_state)
+        initial_game_state = self.game.game_state.fork()
+        initial_nation_state = initial_game_state.player_nation
         expected_treasury = self._simulate_treasury_change_for_turn(initial_nation_state, initial_game_state)
         self.run_command("end_turn")
         self.assertAlmostEqual(self.game.game_state.player_nation.treasury, expected_treasury, places=2)
@@ -20,16 +24,43 @@ class TestEconomy(TestHarness):
 
     def test_tax_rate_effect_on_treasury(self):
         self.game.process_command(Command("set_tax", 0.5))  # 50%
-        initial_nation_state = copy.deepcopy(self.game.game_state.player_nation)
-        initial_game_state = copy.deepcopy(self.game.game_state)
+        initial_game_state = self.game.game_state.fork()
+        initial_nation_state = initial_game_state.player_nation
         expected_treasury = self._simulate_treasury_change_for_turn(initial_nation_state, initial_game_state)
         self.run_command("end_turn")
         self.assertAlmostEqual(self.game.game_state.player_nation.treasury, expected_treasury, places=2)
 
     def test_social_spending_deduction(self):
         self.game.process_command(Command("budget", {"category": "social_spending", "amount": 100}))
-        initial_nation_state = copy.deepcopy(self.game.game_state.player_nation)
-        initial_game_state = copy.deepcopy(self.game.game_state)
+        initial_game_state = self.game.game_state.fork()
+        initial_nation_state = initial_game_state.player_nation
         expected_treasury = self._simulate_treasury_change_for_turn(initial_nation_state, initial_game_state)
         self.run_command("end_turn")
         self.assertAlmostEqual(self.game.game_state.player_nation.treasury, expected_treasury, places=2)
+
+class TestEconomyRules(unittest.TestCase):
+    def test_batched_rules_match_one_nation_at_a_time(self):
+        rng = np.random.default_rng(4)
+        opinion = rng.uniform(-10, 110, 200)
+        opinion[:4] = (25.0, 75.0, 0.0, 100.0)
+        social_spending, tax_rate = rng.uniform(0, 2000, 200), rng.uniform(0, 1, 200)
+        infrastructure, ic = rng.integers(1, 5, 200), rng.uniform(0, 500, 200)
+        focus = rng.random(200) < 0.5
+        batched = (
+            economy_rules.target_public_opinion(social_spending, tax_rate),
+            economy_rules.next_public_opinion(opinion.copy(), 60.0),
+            economy_rules.gdp_growth_rate(infrastructure, opinion, 0.002),
+            economy_rules.construction_points(ic, focus),
+        )
+        single = (
+            [economy_rules.target_public_opinion(s, t) for s, t in zip(social_spending.tolist(), tax_rate.tolist())],
+            [economy_rules.next_public_opinion(o, 60.0) for o in opinion.tolist()],
+            [economy_rules.gdp_growth_rate(i, o, 0.002) for i, o in zip(infrastructure.tolist(), opinion.tolist())],
+            [economy_rules.construction_points(c, f) for c, f in zip(ic.tolist(), focus.tolist())],
+        )
+        for values, expected in zip(batched, single):
+            self.assertEqual(values.tolist(), expected)
+
+    def test_reinvestment_shares(self):
+        shares = economy_rules.reinvestment_shares(np.array([[1.0, 3.0, -2.0], [-1.0, 0.0, -2.0]]))
+        self.assertEqual(shares.tolist(), [[0.25, 0.75, 0.0], [0.0, 0.0, 0.0]])
@@ -0,0 +1,119 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from src import persistence
+from src.game import Game, load_game_data
+from src.random_stream import stream_key, uniforms
+from src.models.event import Event
+from src.models.event_index import EventIndex
+from src.models.game_state import GameState
+from src.models.nation import Nation
+from src.commands import Command
+from tests.test_harness import TestHarness
+
+class TestEventIndex(unittest.TestCase):
+    def setUp(self):
+        self.game_state = GameState()
+        self.events = EventIndex([
+            Event("Late", "", 80, {"treasury": -1}),
+            Event("Early", "", 20, {"treasury": -1}),
+            Event("Dissonance", "", 5, {"public_opinion": -1}, trigger_meter="social_dissonance"),
+            Event("Scheduled", "", 3, {"treasury": 10}, trigger_meter="turn"),
+        ])
+
+    def test_nothing_fires_below_thresholds(self):
+        self.assertEqual(self.events.pop_triggered(self.game_state), [])
+        self.assertEqual(len(self.events), 4)
+
+    def test_events_fire_once_when_their_meter_crosses(self):
+        self.game_state.crisis_awareness = 50
+        self.game_state.turn = 3
+        fired = [event.name for event in self.events.pop_triggered(self.game_state)]
+        self.assertEqual(sorted(fired), ["Early", "Scheduled"])
+        self.assertEqual(self.events.pop_triggered(self.game_state), [])
+        self.game_state.crisis_awareness = 100
+        self.game_state.social_dissonance = 5
+        fired = [event.name for event in self.events.pop_triggered(self.game_state)]
+        self.assertEqual(sorted(fired), ["Dissonance", "Late"])
+        self.assertEqual(len(self.events), 0)
+
+    def test_compiled_effects_apply_to_nation(self):
+        nation = Nation("Test")
+        event = Event("Attack", "", 0, {"treasury": -200, "public_opinion": -5})
+        event.apply(nation)
+        self.assertEqual(nation.treasury, 800)
+        self.assertEqual(nation.public_opinion, 45.0)
+        pickle.loads(pickle.dumps(event)).apply(nation)
+        self.assertEqual(nation.treasury, 600)
+
+class TestRandomEvents(unittest.TestCase):
+    def setUp(self):
+        self.raid = Event("Raid", "", 10, {"treasury": -1}, base_chance=0.1)
+        self.events = EventIndex([Event("Threshold", "", 50, {"treasury": -1}), self.raid])
+        self.game_state = GameState()
+        self.game_state.seed = 42
+        self.game_state.crisis_awareness = 10
+        self.nations = [Nation(f"Nation {i}") for i in range(2000)]
+
+    def test_stream_is_counter_based(self):
+        nation_keys = np.array([stream_key(nation.name) for nation in self.nations], dtype=np.uint64)
+        event_keys = np.array([stream_key("Raid"), stream_key("Flood")], dtype=np.uint64)
+        draws = uniforms(42, 7, nation_keys, event_keys)
+        self.assertEqual(draws.shape, (2000, 2))
+        np.testing.assert_array_equal(uniforms(42, 7, nation_keys[1500:], event_keys), draws[1500:])
+        np.testing.assert_array_equal(uniforms(42, 7, nation_keys[::-1], event_keys[::-1]), draws[::-1, ::-1])
+        self.assertFalse(np.array_equal(uniforms(43, 7, nation_keys, event_keys), draws))
+        self.assertFalse(np.array_equal(uniforms(42, 8, nation_keys, event_keys), draws))
+        self.assertTrue(((draws >= 0) & (draws < 1)).all())
+
+    def test_random_events_recur_and_are_not_pending(self):
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.events.stochastic, (self.raid,))
+        self.assertEqual(self.events.copy().stochastic, (self.raid,))
+
+    def test_draws_scale_with_meters_and_respect_thresholds(self):
+        self.game_state.crisis_awareness = 5
+        self.assertEqual(self.events.draw(self.game_state, self.nations), [])
+        self.game_state.crisis_awareness = 10
+        calm = len(self.events.draw(self.game_state, self.nations))
+        self.game_state.crisis_awareness = 100
+        self.game_state.social_dissonance = 100
+        tense = len(self.events.draw(self.game_state, self.nations))
+        # 2000 nations at chances of 0.11 and 0.4.
+        self.assertTrue(150 < calm < 290, calm)
+        self.assertTrue(700 < tense < 900, tense)
+
+    def test_draws_do_not_depend_on_batching(self):
+        whole = self.events.draw(self.game_state, self.nations)
+        split = self.events.draw(self.game_state, self.nations[:700]) + self.events.draw(self.game_state, self.nations[700:])
+        self.assertEqual([nation.name for nation, _ in whole], [nation.name for nation, _ in split])
+
+    def test_games_with_the_same_seed_match(self):
+        def play(seed):
+            game = Game(test_mode=True, num_ai_nations=5, seed=seed)
+            game.game_state.available_events.add(Event("Windfall", "", 0, {"treasury": 1}, base_chance=0.3))
+            for _ in range(20):
+                game.process_command(Command("end_turn"))
+            return [nation.treasury for nation in game.game_state.nations]
+        self.assertEqual(play(1), play(1))
+        self.assertNotEqual(play(1), play(2))
+
+    def test_shipped_data_has_no_random_events(self):
+        self.assertEqual(Game(test_mode=True).game_state.available_events.stochastic, ())
+
+    def test_restored_games_keep_random_events(self):
+        data = load_game_data()
+        data["events"].append({"name": "Smuggler Raid", "description": "", "trigger_threshold": 0, "base_chance": 0.02, "effects": {"treasury": -100}})
+        game = Game(test_mode=True, data=data, seed=9)
+        restored = persistence.restore(persistence.capture(game.game_state), Game(test_mode=True, data=data))
+        self.assertEqual([event.name for event in restored.available_events.stochastic], ["Smuggler Raid"])
+        self.assertEqual(restored.seed, 9)
+
+class TestEventTriggering(TestHarness):
+    def test_crisis_event_applies_effects(self):
+        self.game.game_state.crisis_awareness = 50
+        self.run_command("end_turn")
+        self.assertEqual(len(self.game.game_state.available_events), 0)
+        self.assertLess(self.game.game_state.player_nation.public_opinion, 50.0)
@@ -0,0 +1,48 @@
+import unittest
+from src.game import Game
+from src.commands import Command
+
+class TestFastForward(unittest.TestCase):
+    def make_game(self):
+        game = Game(test_mode=True, num_ai_nations=2)
+        game.process_command(Command("research", "Industrialization"))
+        game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        for _ in range(4):
+            game.process_command(Command("construction", {"type": "start_project", "project_id": "build_infrastructure_1"}))
+        game.process_command(Command("budget", {"category": "social_spending", "amount": 3000}))
+        return game
+
+    def test_matches_step_by_step_execution(self):
+        stepped = self.make_game()
+        fast = self.make_game()
+        for _ in range(200):
+            stepped.process_command(Command("end_turn"))
+        self.assertEqual(fast.advance_until(turn=200), 200)
+        for expected, actual in zip(stepped.game_state.nations, fast.game_state.nations):
+            self.assertEqual(expected.treasury, actual.treasury)
+            self.assertEqual(expected.civilian_gdp, actual.civilian_gdp)
+            self.assertEqual(expected.public_opinion, actual.public_opinion)
+            self.assertEqual(expected.industrial_capacity, actual.industrial_capacity)
+            self.assertEqual(expected.infrastructure_level, actual.infrastructure_level)
+            self.assertEqual([t.name for t in expected.technologies], [t.name for t in actual.technologies])
+
+    def test_events_fire_during_fast_forward(self):
+        stepped = Game(test_mode=True)
+        fast = Game(test_mode=True)
+        stepped.game_state.crisis_awareness = fast.game_state.crisis_awareness = 50
+        for _ in range(3):
+            stepped.process_command(Command("end_turn"))
+        fast.advance_until(turn=3)
+        self.assertEqual(len(fast.game_state.available_events), 0)
+        self.assertEqual(fast.game_state.player_nation.treasury, stepped.game_state.player_nation.treasury)
+        self.assertEqual(fast.game_state.player_nation.public_opinion, stepped.game_state.player_nation.public_opinion)
+
+    def test_stops_on_condition(self):
+        game = self.make_game()
+        turns = game.advance_until(condition=lambda state: not state.player_nation.active_projects)
+        self.assertGreater(turns, 0)
+        self.assertEqual(game.game_state.player_nation.active_projects, [])
+
+    def test_requires_a_stopping_point(self):
+        with self.assertRaises(ValueError):
+            Game(test_mode=True).advance_until()
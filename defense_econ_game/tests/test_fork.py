@@ -0,0 +1,99 @@
+import copy
+import pickle
+from src.commands import Command
+from tests.test_harness import TestHarness
+from src.game import Game
+from src import persistence
+
+class TestFork(TestHarness):
+    def test_fork_shares_definitions(self):
+        fork = self.game.game_state.fork()
+        self.assertIs(fork.available_projects, self.game.game_state.available_projects)
+        self.assertIs(fork.available_technologies, self.game.game_state.available_technologies)
+
+    def test_nations_are_copied_and_definitions_shared(self):
+        game = Game(test_mode=True, num_ai_nations=3)
+        fork = game.game_state.fork()
+        self.assertIsNot(fork.player_nation, game.game_state.player_nation)
+        self.assertIsNot(fork.ai_nations[0], game.game_state.ai_nations[0])
+        self.assertIsNot(fork.player_nation.industries[0], game.game_state.player_nation.industries[0])
+        self.assertIs(fork.player_nation.industries[0].definition, game.game_state.player_nation.industries[0].definition)
+
+    def test_forks_copy_only_the_nations_they_take(self):
+        game = Game(test_mode=True, num_ai_nations=3)
+        parent = game.game_state.read_nations()
+        fork = game.game_state.fork()
+        self.assertTrue(all(ours is theirs for ours, theirs in zip(fork.read_nations(), parent)))
+        persistence.state_hash(fork)
+        fork.nation_at(2).treasury = 5
+        self.assertEqual([nation is original for nation, original in zip(fork.read_nations(), parent)], [True, True, False, True])
+        self.assertEqual(parent[2].treasury, 1000)
+        self.assertIs(fork.nation_at(2), fork.read_nations()[2])
+
+    def test_parent_changes_hand_sharing_forks_one_copy(self):
+        game = Game(test_mode=True, num_ai_nations=2)
+        first, second = game.game_state.fork(), game.game_state.fork()
+        original = game.game_state.read_nations()
+        game.game_state.nation_at(1).treasury = 5
+        self.assertEqual(game.game_state.read_nations(), original)
+        snapshot = first.read_nations()[1]
+        self.assertIs(second.read_nations()[1], snapshot)
+        self.assertIsNot(snapshot, original[1])
+        self.assertEqual(snapshot.treasury, 1000)
+        self.assertIs(first.read_nations()[2], original[2])
+        first.nation_at(1).treasury = 7
+        self.assertEqual(second.nation_at(1).treasury, 1000)
+
+    def test_fork_mutations_do_not_leak_into_parent(self):
+        parent_nation = self.game.game_state.player_nation
+        fork = self.game.game_state.fork()
+        fork_game = Game(test_mode=True)
+        fork_game.game_state = fork
+        fork_game.process_command(Command("research", "Industrialization"))
+        fork_game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        for _ in range(5):
+            fork_game.process_command(Command("end_turn"))
+        self.assertIs(self.game.game_state.player_nation, parent_nation)
+        self.assertEqual(parent_nation.treasury, 1000)
+        self.assertEqual(parent_nation.technologies, [])
+        self.assertEqual(parent_nation.active_projects, [])
+        self.assertEqual(self.game.game_state.turn, 0)
+        self.assertEqual(fork.turn, 5)
+
+    def test_parent_mutations_do_not_leak_into_fork(self):
+        fork = self.game.game_state.fork()
+        self.run_command("end_turn")
+        self.assertEqual(fork.player_nation.treasury, 1000)
+        self.assertEqual(fork.player_nation.civilian_gdp, 10000.0)
+
+    def test_direct_parent_mutations_do_not_leak_into_fork(self):
+        fork = self.game.game_state.fork()
+        parent_nation = self.game.game_state.player_nation
+        parent_nation.treasury = 5
+        parent_nation.industries[0].government_ic += 10
+        self.game.controller.set_tax_rate(parent_nation, 0.3)
+        self.assertEqual(fork.player_nation.treasury, 1000)
+        self.assertEqual(fork.player_nation.tax_rate, 0.15)
+        self.assertEqual(fork.player_nation.industries[0].government_ic, parent_nation.industries[0].government_ic - 10)
+
+    def test_nested_forks_are_isolated_from_the_root(self):
+        child = self.game.game_state.fork()
+        grandchild = child.fork()
+        self.run_command("end_turn")
+        self.assertEqual(child.player_nation.treasury, 1000)
+        self.assertEqual(grandchild.player_nation.treasury, 1000)
+
+    def test_fork_projection_matches_deepcopy(self):
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        fork = self.game.game_state.fork()
+        deep = copy.deepcopy(self.game.game_state)
+        self.assertEqual(
+            fork.player_nation.calculate_projected_treasury_change(),
+            deep.player_nation.calculate_projected_treasury_change(),
+        )
+
+    def test_forks_can_be_pickled(self):
+        fork = self.game.game_state.fork()
+        restored = pickle.loads(pickle.dumps(fork))
+        self.assertEqual(restored.player_nation.treasury, 1000)
+        self.assertEqual(len(restored.player_nation.industries), len(self.game.game_state.player_nation.industries))
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.game import Game
+from src.game_data import CACHE_DIR, DATA_DIR, GameDataError, cache_directory, clear_cache, get_game_data, load_game_data, validate_game_data
+
+class TestGameData(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.directory, "data")
+        self.cache_dir = os.path.join(self.directory, "cache")
+        shutil.copytree(DATA_DIR, self.data_dir)
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(clear_cache)
+
+    def test_data_is_compiled_once_per_process(self):
+        first = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        self.assertIs(get_game_data(self.data_dir, cache_dir=self.cache_dir), first)
+
+    def test_games_share_definitions_but_not_state(self):
+        data = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        first = Game(test_mode=True, data=data)
+        second = Game(test_mode=True, data=data)
+        self.assertIs(first.game_state.available_technologies, second.game_state.available_technologies)
+        self.assertIsNot(first.game_state.available_events, second.game_state.available_events)
+        self.assertIsNot(first.game_state.player_nation.get_industry("Ore Mining"), second.game_state.player_nation.get_industry("Ore Mining"))
+        first.game_state.crisis_awareness = 100
+        first.controller._process_end_turn(first.game_state)
+        self.assertEqual(len(first.game_state.available_events), 0)
+        self.assertEqual(len(second.game_state.available_events), 1)
+
+    def test_later_processes_load_the_precompiled_cache(self):
+        original = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        clear_cache()
+        with mock.patch("src.game_data.compile_game_data", side_effect=AssertionError("recompiled")):
+            cached = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        self.assertIsNot(cached, original)
+        self.assertEqual(cached.content_hash, original.content_hash)
+        self.assertEqual(list(cached.technologies.keys()), list(original.technologies.keys()))
+        tech = cached.technologies.get("Industrialization")
+        self.assertIs(tech.unlocked_industries[0], cached.industries.get("Metal Refineries"))
+
+    def test_changed_files_are_recompiled(self):
+        original = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        path = os.path.join(self.data_dir, "projects.json")
+        with open(path) as f:
+            projects = json.load(f)
+        projects[0]["cp_cost"] = 250
+        with open(path, "w") as f:
+            json.dump(projects, f)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        changed = get_game_data(self.data_dir, cache_dir=self.cache_dir)
+        self.assertNotEqual(changed.content_hash, original.content_hash)
+        self.assertEqual(changed.projects.get("build_ic_1").cp_cost, 250)
+
+    def test_cache_directory_comes_from_the_environment_when_loading(self):
+        # The test suite points the cache at a temporary directory.
+        self.assertNotEqual(cache_directory(), CACHE_DIR)
+        with mock.patch.dict(os.environ, {"DEFENSE_ECON_CACHE_DIR": self.cache_dir}):
+            get_game_data(self.data_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_validation_rejects_inconsistent_data(self):
+        data = load_game_data(self.data_dir)
+        data["technologies"][0]["unlocks_industries"].append("Moon Mining")
+        with self.assertRaises(GameDataError):
+            validate_game_data(data)
+
+        data = load_game_data(self.data_dir)
+        data["projects"].append(dict(data["projects"][0]))
+        with self.assertRaisesRegex(GameDataError, "duplicate id"):
+            validate_game_data(data)
+
+        data = load_game_data(self.data_dir)
+        del data["events"][0]["trigger_threshold"]
+        with self.assertRaisesRegex(GameDataError, "missing trigger_threshold"):
+            validate_game_data(data)
+
+        data = load_game_data(self.data_dir)
+        data["events"][0]["base_chance"] = 1.5
+        with self.assertRaisesRegex(GameDataError, "base_chance"):
+            validate_game_data(data)
+
+if __name__ == '__main__':
+    unittest.main()
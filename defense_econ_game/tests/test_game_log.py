@@ -0,0 +1,100 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from src.game import Game
+from src.game_log import ROOT, configure_logging, get_logger
+from src.commands import Command
+
+class TestGameLog(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True, num_ai_nations=2)
+        self.game.game_state.player_nation.research_points = 10000
+        self.game.game_state.ai_nations[0].research_points = 10000
+
+    def research_everywhere(self, tech_name="Industrialization"):
+        for nation in self.game.game_state.nations:
+            self.game.controller.execute_command(self.game.game_state, Command("research", tech_name), nation)
+
+    def end_turns(self, count):
+        for _ in range(count):
+            self.game.process_command(Command("end_turn"))
+
+    def test_unconfigured_logging_is_disabled_and_silent(self):
+        for subsystem in ("economy", "research", "commands"):
+            logger = get_logger(subsystem)
+            self.assertFalse(logger.isEnabledFor(logging.INFO))
+            self.assertTrue(logger.isEnabledFor(logging.WARNING))
+
+    def test_console_shows_player_messages_only(self):
+        stream = io.StringIO()
+        self.research_everywhere()
+        with configure_logging(stream=stream):
+            self.end_turns(1)
+        output = stream.getvalue()
+        self.assertEqual(output.count("Technology researched: Industrialization"), 1)
+        self.assertNotIn("income", output)
+        self.assertFalse(get_logger("research").isEnabledFor(logging.INFO))
+
+    def test_other_nations_policies_are_debug(self):
+        stream = io.StringIO()
+        industry = self.game.game_state.player_nation.industries[0].name
+        policy = Command("policy", {"industry": industry, "type": "tax break", "amount": 0.1})
+        with configure_logging(stream=stream, ring_turns=1) as session:
+            for nation in self.game.game_state.nations:
+                self.game.controller.execute_command(self.game.game_state, policy, nation)
+            levels = {record.nation: record.levelname for record in session.ring.records() if record.getMessage().startswith("Tax rate")}
+        self.assertEqual(stream.getvalue().count("Tax rate"), 1)
+        self.assertEqual(levels, {"Player": "INFO", "AI Nation 1": "DEBUG", "AI Nation 2": "DEBUG"})
+
+    def test_ring_buffer_keeps_last_turns_with_debug_breakdowns(self):
+        with configure_logging(console_level=None, ring_turns=2) as session:
+            self.end_turns(4)
+            self.assertEqual(session.ring.kept_turns(), [2, 3])
+            economy = [record for record in session.ring.records(turn=3) if record.name == f"{ROOT}.economy"]
+            self.assertEqual(len(economy), len(self.game.game_state.nations))
+            self.assertEqual({record.nation for record in economy}, {nation.name for nation in self.game.game_state.nations})
+            self.assertIn("[turn 3]", session.ring.dump(turn=3))
+
+    def test_file_gets_json_lines_with_turn_and_fields(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.log")
+            self.research_everywhere()
+            with configure_logging(console_level=None, file=path):
+                self.end_turns(2)
+            with open(path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+        researched = [entry for entry in entries if entry["message"].startswith("Technology researched")]
+        self.assertEqual(sorted(entry["nation"] for entry in researched), ["AI Nation 1", "AI Nation 2", "Player"])
+        self.assertEqual({entry["level"] for entry in researched}, {"INFO", "DEBUG"})
+        economy = [entry for entry in entries if entry["logger"] == "economy"]
+        self.assertEqual([entry["turn"] for entry in economy], [0, 0, 0, 1, 1, 1])
+        self.assertIn("treasury", economy[0])
+
+    def test_subsystem_levels_override_handler_levels(self):
+        self.research_everywhere()
+        with configure_logging(console_level=None, ring_turns=1, levels={"economy": "WARNING"}) as session:
+            self.end_turns(1)
+            names = {record.name for record in session.ring.records()}
+        self.assertNotIn(f"{ROOT}.economy", names)
+        self.assertIn(f"{ROOT}.research", names)
+        self.assertEqual(get_logger("economy").level, logging.NOTSET)
+
+    def test_invalid_commands_log_warnings(self):
+        with self.assertLogs(get_logger("commands"), logging.WARNING) as captured:
+            self.game.process_command(Command("research", "No Such Technology"))
+        self.assertEqual(captured.records[0].technology, "No Such Technology")
+
+    def test_close_restores_unconfigured_state(self):
+        root = logging.getLogger(ROOT)
+        handlers = list(root.handlers)
+        configure_logging(console_level="DEBUG", ring_turns=1).close()
+        self.assertEqual(root.handlers, handlers)
+        self.assertEqual(root.level, logging.WARNING)
+        self.assertTrue(root.propagate)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,6 @@
 import unittest
 from src.game import Game
 from src.commands import Command
-import copy
 
 class TestHarness(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,51 @@
+import unittest
+from src.game import Game
+from src.commands import Command
+from src.models.industry import Industry
+from src.models.industry_ledger import IndustryLedger
+
+class TestIndustryLedger(unittest.TestCase):
+    def setUp(self):
+        self.object_game = Game(test_mode=True)
+        self.ledger_game = Game(test_mode=True, use_ledger=True)
+
+    def process_both(self, command):
+        self.object_game.process_command(command)
+        self.ledger_game.process_command(command)
+
+    def assert_nations_match(self):
+        object_nation = self.object_game.game_state.player_nation
+        ledger_nation = self.ledger_game.game_state.player_nation
+        self.assertAlmostEqual(object_nation.treasury, ledger_nation.treasury, places=6)
+        self.assertAlmostEqual(object_nation.industrial_capacity, ledger_nation.industrial_capacity, places=6)
+        for object_industry, ledger_industry in zip(object_nation.industries, ledger_nation.industries):
+            self.assertEqual(object_industry.name, ledger_industry.name)
+            self.assertAlmostEqual(object_industry.private_ic, ledger_industry.private_ic, places=6)
+            self.assertAlmostEqual(object_industry.government_ic, ledger_industry.government_ic, places=6)
+
+    def test_view_writes_through_to_columns(self):
+        ledger = IndustryLedger(capacity=1)
+        first = ledger.append(Industry("Ore Mining", 1, 1.0, government_ic=5.0, private_ic=5.0))
+        second = ledger.append(Industry("Food Production", 1, 1.2, government_ic=5.0, private_ic=5.0))
+        second.private_ic += 2.5
+        self.assertEqual(ledger.column("private_ic").tolist(), [5.0, 7.5])
+        self.assertEqual(first.ic, 10.0)
+        self.assertAlmostEqual(second.profitability, 1.2 * 0.8)
+
+    def test_income_matches_object_path(self):
+        object_nation = self.object_game.game_state.player_nation
+        ledger_nation = self.ledger_game.game_state.player_nation
+        for expected, actual in zip(object_nation.calculate_industry_income(), ledger_nation.calculate_industry_income()):
+            self.assertAlmostEqual(expected, actual, places=9)
+        for expected, actual in zip(object_nation.get_reinvestment_shares(), ledger_nation.get_reinvestment_shares()):
+            self.assertAlmostEqual(expected, actual, places=9)
+
+    def test_turns_match_object_path(self):
+        self.process_both(Command("policy", {"industry": "Food Production", "type": "tax break", "amount": 0.05}))
+        self.process_both(Command("policy", {"industry": "Ore Mining", "type": "subsidy", "amount": 50}))
+        self.process_both(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        self.process_both(Command("research", "Industrialization"))
+        for _ in range(20):
+            self.process_both(Command("end_turn"))
+            self.assert_nations_match()
+        self.assertEqual(len(self.object_game.game_state.player_nation.industries), len(self.ledger_game.game_state.player_nation.industries))
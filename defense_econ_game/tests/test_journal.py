@@ -0,0 +1,113 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from tests.test_harness import TestHarness
+from src.game import Game
+from src.commands import Command
+from src.journal import CommandJournal, find_divergence
+from src import persistence
+
+class TestJournal(TestHarness):
+    def setUp(self):
+        super().setUp()
+        self.journal = CommandJournal(checkpoint_interval=5)
+        self.journal.attach(self.game)
+        self.states = {0: persistence.capture(self.game.game_state)}
+
+    def play(self, turns):
+        """Ends turns, remembering the state at the start of each turn."""
+        for _ in range(turns):
+            self.run_command("end_turn")
+            self.states[self.game.game_state.turn] = persistence.capture(self.game.game_state)
+
+    def play_session(self):
+        self.game.process_command(Command("research", "Industrialization"))
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        self.play(7)
+        self.run_command("set_tax", 0.3)
+        self.run_command("start_project", "build_infrastructure_1")
+        self.play(6)
+        self.game.process_command(Command("research", "Efficient Private Investment"))
+        self.play(9)
+
+    def assert_same_state(self, game_state, snapshot):
+        actual = persistence.capture(game_state)
+        self.assertEqual(actual.structure, snapshot.structure)
+        for name, values in snapshot.arrays.items():
+            np.testing.assert_array_equal(actual.arrays[name], values, err_msg=name)
+
+    def test_replay_reproduces_the_session(self):
+        self.play_session()
+        final = persistence.capture(self.game.game_state)
+        self.assert_same_state(self.journal.replay(Game(test_mode=True)), final)
+
+    def test_checkpoints_are_taken_every_interval(self):
+        self.play_session()
+        self.assertEqual([checkpoint.turn for checkpoint in self.journal.checkpoints], [0, 5, 10, 15, 20])
+        self.assertEqual(self.journal.last_turn, 22)
+
+    def test_seek_restores_the_start_of_any_turn(self):
+        self.play_session()
+        game = Game(test_mode=True)
+        for turn in (0, 3, 7, 8, 13, 22):
+            self.assert_same_state(self.journal.seek(game, turn=turn), self.states[turn])
+        self.assertEqual(game.game_state.turn, 22)
+        with self.assertRaises(ValueError):
+            self.journal.seek(game, turn=23)
+
+    def test_seek_replays_only_from_the_nearest_checkpoint(self):
+        self.play_session()
+        game = Game(test_mode=True)
+        with mock.patch.object(game.controller, "execute_command", wraps=game.controller.execute_command) as execute:
+            self.journal.seek(game, turn=18)
+        self.assertEqual(execute.call_count, 3)
+
+    def test_fast_forward_is_journaled(self):
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        self.game.advance_until(turn=12)
+        self.play(2)
+        self.assertEqual(self.journal.entries[1].command.payload, {"turn": 12})
+        game = Game(test_mode=True)
+        self.assert_same_state(self.journal.seek(game, turn=14), self.states[14])
+        self.assertEqual(self.journal.seek(game, turn=9).turn, 9)
+
+    def test_bisect_finds_the_first_matching_turn(self):
+        self.play_session()
+        game = Game(test_mode=True)
+        threshold = self.states[11].arrays["nation.treasury"][0]
+        turn = self.journal.bisect(game, lambda game_state, turn: game_state.player_nation.treasury >= threshold)
+        self.assertEqual(turn, 11)
+        self.assertIsNone(self.journal.bisect(game, lambda game_state, turn: False))
+
+    def test_find_divergence(self):
+        self.play_session()
+        reference = {turn: float(snapshot.arrays["nation.civilian_gdp"][0]) for turn, snapshot in self.states.items()}
+        game = Game(test_mode=True)
+        metric = lambda game_state: game_state.player_nation.civilian_gdp
+        self.assertIsNone(find_divergence(self.journal, game, metric, reference))
+        for turn in range(16, 23):
+            reference[turn] += 1.0
+        self.assertEqual(find_divergence(self.journal, game, metric, reference), 16)
+
+    def test_journal_streams_to_disk_and_reopens(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        game = Game(test_mode=True)
+        with CommandJournal(directory, checkpoint_interval=4) as journal:
+            journal.attach(game)
+            game.process_command(Command("research", "Industrialization"))
+            for _ in range(10):
+                game.process_command(Command("end_turn"))
+        final = persistence.capture(game.game_state)
+
+        reopened = CommandJournal.open(directory)
+        self.assertEqual(len(reopened.entries), 11)
+        self.assertEqual([checkpoint.turn for checkpoint in reopened.checkpoints], [0, 4, 8])
+        self.assertTrue(all(checkpoint.snapshot is None for checkpoint in reopened.checkpoints))
+        self.assert_same_state(reopened.seek(Game(test_mode=True)), final)
+        self.assertIsNone(reopened.checkpoints[0].snapshot)
+
+if __name__ == '__main__':
+    unittest.main()
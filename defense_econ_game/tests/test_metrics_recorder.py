@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.game import Game
+from src.commands import Command
+from src.metrics_recorder import MetricsRecorder
+from src.models.industry import Industry
+
+class TestMetricsRecorder(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True, num_ai_nations=2)
+
+    def end_turns(self, count):
+        for _ in range(count):
+            self.game.process_command(Command("end_turn"))
+
+    def test_records_every_nation_after_each_turn(self):
+        recorder = MetricsRecorder(capacity=10)
+        recorder.attach(self.game)
+        self.end_turns(3)
+        self.assertEqual(list(recorder.turns), [1, 2, 3])
+        treasury = recorder.nation("treasury")
+        self.assertEqual(treasury.shape, (3, 3))
+        self.assertEqual(recorder.nation_names, [nation.name for nation in self.game.game_state.nations])
+        self.assertEqual(list(treasury[-1]), [nation.treasury for nation in self.game.game_state.nations])
+        self.assertEqual(recorder.nation("infrastructure_level").dtype, np.int64)
+        self.assertFalse(treasury.flags.writeable)
+
+    def test_ring_keeps_latest_samples_as_contiguous_view(self):
+        recorder = MetricsRecorder(capacity=4)
+        recorder.attach(self.game)
+        self.end_turns(11)
+        self.assertEqual(list(recorder.turns), [8, 9, 10, 11])
+        treasury = recorder.nation("treasury")
+        self.assertTrue(np.shares_memory(treasury, recorder._nation["treasury"]))
+        self.assertEqual(treasury[-1, 0], self.game.game_state.player_nation.treasury)
+
+    def test_downsample_keeps_whole_run_at_lower_resolution(self):
+        recorder = MetricsRecorder(capacity=4, downsample=True)
+        recorder.attach(self.game)
+        self.end_turns(10)
+        # Full at 4 samples keeps turns 2 and 4; full again at turn 8 keeps 4 and 8.
+        self.assertEqual(list(recorder.turns), [4, 8])
+        self.assertEqual(recorder.every, 4)
+        self.end_turns(2)
+        self.assertEqual(list(recorder.turns), [4, 8, 12])
+
+    def test_new_industry_columns_are_backfilled(self):
+        recorder = MetricsRecorder(capacity=10)
+        recorder.attach(self.game)
+        self.end_turns(2)
+        columns = len(recorder.industry_columns)
+        self.game.game_state.player_nation.add_industry(Industry("Test Works", 1, government_ic=5.0))
+        self.end_turns(1)
+        self.assertEqual(len(recorder.industry_columns), columns + 1)
+        self.assertEqual(recorder.industry_columns[-1], (self.game.game_state.player_nation.name, "Test Works"))
+        ic = recorder.industry("government_ic")[:, -1]
+        self.assertTrue(np.isnan(ic[:2]).all())
+        self.assertEqual(ic[2], 5.0)
+        self.assertEqual(list(recorder.industry("level")[:2, -1]), [-1, -1])
+        player = recorder.industry("government_ic", nation=self.game.game_state.player_nation.name)
+        self.assertEqual(player.shape[1], len(self.game.game_state.player_nation.industries))
+
+    def test_industrial_capacity_matches_nations(self):
+        recorder = MetricsRecorder(capacity=10)
+        recorder.attach(self.game)
+        self.end_turns(2)
+        expected = [nation.industrial_capacity for nation in self.game.game_state.nations]
+        np.testing.assert_allclose(recorder.industrial_capacity()[-1], expected)
+
+    def test_fast_forwarded_turns_are_recorded(self):
+        recorder = MetricsRecorder(capacity=50)
+        recorder.attach(self.game)
+        self.game.controller.advance_until(self.game.game_state, turn=20)
+        self.assertEqual(list(recorder.turns), list(range(1, 21)))
+        self.assertEqual(recorder.nation("treasury")[-1, 0], self.game.game_state.player_nation.treasury)
+
+    def test_detach_stops_recording(self):
+        recorder = MetricsRecorder()
+        recorder.attach(self.game)
+        self.end_turns(1)
+        recorder.detach()
+        self.end_turns(1)
+        self.assertEqual(len(recorder), 1)
+
+    def test_csv_and_npy_export_round_trip(self):
+        recorder = MetricsRecorder(capacity=5)
+        recorder.attach(self.game)
+        self.end_turns(7)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.csv")
+            recorder.to_csv(path)
+            with open(path) as f:
+                header = f.readline().strip().split(",")
+            self.assertEqual(header, recorder.columns())
+            table = np.loadtxt(path, delimiter=",", skiprows=1)
+            self.assertEqual(list(table[:, 0]), [3, 4, 5, 6, 7])
+            first = header.index(f"{recorder.nation_names[0]}.treasury")
+            np.testing.assert_array_equal(table[:, first], recorder.nation("treasury")[:, 0])
+
+            recorder.save_npy(directory)
+            np.testing.assert_array_equal(np.load(os.path.join(directory, "nation.treasury.npy")), recorder.nation("treasury"))
+            np.testing.assert_array_equal(np.load(os.path.join(directory, "industry.private_ic.npy")), recorder.industry("private_ic"))
+            with open(os.path.join(directory, "columns.json")) as f:
+                self.assertEqual(json.load(f)["nations"], recorder.nation_names)
+
+if __name__ == '__main__':
+    unittest.main()
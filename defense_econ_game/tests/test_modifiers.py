@@ -0,0 +1,46 @@
+import unittest
+from src.models.modifiers import ModifierRegistry
+from src.commands import Command
+from tests.test_harness import TestHarness
+
+class TestModifierRegistry(unittest.TestCase):
+    def test_sources_are_aggregated_per_stat_and_target(self):
+        registry = ModifierRegistry()
+        registry.set_source(("technology", "A"), [("gdp_growth_modifier", None, 0.001)])
+        registry.set_source(("technology", "B"), [("gdp_growth_modifier", None, 0.002), ("research_bonus", "C", 0.1)])
+        self.assertAlmostEqual(registry.get("gdp_growth_modifier"), 0.003)
+        self.assertAlmostEqual(registry.get("research_bonus", "C"), 0.1)
+        self.assertEqual(registry.get("research_bonus", "D"), 0.0)
+
+    def test_replacing_and_removing_a_source(self):
+        registry = ModifierRegistry()
+        registry.set_source(("policy", "P"), [("gdp_growth_modifier", None, 0.5)])
+        registry.set_source(("policy", "P"), [("gdp_growth_modifier", None, 0.25)])
+        self.assertEqual(registry.get("gdp_growth_modifier"), 0.25)
+        registry.remove_source(("policy", "P"))
+        self.assertEqual(registry.get("gdp_growth_modifier"), 0.0)
+
+class TestNationModifiers(TestHarness):
+    def test_research_bonus_matches_level_bonuses(self):
+        nation = self.game.game_state.player_nation
+        self.game.process_command(Command("research", "Advanced Manufacturing"))
+        expected = sum(
+            bonus['research_bonus']['bonus_per_level'] * industry.level
+            for industry in nation.industries for bonus in industry.level_bonuses
+            if bonus['level'] <= industry.level and bonus['research_bonus']['technology_name'] == "Advanced Manufacturing"
+        )
+        self.assertAlmostEqual(nation.get_effective_research_points(), nation.research_points * (1 + expected))
+
+    def test_industry_level_up_updates_research_bonus(self):
+        nation = self.game.game_state.player_nation
+        self.game.process_command(Command("research", "Advanced Manufacturing"))
+        before = nation.get_effective_research_points()
+        nation.set_industry_level(nation.get_industry("Ore Mining"), 3)
+        self.assertAlmostEqual(nation.get_effective_research_points() - before, nation.research_points * 0.05 * 2)
+
+    def test_completed_technology_adds_gdp_growth(self):
+        nation = self.game.game_state.player_nation
+        before = nation.get_gdp_growth_rate()
+        nation.add_technology(self.game.game_state.available_technologies.get("Industrialization"))
+        self.assertAlmostEqual(nation.get_gdp_growth_rate() - before, 0.001)
+
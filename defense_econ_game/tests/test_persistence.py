@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.game import Game
+from src.commands import Command
+from src import persistence
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.game = Game(test_mode=True, num_ai_nations=2)
+        self.game.process_command(Command("research", "Advanced Manufacturing"))
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        for _ in range(3):
+            self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_infrastructure_1"}))
+        self.game.process_command(Command("policy", {"industry": "Food Production", "type": "tax break", "amount": 0.05}))
+        self.end_turns(self.game, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def end_turns(self, game, turns):
+        for _ in range(turns):
+            game.process_command(Command("end_turn"))
+
+    def restored_game(self, game_state):
+        game = Game(test_mode=True)
+        game.game_state = game_state
+        return game
+
+    def assert_same_future(self, restored):
+        self.end_turns(self.game, 5)
+        self.end_turns(restored, 5)
+        for original, loaded in zip(self.game.game_state.nations, restored.game_state.nations):
+            self.assertEqual(original.name, loaded.name)
+            self.assertEqual(original.treasury, loaded.treasury)
+            self.assertEqual(original.civilian_gdp, loaded.civilian_gdp)
+            self.assertEqual(original.industrial_capacity, loaded.industrial_capacity)
+            self.assertEqual(len(original.project_queue), len(loaded.project_queue))
+            self.assertEqual([t.name for t in original.technologies], [t.name for t in loaded.technologies])
+
+    def test_full_snapshot_round_trip(self):
+        path = os.path.join(self.directory, "game.sav")
+        persistence.save_game(self.game.game_state, path)
+        restored = self.restored_game(persistence.load_game(path, Game(test_mode=True)))
+        self.assertEqual(restored.game_state.turn, self.game.game_state.turn)
+        self.assertEqual(restored.game_state.player_nation.current_research.rp_progress, self.game.game_state.player_nation.current_research.rp_progress)
+        self.assert_same_future(restored)
+
+    def test_delta_checkpoint_round_trip(self):
+        base_path = os.path.join(self.directory, "base.sav")
+        delta_path = os.path.join(self.directory, "delta.sav")
+        persistence.save_game(self.game.game_state, base_path)
+        self.end_turns(self.game, 4)
+        base = persistence.load_snapshot(base_path)
+        persistence.save_checkpoint(self.game.game_state, delta_path, base)
+        restored = self.restored_game(persistence.load_game(delta_path, Game(test_mode=True), base=base))
+        self.assertEqual(restored.game_state.turn, self.game.game_state.turn)
+        self.assert_same_future(restored)
+
+    def test_delta_requires_matching_base(self):
+        base = persistence.save_game(self.game.game_state, os.path.join(self.directory, "base.sav"))
+        delta_path = os.path.join(self.directory, "delta.sav")
+        persistence.save_checkpoint(self.game.game_state, delta_path, base)
+        with self.assertRaises(ValueError):
+            persistence.load_snapshot(delta_path)
+        other = persistence.save_game(self.game.game_state, os.path.join(self.directory, "other.sav"))
+        with self.assertRaises(ValueError):
+            persistence.load_snapshot(delta_path, base=other)
+
+    def test_snapshot_arrays_are_memory_mapped(self):
+        path = os.path.join(self.directory, "game.sav")
+        persistence.save_game(self.game.game_state, path)
+        snapshot = persistence.load_snapshot(path)
+        self.assertFalse(snapshot.arrays["nation.treasury"].flags.writeable)
+        self.assertEqual(len(snapshot.arrays["nation.treasury"]), 3)
+
+    def test_json_export_round_trip(self):
+        path = os.path.join(self.directory, "game.json")
+        persistence.export_json(self.game.game_state, path)
+        self.assert_same_future(self.restored_game(persistence.import_json(path, Game(test_mode=True))))
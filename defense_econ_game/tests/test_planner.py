@@ -0,0 +1,92 @@
+import io
+import unittest
+from tests.test_harness import TestHarness
+from src.game import Game
+from src.commands import Command
+from src.controller.planner import Planner
+from src.view.cli_view import CLIView
+from src import persistence
+
+class TestPlanner(TestHarness):
+    def replay(self, plan, num_ai_nations=0):
+        """Plays a plan on a fresh game and returns the player nation afterwards."""
+        game = Game(test_mode=True, num_ai_nations=num_ai_nations)
+        for command in plan.actions:
+            if command is not None:
+                game.process_command(command)
+            game.process_command(Command("end_turn"))
+        return game.game_state.player_nation
+
+    def test_candidate_actions(self):
+        nation = self.game.game_state.player_nation
+        actions = Planner(construction_targets=1).candidate_actions(self.game.game_state, nation)
+        described = [(command.type, command.payload) if command else None for command in actions]
+        self.assertIsNone(described[0])
+        self.assertIn(("research", "Industrialization"), described)
+        self.assertIn(("construction", {"type": "start_project", "project_id": "build_infrastructure_1", "target": None}), described)
+        self.assertIn(("set_tax", 0.17), described)
+        self.assertIn(("set_tax", 0.13), described)
+        self.assertIn(("budget", {"category": "social_spending", "amount": 100}), described)
+        self.assertNotIn(("budget", {"category": "social_spending", "amount": -100}), described)
+
+    def test_plan_leaves_the_game_untouched_and_replays_to_its_score(self):
+        before = persistence.state_hash(self.game.game_state)
+        plan = Planner(horizon=4).plan(self.game.game_state)
+        self.assertEqual(persistence.state_hash(self.game.game_state), before)
+        self.assertEqual(len(plan.actions), 4)
+        self.assertEqual(self.replay(plan).treasury, plan.score)
+
+    def test_plan_beats_doing_nothing(self):
+        plan = Planner(horizon=4, objective="civilian_gdp").plan(self.game.game_state)
+        idle = Game(test_mode=True)
+        idle.advance_until(turn=4)
+        self.assertGreaterEqual(plan.score, idle.game_state.player_nation.civilian_gdp)
+        self.assertGreater(Planner(horizon=4).plan(self.game.game_state).score, idle.game_state.player_nation.treasury)
+
+    def test_transposition_cache(self):
+        planner = Planner(horizon=3)
+        first = planner.plan(self.game.game_state)
+        second = planner.plan(self.game.game_state)
+        self.assertGreater(first.evaluated, 0)
+        self.assertEqual(second.evaluated, 0)
+        self.assertEqual(second.cache_hits, first.evaluated + first.cache_hits)
+        self.assertEqual(second.score, first.score)
+
+    def test_state_hash_is_canonical(self):
+        fork = self.game.game_state.fork()
+        fork_game = Game(test_mode=True)
+        fork_game.game_state = fork
+        fork_game.process_command(Command("set_tax", 0.2))
+        self.assertNotEqual(persistence.state_hash(fork), persistence.state_hash(self.game.game_state))
+        fork_game.process_command(Command("set_tax", 0.15))
+        self.assertEqual(persistence.state_hash(fork), persistence.state_hash(self.game.game_state))
+
+    def test_worker_processes_find_the_same_plan(self):
+        game = Game(test_mode=True, num_ai_nations=2)
+        serial = Planner(horizon=3).plan(game.game_state)
+        with Planner(horizon=3, max_workers=2, data=game.data) as planner:
+            parallel = planner.plan(game.game_state)
+        self.assertEqual(parallel.score, serial.score)
+        self.assertEqual([(command.type, command.payload) if command else None for command in parallel.actions], [(command.type, command.payload) if command else None for command in serial.actions])
+
+    def test_planner_acts_for_ai_nations(self):
+        planner = Planner(horizon=2)
+        game = Game(test_mode=True, num_ai_nations=2, ai_controller=planner)
+        nation = game.game_state.ai_nations[1]
+        expected = planner.plan(game.game_state, nation).first
+        decisions = planner.decide(game.game_state, game.game_state.ai_nations)
+        self.assertEqual([(decided.name, command.type, command.payload) for decided, command in decisions if decided is nation], [(nation.name, expected.type, expected.payload)])
+        game.process_command(Command("end_turn"))
+        self.assertEqual(game.game_state.turn, 1)
+        self.assertEqual(game.game_state.player_nation.tax_rate, 0.15)
+
+    def test_suggestion_is_displayed(self):
+        out = io.StringIO()
+        plan = Planner(horizon=2).plan(self.game.game_state)
+        CLIView(out).display_plan(plan)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("--- Suggestion (treasury"))
+        self.assertEqual(len(lines), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import unittest
+
+import numpy as np
+
+from src import persistence
+from src.game import Game
+from src.commands import Command
+from src.controller.ai_controller import AIController
+from src.controller.projection import PolicyOption, PolicyProjector, Projection, adjacent_options, policy_grid
+from src.models.event_index import EventIndex
+from src.view.cli_view import CLIView
+
+class TestPolicyProjector(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True)
+        # Random events are not projected.
+        self.game.game_state.available_events = EventIndex([])
+        self.player = self.game.game_state.player_nation
+        self.industry = self.player.industries[0].name
+
+    def simulate(self, option, turns):
+        """Plays an option out on a fork of the game and returns the player's metrics after each turn."""
+        fork = Game(test_mode=True, data=self.game.data)
+        fork.game_state = self.game.game_state.fork()
+        for command in option.commands(fork.game_state.player_nation):
+            fork.process_command(command)
+        history = []
+        for _ in range(turns):
+            fork.process_command(Command("end_turn"))
+            nation = fork.game_state.player_nation
+            history.append((nation.treasury, nation.civilian_gdp, nation.public_opinion, nation.industrial_capacity))
+        return np.array(history).T
+
+    def assert_matches_game(self, options, turns):
+        projection = PolicyProjector(self.player, self.game.game_state.turn).project(options, turns)
+        for row, option in enumerate(options):
+            expected = self.simulate(option, turns)
+            for metric, values in zip(Projection.METRICS, expected):
+                np.testing.assert_allclose(getattr(projection, metric)[row], values, rtol=1e-12, err_msg=f"{option} {metric}")
+        return projection
+
+    def test_levers_match_playing_the_option_out(self):
+        options = [
+            PolicyOption(),
+            PolicyOption(tax_rate=0.25),
+            PolicyOption(social_spending=300),
+            PolicyOption(tax_rate=0.05, social_spending=800, ic_focus_policy="Infrastructure_Focus"),
+            PolicyOption(industry_tax_rates={self.industry: 0.05}),
+            PolicyOption(subsidies={self.industry: 200}),
+            PolicyOption(subsidies={self.industry: 5000}),
+            PolicyOption(industry_tax_rates={self.industry: 0.5}),
+        ]
+        self.assert_matches_game(options, 8)
+
+    def test_construction_completions_and_queue_match(self):
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": self.industry}))
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_infrastructure_1"}))
+        self.player.construction_slots = 1
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": self.industry}))
+        self.player.active_projects[0].current_cp = 90
+        projection = self.assert_matches_game([PolicyOption(), PolicyOption(ic_focus_policy="Infrastructure_Focus")], 6)
+        self.assertGreater(projection.at("industrial_capacity", 2)[0], projection.at("industrial_capacity", 1)[0] + 9)
+
+    def test_deficit_pauses_construction(self):
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": self.industry}))
+        self.player.active_projects[0].current_cp = 95
+        self.player.treasury = -5000
+        self.assert_matches_game([PolicyOption(), PolicyOption(tax_rate=0.9)], 4)
+
+    def test_live_state_is_not_modified(self):
+        before = persistence.state_hash(self.game.game_state)
+        PolicyProjector(self.player).project(adjacent_options(self.player) + [PolicyOption(subsidies={self.industry: 100})], 5)
+        self.assertEqual(persistence.state_hash(self.game.game_state), before)
+
+    def test_thousands_of_options_in_one_batch(self):
+        options = policy_grid(np.linspace(0.0, 0.5, 51), range(0, 1000, 25), (None, "Infrastructure_Focus"))
+        projection = PolicyProjector(self.player).project(options, 10)
+        self.assertEqual(projection.treasury.shape, (len(options), 10))
+        self.assertFalse(projection.treasury.flags.writeable)
+        # Higher taxes mean more treasury, lower public opinion.
+        self.assertEqual(projection.best("treasury").tax_rate, 0.5)
+        best, popular = projection.ranked("treasury")[0], projection.ranked("treasury", min_public_opinion=45)[0]
+        self.assertLess(projection.public_opinion[best].min(), 45)
+        self.assertGreaterEqual(projection.public_opinion[popular].min(), 45)
+        self.assertLess(projection.at("treasury")[popular], projection.at("treasury")[best])
+
+    def test_ranked_filters_on_public_opinion(self):
+        projection = PolicyProjector(self.player).project(policy_grid(tax_rates=(0.1, 0.9)), 3)
+        self.assertEqual(list(projection.ranked("treasury")), [1, 0])
+        self.assertEqual(list(projection.ranked("public_opinion")), [0, 1])
+        self.assertEqual(list(projection.ranked("treasury", min_public_opinion=48)), [0])
+        self.assertIsNone(projection.best(min_public_opinion=101))
+        with self.assertRaises(ValueError):
+            projection.at("morale")
+
+    def test_adjacent_options_are_distinct_and_bounded(self):
+        self.player.budget["social_spending"] = 0
+        options = adjacent_options(self.player, tax_bounds=(0.05, 0.15))
+        self.assertEqual(len(options), 2 * 2 * 2)
+        self.assertEqual((options[0].tax_rate, options[0].social_spending, options[0].ic_focus_policy), (0.15, 0, "Balanced"))
+        self.assertEqual(options[0].commands(self.player), [])
+
+class TestProjectionConsumers(unittest.TestCase):
+    def test_ai_takes_best_projected_budget(self):
+        ai = AIController(budget_horizon=5)
+        game = Game(test_mode=True, num_ai_nations=1, ai_controller=ai)
+        nation = game.game_state.ai_nations[0]
+        projection = PolicyProjector(nation).project(adjacent_options(nation, ai.tax_step, ai.social_step, ai.tax_bounds, ai.max_social_spending), 5)
+        best = projection.best(min_public_opinion=ai.opinion_band[0])
+        budget = [command for n, command in ai.decide(game.game_state, [nation]) if command.type in ("set_tax", "budget", "construction") and n is nation
+                  and (command.type != "construction" or command.payload["type"] == "set_ic_focus")]
+        self.assertEqual([(c.type, c.payload) for c in budget], [(c.type, c.payload) for c in best.commands(nation)])
+        game.process_command(Command("end_turn"))
+        self.assertEqual(nation.tax_rate, best.tax_rate)
+
+    def test_cli_compare_options_panel(self):
+        game = Game(test_mode=True)
+        player = game.game_state.player_nation
+        out = io.StringIO()
+        CLIView(out=out).display_options(PolicyProjector(player).project(adjacent_options(player), 5), limit=3)
+        lines = out.getvalue().splitlines()
+        # Social spending starts at 0, so it can only stay or rise.
+        self.assertEqual(lines[0], "--- Compare Options (12 options, 5 turns, by treasury) ---")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith("  1. tax 16%"))
+
+if __name__ == '__main__':
+    unittest.main()
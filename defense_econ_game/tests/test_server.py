@@ -0,0 +1,177 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from src.game import Game
+from src.commands import Command
+from src.server import GameServer, GameClient, ServerError
+from src import persistence
+
+class TestGameServer(unittest.TestCase):
+    def run_server(self, scenario, **options):
+        async def main():
+            async with GameServer(max_workers=2, **options) as server:
+                client = await GameClient.connect(*server.address)
+                try:
+                    return await scenario(server, client)
+                finally:
+                    await client.close()
+        return asyncio.run(main())
+
+    def test_commands_match_a_local_game(self):
+        async def scenario(server, client):
+            session = await client.new_session()
+            await client.request("research", "Industrialization", session)
+            await client.request("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}, session)
+            for _ in range(3):
+                await client.request("end_turn", session=session)
+            result = await client.request("advance_until", {"turn": 8}, session)
+            return result, await client.request("state", session=session), server.sessions[session].game
+
+        result, state, served = self.run_server(scenario)
+        local = Game(test_mode=True)
+        local.process_command(Command("research", "Industrialization"))
+        local.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        for _ in range(3):
+            local.process_command(Command("end_turn"))
+        local.advance_until(turn=8)
+        self.assertEqual(result, {"turn": 8})
+        self.assertEqual(state, json.loads(json.dumps(local.get_view_model().to_dict())))
+        self.assertEqual(persistence.capture(served.game_state).structure, persistence.capture(local.game_state).structure)
+
+    def test_sessions_run_concurrently_and_independently(self):
+        async def scenario(server, client):
+            sessions = [await client.new_session(num_ai_nations=2, ai=True) for _ in range(4)]
+            async def play(session, turns):
+                for _ in range(turns):
+                    await client.request("end_turn", session=session)
+                return (await client.request("state", session=session))["turn"]
+            return await asyncio.gather(*(play(session, turns) for session, turns in zip(sessions, (1, 2, 3, 4))))
+
+        self.assertEqual(self.run_server(scenario), [1, 2, 3, 4])
+
+    def test_errors_are_reported_per_request(self):
+        async def scenario(server, client):
+            errors = []
+            for command_type, payload, session in (("end_turn", None, "missing"), ("advance_until", 5, None), ("bogus", None, None)):
+                session = session or await client.new_session()
+                try:
+                    await client.request(command_type, payload, session)
+                except ServerError as error:
+                    errors.append(str(error))
+            return errors
+
+        errors = self.run_server(scenario)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("Unknown session", errors[0])
+
+    def test_market_orders_are_light_commands(self):
+        async def scenario(server, client):
+            session = await client.new_session()
+            await client.request("market", {"type": "sell", "item": "component:Helios-I Power Core", "quantity": 2, "price": 40.0}, session)
+            await client.request("market", {"type": "sell", "item": "component:Helios-I Power Core", "quantity": 2, "price": "40"}, session)
+            return server.sessions[session].game.game_state.market
+
+        market = self.run_server(scenario)
+        self.assertEqual([(order.item, order.quantity, order.price) for order in market.orders()], [("component:Helios-I Power Core", 2, 40.0)])
+
+    def test_malformed_lines_get_errors_and_keep_the_connection(self):
+        async def scenario(server, client):
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(b'{"id": 1, "type": "new_session"}\nnot json\n[1, 2]\n"text"\n{"id": 2, "type": "end_turn", "session": "missing"}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(5)]
+            writer.close()
+            return responses
+
+        responses = self.run_server(scenario)
+        self.assertEqual([(response["id"], response["ok"]) for response in responses], [(1, True), (None, False), (None, False), (None, False), (2, False)])
+        self.assertIn("JSON object", responses[2]["error"])
+
+    def test_sessions_keep_serving_after_a_client_disconnects(self):
+        async def scenario(server, client):
+            session = await client.new_session(num_ai_nations=50, ai=True)
+            reader, writer = await asyncio.open_connection(*server.address)
+            for index in range(5):
+                writer.write(json.dumps({"id": index, "type": "end_turn", "session": session}).encode() + b"\n")
+            await writer.drain()
+            writer.transport.abort()
+            await asyncio.wait_for(server.sessions[session].queue.join(), timeout=60)
+            state = await asyncio.wait_for(client.request("state", session=session), timeout=10)
+            return state["turn"], server.sessions[session].task.done()
+
+        turn, task_done = self.run_server(scenario)
+        self.assertEqual(turn, 5)
+        self.assertFalse(task_done)
+
+    def test_clients_cannot_choose_the_data_directory(self):
+        async def scenario(server, client):
+            try:
+                await client.new_session(data_dir="/tmp")
+            except ServerError as error:
+                return str(error), server.sessions
+
+        error, sessions = self.run_server(scenario)
+        self.assertIn("data_dir", error)
+        self.assertEqual(sessions, {})
+
+    def test_non_string_session_ids_are_rejected(self):
+        save_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, save_dir)
+
+        async def scenario(server, client):
+            reader, writer = await asyncio.open_connection(*server.address)
+            writer.write(b'{"id": 1, "type": "state", "session": 12}\n{"id": 2, "type": "new_session"}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            return responses
+
+        responses = self.run_server(scenario, save_dir=save_dir)
+        self.assertEqual([(response["id"], response["ok"]) for response in responses], [(1, False), (2, True)])
+        self.assertIn("Unknown session", responses[0]["error"])
+
+    def test_worker_processes_ship_state_as_snapshots(self):
+        async def scenario(server, client):
+            session = await client.new_session(num_ai_nations=1, ai=True)
+            for _ in range(2):
+                await client.request("end_turn", session=session)
+            await client.request("advance_until", {"turn": 5}, session)
+            return server.sessions[session].game
+
+        served = self.run_server(scenario, use_processes=True)
+        local = Game(test_mode=True, num_ai_nations=1, ai_controller=served.controller.ai_controller.__class__())
+        for _ in range(2):
+            local.process_command(Command("end_turn"))
+        local.advance_until(turn=5)
+        self.assertEqual(persistence.capture(served.game_state).structure, persistence.capture(local.game_state).structure)
+
+    def test_idle_sessions_are_evicted_and_resumed(self):
+        save_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, save_dir)
+
+        async def scenario(server, client):
+            idle = await client.new_session()
+            active = await client.new_session()
+            await client.request("end_turn", session=idle)
+            server.sessions[active].last_active += 100
+            evicted = server.evict_idle_sessions(now=server.sessions[idle].last_active + 60)
+            resumed = await client.request("state", session=idle)
+            return idle, evicted, resumed["turn"], sorted(server.sessions)
+
+        idle, evicted, turn, live = self.run_server(scenario, idle_timeout=30, save_dir=save_dir)
+        self.assertEqual(evicted, [idle])
+        self.assertEqual(turn, 1)
+        self.assertIn(idle, live)
+
+    def test_full_session_queue_pushes_back(self):
+        async def scenario(server, client):
+            session = await client.new_session()
+            responses = await asyncio.gather(*(client.request("end_turn", session=session) for _ in range(10)))
+            return [response["turn"] for response in responses]
+
+        self.assertEqual(self.run_server(scenario, max_pending=2), list(range(1, 11)))
+
+if __name__ == '__main__':
+    unittest.main()
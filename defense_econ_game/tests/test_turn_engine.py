@@ -0,0 +1,67 @@
+import unittest
+from src.game import Game
+from src.commands import Command
+from src import persistence
+
+class TestTurnEngine(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True, num_ai_nations=5)
+
+    def test_ai_nations_are_simulated(self):
+        initial_gdp = [nation.civilian_gdp for nation in self.game.game_state.ai_nations]
+        initial_treasury = [nation.treasury for nation in self.game.game_state.ai_nations]
+        self.game.process_command(Command("end_turn"))
+        for nation, gdp, treasury in zip(self.game.game_state.ai_nations, initial_gdp, initial_treasury):
+            self.assertGreater(nation.civilian_gdp, gdp)
+            self.assertNotEqual(nation.treasury, treasury)
+
+    def test_ai_nation_matches_identical_player(self):
+        player = self.game.game_state.player_nation
+        ai_nation = self.game.game_state.ai_nations[0]
+        for _ in range(10):
+            self.game.process_command(Command("end_turn"))
+        self.assertAlmostEqual(player.treasury, ai_nation.treasury, places=9)
+        self.assertAlmostEqual(player.civilian_gdp, ai_nation.civilian_gdp, places=9)
+        self.assertAlmostEqual(player.industrial_capacity, ai_nation.industrial_capacity, places=9)
+
+    def test_research_progress_is_per_nation(self):
+        self.game.process_command(Command("research", "Industrialization"))
+        self.game.process_command(Command("end_turn"))
+        self.assertGreater(self.game.game_state.player_nation.current_research.rp_progress, 0)
+        self.assertIsNone(self.game.game_state.ai_nations[0].current_research)
+        template = next(tech for tech in self.game.game_state.available_technologies if tech.name == "Industrialization")
+        # Progress lives in the nation's ResearchProgress; the shared definition holds none.
+        self.assertIs(self.game.game_state.player_nation.current_research.definition, template)
+        self.assertFalse(hasattr(template, "rp_progress"))
+
+    def varied_game(self, use_ledger):
+        game = Game(test_mode=True, num_ai_nations=6, use_ledger=use_ledger)
+        commands = [Command("research", "Industrialization"), Command("set_tax", 0.3), Command("budget", {"category": "social_spending", "amount": 400}),
+                    Command("construction", {"type": "set_ic_focus", "policy": "Infrastructure_Focus"}),
+                    Command("policy", {"industry": "Ore Mining", "type": "subsidy", "amount": 200})]
+        for i, nation in enumerate(game.game_state.nations):
+            for command in commands[:i % 6]:
+                game.controller.execute_command(game.game_state, command, nation)
+            for _ in range(i % 4 + 1):
+                game.controller.start_project(nation, "build_ic_1", "Ore Mining", game.game_state)
+            nation.treasury = -50.0 if i == 5 else nation.treasury
+        return game
+
+    def test_batched_phases_match_one_nation_at_a_time(self):
+        for use_ledger in (False, True):
+            batched, alone = self.varied_game(use_ledger), self.varied_game(use_ledger)
+            alone.controller.turn_engine.metrics.enable(per_nation=True)
+            for _ in range(25):
+                batched.process_command(Command("end_turn"))
+                alone.process_command(Command("end_turn"))
+            expected, actual = persistence.capture(alone.game_state), persistence.capture(batched.game_state)
+            self.assertEqual(actual.structure, expected.structure)
+            self.assertEqual(set(actual.arrays), set(expected.arrays))
+            for name, values in expected.arrays.items():
+                self.assertEqual(actual.arrays[name].tolist(), values.tolist(), name)
+
+    def test_phase_timings_are_reported(self):
+        self.game.process_command(Command("end_turn"))
+        timings = self.game.controller.turn_engine.phase_timings
+        self.assertEqual(list(timings), ["research", "construction", "civilian_economy", "economy", "market", "events"])
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
@@ -0,0 +1,62 @@
+import unittest
+from src.game import Game
+from src.commands import Command
+
+class TestTurnMetrics(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(test_mode=True, num_ai_nations=2)
+        self.engine = self.game.controller.turn_engine
+
+    def end_turn(self):
+        self.game.process_command(Command("end_turn"))
+
+    def test_disabled_metrics_record_nothing(self):
+        self.end_turn()
+        self.assertIsNone(self.engine.metrics.latest)
+
+    def test_enabled_metrics_record_timings_and_counters(self):
+        self.engine.metrics.enable()
+        self.game.process_command(Command("construction", {"type": "start_project", "project_id": "build_ic_1", "target": "Ore Mining"}))
+        self.end_turn()
+        report = self.engine.metrics.latest
+        self.assertEqual(report.turn, 0)
+        self.assertEqual(list(report.timings), [name for name, _ in self.engine.phases])
+        self.assertEqual(report.counters["construction"]["projects_processed"], 1)
+        self.assertEqual(report.counters["civilian_economy"]["nations_updated"], 3)
+        self.assertEqual(report.counters["events"]["events_checked"], 1)
+        self.assertIn("Turn 0", self.engine.metrics.report())
+
+    def test_allocation_and_per_nation_tracking(self):
+        self.engine.metrics.enable(track_allocations=True, per_nation=True)
+        try:
+            self.end_turn()
+        finally:
+            self.engine.metrics.disable()
+        report = self.engine.metrics.latest
+        self.assertIn("economy", report.allocations)
+        self.assertEqual(set(report.nation_timings["economy"]), {nation.name for nation in self.game.game_state.nations})
+        self.assertEqual(set(report.nation_allocations["economy"]), {nation.name for nation in self.game.game_state.nations})
+        self.assertNotIn("events", report.nation_timings)
+
+    def test_per_nation_tracking_gives_the_same_results(self):
+        reference = Game(test_mode=True, num_ai_nations=2)
+        self.engine.metrics.enable(per_nation=True)
+        for _ in range(5):
+            self.end_turn()
+            reference.process_command(Command("end_turn"))
+        for expected, actual in zip(reference.game_state.nations, self.game.game_state.nations):
+            self.assertEqual(expected.treasury, actual.treasury)
+
+    def test_hooks_run_around_phases_and_turns(self):
+        calls = []
+        self.engine.add_hook("before", lambda state, phase: calls.append(("before", phase)))
+        self.engine.add_hook("after", lambda state, phase: calls.append(("after", phase)), phase="economy")
+        self.end_turn()
+        self.assertEqual(calls, [("before", None), ("after", "economy")])
+
+    def test_registered_phase_runs_in_position(self):
+        order = []
+        self.engine.register_phase("audit", lambda state, nations: order.append(len(nations)), after="economy")
+        self.end_turn()
+        self.assertEqual(order, [3])
+        self.assertEqual([name for name, _ in self.engine.phases][4], "audit")
@@ -0,0 +1,51 @@
+import io
+import json
+import unittest
+from tests.test_harness import TestHarness
+from src.view.cli_view import CLIView
+
+class TestViewModel(TestHarness):
+    def test_view_model_is_cached_until_the_state_changes(self):
+        view_model = self.game.get_view_model()
+        self.assertIs(self.game.get_view_model(), view_model)
+        self.run_command("budget", "social_spending", 50)
+        changed = self.game.get_view_model()
+        self.assertIsNot(changed, view_model)
+        self.assertEqual(changed.summary.social_spending, 50)
+        self.run_command("end_turn")
+        self.assertEqual(self.game.get_view_model().turn, 1)
+
+    def test_view_model_follows_a_replaced_game_state(self):
+        view_model = self.game.get_view_model()
+        self.game.game_state = self.game.game_state.fork()
+        self.assertIsNot(self.game.get_view_model(), view_model)
+
+    def test_view_model_converts_to_plain_data(self):
+        self.run_command("start_project", "build_ic_1", "Ore Mining")
+        data = json.loads(json.dumps(self.game.get_view_model().to_dict()))
+        self.assertEqual(data["construction"]["active_projects"][0]["target"], "Ore Mining")
+        self.assertEqual(len(data["industries"]), len(self.game.game_state.player_nation.industries))
+
+    def test_frame_is_written_in_one_call(self):
+        out = io.StringIO()
+        writes = []
+        out.write = lambda text: writes.append(text)
+        CLIView(out=out).display_game_state(self.game.game_state, self.game.get_view_model())
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith("--- Game State ---\nTurn: 0\n"))
+        self.assertIn("Ore Mining", writes[0])
+
+    def test_only_changed_sections_are_redrawn(self):
+        view = CLIView()
+        view.render(self.game.get_view_model())
+        unchanged = view.render(self.game.get_view_model(), changed_only=True)
+        self.assertNotIn("Industries:", unchanged)
+        self.assertNotIn("Treasury", unchanged)
+        self.run_command("budget", "social_spending", 50)
+        changed = view.render(self.game.get_view_model(), changed_only=True)
+        self.assertIn("Social Spending: 50", changed)
+        self.assertNotIn("Industries:", changed)
+        self.assertNotIn("Construction Slots", changed)
+
+if __name__ == '__main__':
+    unittest.main()